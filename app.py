@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 import sys
-from concurrent.futures import ThreadPoolExecutor
+import time
 
 from PySide6.QtWidgets import QApplication
 
@@ -11,7 +11,6 @@ from PySide6.QtWidgets import QApplication
 
 # ---- base_qt (Qt adapters) ----
 from base_core.framework.app import AppContext
-from base_core.framework.concurrency.task_runner import TaskRunner
 from base_core.framework.di import Container
 from base_core.framework.events import EventBus
 from base_core.framework.lifecycle.cleanup_collection import CleanupCollection
@@ -23,7 +22,7 @@ from phase_control.analysis_modules.randomize.module import RandomizationModule
 from phase_control.analysis_modules.stabilization.module import StabilizationModule
 from phase_control.app.module import AppModule
 from phase_control.app.ui.main_window_view import MainWindowView
-from phase_control.core.concurrency.runners import ICpuTaskRunner, IRotatorTaskRunner, ISpectrometerTaskRunner
+from phase_control.core.bootstrap import register_clock, register_task_runners
 from phase_control.core.module import CoreModule
 from phase_control.io.module import IOModule
 from base_qt.app.interfaces import IUiDispatcher
@@ -43,6 +42,14 @@ def build_context() -> AppContext:
             "app_name": "Your App",
             "app_status:": "offline",
             "rotator_port": "COM6",
+            # e.g. fake_spectrometer_argv() to run without the spectrometer
+            "spectrometer_argv": None,
+            # FlowControlConfig (credit window), None = defaults
+            "flow_control": None,
+            # RoiConfig (server-side crop/binning), None = defaults
+            "roi": None,
+            # QualityConfig (saturation/spike rejection), None = defaults
+            "quality": None,
         },
         status=AppStatus.CONNECTED,
         log=log,
@@ -58,25 +65,18 @@ def build_container(ctx: AppContext) -> Container:
 
     c.register_instance(AppContext, ctx)
 
-    io_spectrometer_exec = ThreadPoolExecutor(max_workers=2, thread_name_prefix="io.spectrometer")
-    io_rotator_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io.spectrometer")
-    cpu_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpu") 
-
-    c.register_singleton(ISpectrometerTaskRunner, lambda c: TaskRunner(io_spectrometer_exec))
-    c.register_singleton(IRotatorTaskRunner, lambda c: TaskRunner(io_rotator_exec))
-    c.register_singleton(ICpuTaskRunner, lambda c: TaskRunner(cpu_exec))
+    register_clock(c)
+    register_task_runners(c, ctx)
     
     c.register_singleton(IUiDispatcher, lambda c: QtDispatcher())
 
-    ctx.lifecycle.add(lambda: io_spectrometer_exec.shutdown(wait=False))
-    ctx.lifecycle.add(lambda: io_rotator_exec.shutdown(wait=False))
-    ctx.lifecycle.add(lambda: cpu_exec.shutdown(wait=False))
-
     return c
 
 
 def get_modules():
     # Add feature modules here (hybrid approach: shell + feature modules)
+    # Analysis modules only register their views; the heavy engine/UI
+    # imports happen when a page is first selected (see LazyModuleLoader).
     return [
         AppModule(),
         CoreModule(),
@@ -90,6 +90,7 @@ def get_modules():
 
 def main(argv: list[str] | None = None) -> int:
     argv = argv if argv is not None else sys.argv
+    t0 = time.perf_counter()
 
     app = QApplication(argv)
 
@@ -102,6 +103,7 @@ def main(argv: list[str] | None = None) -> int:
     # Resolve and show main window (ShellModule should register AppMainWindowView as factory)
     win = c.get(MainWindowView)
     win.show()
+    ctx.log.info("Main window shown after %.1f ms", (time.perf_counter() - t0) * 1e3)
 
     rc = app.exec()
 
@@ -0,0 +1,335 @@
+# headless.py
+"""
+Headless engine runner: devices + one analysis engine, no Qt.
+
+    python -m headless --config rack.json
+    python -m headless --config rack.json --telemetry run.jsonl
+
+Config file (JSON, every key optional):
+
+    {
+      "engine": "stabilization",          # | "envelope" | "randomization"
+      "rotator_port": "COM3",
+      "spectrometer_argv": null,          # acquisition process argv, null = spm_002
+      "fake_spectrometer": null,          # {"num_pixels": 2048, "rate_hz": 100, ...}
+      "flow_control": {"window": 4},      # credit window, {"enabled": false} = push
+      "roi": {"enabled": false, "binning": 1},  # server-side crop (server must know "roi")
+      "quality": {"max_saturated": 0, "spike_sigma": 8},  # pre-fit frame rejection
+      "telemetry": "-",                   # "-" = stdout, else JSON-lines file
+      "log_level": "INFO",
+      "ready_timeout_s": 30,
+      "duration_s": null,                 # null = run until Ctrl+C
+      "target_phase_pi": 0.0,
+      "analysis": {"avg_spectra": 10, "residuals_threshold": 15,
+                   "wavelength_range_nm": [780, 810],
+                   "tracker": "fit", "solver": "lmfit"},  # | "fft", | "varpro"
+      "envelope": {"mode": "maximize", "smooth_window": 1},
+      "backpressure": {"mode": "adaptive", "cpu_budget": 0.8},  # | "latest_wins" | "every_nth"
+      "corrector": {"mode": "pi", "ki": 0.05, "max_step_deg": 5},  # PhaseCorrector, "p" = default
+      "rotation_speed": 70,
+      "record": null,                     # file stem for raw frame recording
+      "archive": null                     # compressed frame + telemetry archive
+    }
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import math
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import wait
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Optional
+
+from base_core.framework.app import AppContext
+from base_core.framework.app.enums import AppStatus
+from base_core.framework.di import Container
+from base_core.framework.events import EventBus
+from base_core.framework.lifecycle.cleanup_collection import CleanupCollection
+from base_core.framework.log import setup_logging
+from base_core.math.models import Angle, Range
+from base_core.quantities.enums import Prefix
+from base_core.quantities.models import Length
+from phase_control.core.backpressure import TOPIC_BACKPRESSURE, BackpressureMode
+from phase_control.core.bootstrap import register_clock, register_task_runners
+from phase_control.core.concurrency.dispatchers import QueueDispatcher
+from phase_control.core.telemetry import TelemetryWriter
+from phase_control.io.archive import ArchiveWriter
+from phase_control.io.devices import DEFAULT_ROTATOR_PORT, register_devices, start_devices, stop_devices
+from phase_control.io.events import TOPIC_DEVICE_STATE
+from phase_control.io.readiness import is_ready
+from phase_control.io.spectrometer.fake_server import fake_spectrometer_argv
+from phase_control.io.spectrometer.flow_control import FlowControlConfig
+from phase_control.io.spectrometer.quality import QualityConfig
+from phase_control.io.spectrometer.roi import RoiConfig
+from phase_control.io.spectrometer.spectrometer_service import SpectrometerService
+
+
+@dataclass(frozen=True)
+class _EngineSpec:
+    runtime: str
+    engine: str                      # "module:Class"
+    devices: tuple[str, ...]
+    topics: tuple[str, ...]
+
+
+ENGINES: dict[str, _EngineSpec] = {
+    "stabilization": _EngineSpec(
+        runtime="phase_control.analysis_modules.stabilization.runtime",
+        engine="phase_control.analysis_modules.stabilization.engine:AnalysisEngine",
+        devices=("spectrometer", "rotator"),
+        topics=("stabilization.telemetry", "stabilization.lock_state", TOPIC_BACKPRESSURE),
+    ),
+    "envelope": _EngineSpec(
+        runtime="phase_control.analysis_modules.envelope.runtime",
+        engine="phase_control.analysis_modules.envelope.engine:EnvelopeEngine",
+        devices=("spectrometer", "rotator"),
+        topics=("envelope.telemetry", TOPIC_BACKPRESSURE),
+    ),
+    "randomization": _EngineSpec(
+        runtime="phase_control.analysis_modules.randomize.runtime",
+        engine="phase_control.analysis_modules.randomize.engine:RandomizationEngine",
+        devices=("rotator",),
+        topics=(),
+    ),
+}
+
+
+@dataclass
+class HeadlessConfig:
+    engine: str = "stabilization"
+    rotator_port: str = DEFAULT_ROTATOR_PORT
+    spectrometer_argv: Optional[list[str]] = None
+    fake_spectrometer: Optional[dict[str, Any]] = None
+    flow_control: dict[str, Any] = field(default_factory=dict)
+    roi: dict[str, Any] = field(default_factory=dict)
+    quality: dict[str, Any] = field(default_factory=dict)
+    telemetry: str = "-"
+    log_level: str = "INFO"
+    ready_timeout_s: float = 30.0
+    duration_s: Optional[float] = None
+    target_phase_pi: float = 0.0
+    analysis: dict[str, Any] = field(default_factory=dict)
+    envelope: dict[str, Any] = field(default_factory=dict)
+    backpressure: dict[str, Any] = field(default_factory=dict)
+    corrector: dict[str, Any] = field(default_factory=dict)
+    rotation_speed: Optional[int] = None
+    record: Optional[str] = None
+    archive: Optional[str] = None
+
+    @classmethod
+    def from_file(cls, path: Path) -> HeadlessConfig:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        known = {f.name for f in fields(cls)}
+        unknown = set(raw) - known
+        if unknown:
+            raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        cfg = cls(**raw)
+        if cfg.engine not in ENGINES:
+            raise ValueError(f"Unknown engine {cfg.engine!r}; expected one of {', '.join(ENGINES)}")
+        return cfg
+
+
+def apply_overrides(target: Any, overrides: dict[str, Any]) -> None:
+    """
+    Copy plain values from a config dict onto a config dataclass.
+
+    '*_nm' ranges ([min, max]) become Range[Length]; other values are
+    coerced to the type of the existing attribute.
+    """
+    for key, value in overrides.items():
+        if key == "wavelength_range_nm":
+            lo, hi = value
+            target.wavelength_range = Range(Length(float(lo), Prefix.NANO), Length(float(hi), Prefix.NANO))
+            continue
+        if not hasattr(target, key):
+            raise ValueError(f"{type(target).__name__} has no field {key!r}")
+        current = getattr(target, key)
+        if isinstance(current, Angle):
+            setattr(target, key, Angle(float(value)))
+        elif isinstance(current, (bool, int, float, str)):
+            setattr(target, key, type(current)(value))
+        else:
+            setattr(target, key, value)
+
+
+def build_context(cfg: HeadlessConfig) -> AppContext:
+    # configure the package logger: module loggers (phase_control.*) log through it
+    setup_logging("phase_control", level=getattr(logging, cfg.log_level.upper(), logging.INFO))
+    log = logging.getLogger("phase_control.headless")
+    return AppContext(
+        config={"app_name": "Phase Control (headless)"},
+        status=AppStatus.CONNECTED,
+        log=log,
+        event_bus=EventBus(),
+        lifecycle=CleanupCollection(),
+    )
+
+
+def _load_attr(path: str) -> Any:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _configure_engine(name: str, c: Container, engine: Any, cfg: HeadlessConfig) -> None:
+    if name == "stabilization":
+        from phase_control.analysis_modules.stabilization.config import AnalysisConfig
+        from phase_control.analysis_modules.stabilization.domain.phase_corrector import ControllerMode
+        apply_overrides(c.get(AnalysisConfig), cfg.analysis)
+        engine.target_phase = Angle(cfg.target_phase_pi * math.pi)
+        overrides = dict(cfg.corrector)
+        if "mode" in overrides:
+            engine.corrector.mode = ControllerMode(overrides.pop("mode"))
+        apply_overrides(engine.corrector, overrides)
+    elif name == "envelope":
+        from phase_control.analysis_modules.envelope.config import EnvelopeSignalGeneratorConfig
+        from phase_control.analysis_modules.envelope.domain.enums import EnvelopeMode
+        overrides = dict(cfg.envelope)
+        env_cfg = c.get(EnvelopeSignalGeneratorConfig)
+        if "mode" in overrides:
+            env_cfg.mode = EnvelopeMode(overrides.pop("mode"))
+        apply_overrides(env_cfg, overrides)
+    if cfg.backpressure and hasattr(engine, "backpressure"):
+        overrides = dict(cfg.backpressure)
+        if "mode" in overrides:
+            engine.backpressure.mode = BackpressureMode(overrides.pop("mode"))
+        apply_overrides(engine.backpressure, overrides)
+    if name == "randomization" and cfg.rotation_speed is not None:
+        engine.rotation_speed = int(cfg.rotation_speed)
+
+
+# short waits so Ctrl+C is handled on Windows (an untimed Event.wait blocks SIGINT there)
+STOP_POLL_S = 0.5
+
+
+def _wait_for_stop(stop: threading.Event, duration_s: Optional[float]) -> None:
+    """Until 'stop' is set or duration_s [s] have passed (None = no limit)."""
+    deadline = None if duration_s is None else time.monotonic() + duration_s
+    while not stop.is_set():
+        remaining = STOP_POLL_S if deadline is None else min(STOP_POLL_S, deadline - time.monotonic())
+        if remaining <= 0:
+            return
+        stop.wait(remaining)
+
+
+def run(cfg: HeadlessConfig) -> int:
+    spec = ENGINES[cfg.engine]
+    ctx = build_context(cfg)
+    c = Container()
+    c.register_instance(AppContext, ctx)
+    register_clock(c)
+    register_task_runners(c, ctx)
+    argv = cfg.spectrometer_argv
+    if cfg.fake_spectrometer is not None:
+        argv = fake_spectrometer_argv(**cfg.fake_spectrometer)
+    flow_control = FlowControlConfig()
+    apply_overrides(flow_control, cfg.flow_control)
+    roi = RoiConfig()
+    apply_overrides(roi, cfg.roi)
+    quality = QualityConfig()
+    apply_overrides(quality, cfg.quality)
+    register_devices(
+        c,
+        ctx,
+        rotator_port=cfg.rotator_port,
+        spectrometer_argv=argv,
+        flow_control=flow_control,
+        roi=roi,
+        quality=quality,
+    )
+    importlib.import_module(spec.runtime).register(c, ctx)
+
+    out = sys.stdout if cfg.telemetry == "-" else open(cfg.telemetry, "a", encoding="utf-8")
+    dispatcher = QueueDispatcher("telemetry")
+    telemetry = TelemetryWriter(ctx.event_bus, dispatcher, out, (TOPIC_DEVICE_STATE, *spec.topics))
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    engine = None
+    archive: Optional[ArchiveWriter] = None
+    try:
+        ready = start_devices(c, ctx)
+        needed = [ready[d] for d in spec.devices]
+        wait(needed, timeout=cfg.ready_timeout_s)
+        not_ready = [d for d in spec.devices if not is_ready(ready[d])]
+        if not_ready:
+            ctx.log.error("Device(s) not ready after %.0f s: %s", cfg.ready_timeout_s, ", ".join(not_ready))
+            return 1
+
+        if cfg.record or cfg.archive:
+            spectrometer: SpectrometerService = c.get(SpectrometerService)
+            if not is_ready(ready["spectrometer"]):
+                wait([ready["spectrometer"]], timeout=cfg.ready_timeout_s)
+            if not is_ready(ready["spectrometer"]):
+                ctx.log.error("Spectrometer not ready, recording disabled")
+            else:
+                if cfg.record:
+                    spectrometer.start_recording(Path(cfg.record))
+                    ctx.log.info("Recording raw frames to %s.*", cfg.record)
+                if cfg.archive:
+                    archive = ArchiveWriter(Path(cfg.archive), spectrometer.meta)
+                    archive.attach_bus(ctx.event_bus, spec.topics)
+                    spectrometer.add_frame_sink(archive)
+                    ctx.log.info("Archiving frames and telemetry to %s", cfg.archive)
+
+        engine = c.get(_load_attr(spec.engine))
+        _configure_engine(cfg.engine, c, engine, cfg)
+        engine.start()
+        ctx.log.info("%s engine running", cfg.engine)
+
+        _wait_for_stop(stop, cfg.duration_s)
+    finally:
+        if engine is not None:
+            engine.stop()
+        if archive is not None:
+            c.get(SpectrometerService).remove_frame_sink(archive)
+            archive.close()
+        flow = c.get(SpectrometerService).flow_stats
+        ctx.log.info(
+            "Spectrometer frames: %d received, %d merged by the server (credit flow control %s)",
+            flow.received, flow.skipped, "on" if flow.active else "off",
+        )
+        telemetry.close()
+        dispatcher.close()
+        if out is not sys.stdout:
+            out.close()
+        stop_devices(c, ctx)
+        ctx.lifecycle.clear()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run one analysis engine without Qt.")
+    parser.add_argument("--config", type=Path, help="JSON config file (see module docstring)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), help="override the configured engine")
+    parser.add_argument("--telemetry", help='"-" for stdout or a JSON-lines file path')
+    parser.add_argument("--record", help="record raw frames to this file stem")
+    parser.add_argument("--archive", help="write a compressed frame + telemetry archive")
+    parser.add_argument("--fake-spectrometer", action="store_true", help="use the synthetic spectrometer server")
+    args = parser.parse_args(argv)
+
+    cfg = HeadlessConfig.from_file(args.config) if args.config else HeadlessConfig()
+    if args.engine:
+        cfg.engine = args.engine
+    if args.telemetry:
+        cfg.telemetry = args.telemetry
+    if args.record:
+        cfg.record = args.record
+    if args.archive:
+        cfg.archive = args.archive
+    if args.fake_spectrometer and cfg.fake_spectrometer is None:
+        cfg.fake_spectrometer = {}
+    return run(cfg)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
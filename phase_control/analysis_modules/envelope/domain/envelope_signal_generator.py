@@ -25,6 +25,10 @@ class EnvelopeSignalGenerator:
         self._last_metric = 0.0
         self._direction = 1
 
+    @property
+    def last_metric(self) -> float:
+        return self._last_metric
+
     def update(self, spectrum: Spectrum) -> tuple[Optional[Angle], dict[str, Spectrum]]:
         """
         Returns:
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+TOPIC_ENVELOPE_TELEMETRY = "envelope.telemetry"
+
+
+@dataclass(frozen=True)
+class EnvelopeTelemetry:
+    """
+    Published by EnvelopeEngine after every correction step.
+    """
+    timestamp: float
+    metric: float
+    correction_deg: float
+    rotator_busy: bool
@@ -3,16 +3,19 @@ from __future__ import annotations
 from typing import Callable, Optional
 
 import threading
-import time
 
 from base_core.framework.services.runnable_service_base import RunnableServiceBase
 from base_core.framework.concurrency.interfaces import ITaskRunner, StreamHandle
 from base_core.framework.events.event_bus import EventBus
 
+from phase_control.analysis_modules.envelope.domain.events import TOPIC_ENVELOPE_TELEMETRY, EnvelopeTelemetry
+from phase_control.core.backpressure import TOPIC_BACKPRESSURE, BackpressureConfig, FrameGate
+from phase_control.core.clock import SYSTEM_CLOCK, IClock, StreamHandOff
 from phase_control.core.models import Spectrum
 from phase_control.io.events import TOPIC_NEW_SPECTRUM
+from phase_control.io.readiness import ensure_ready
 from phase_control.io.rotator.interfaces import IRotatorController
-from phase_control.io.spectrometer.interfaces import IFrameBuffer
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
 
 from phase_control.analysis_modules.envelope.domain.envelope_signal_generator import (
     EnvelopeSignalGenerator,
@@ -39,12 +42,19 @@ class EnvelopeEngine(RunnableServiceBase):
         rotator_worker: IRotatorController,
         bus: EventBus,
         cpu: ITaskRunner,
+        clock: IClock = SYSTEM_CLOCK,
+        backpressure: Optional[BackpressureConfig] = None,
+        roi: Optional[IRoiRegistry] = None,
     ) -> None:
         super().__init__()
         self._buffer = buffer
         self._rotator = rotator_worker
         self._bus = bus
         self._cpu = cpu
+        self._clock = clock
+        self._handoff = StreamHandOff(clock)
+        self._gate = FrameGate("envelope", backpressure, clock)
+        self._roi = roi
 
         self._generator = EnvelopeSignalGenerator(config)
 
@@ -65,6 +75,11 @@ class EnvelopeEngine(RunnableServiceBase):
     # -------------------------------------------------------------- #
     # public API
     # -------------------------------------------------------------- #
+    @property
+    def backpressure(self) -> BackpressureConfig:
+        """Load-shedding policy; fields may be changed while running."""
+        return self._gate.config
+
     def set_on_result(self, cb: Optional[Callable[[dict[str, Spectrum]], None]]) -> None:
         with self._cb_lock:
             self._on_result = cb
@@ -73,12 +88,15 @@ class EnvelopeEngine(RunnableServiceBase):
     # Lifecycle
     # -------------------------------------------------------------- #
     def start(self) -> None:
+        ensure_ready(spectrometer=self._buffer.ready, rotator=self._rotator.ready)
         super().start()
+        self._gate.reset()
+        self._claim_roi()
 
         self._unsub = self._bus.subscribe(TOPIC_NEW_SPECTRUM, self._on_new_spectrum)
 
         self._handle = self._cpu.stream(
-            self._producer,
+            lambda stop: self._handoff.run(self._producer(stop)),
             on_item=self._on_spectrum,
             on_error=self._on_error,
             on_complete=self._on_complete,
@@ -93,25 +111,36 @@ class EnvelopeEngine(RunnableServiceBase):
         if self._handle:
             self._handle.stop()
             self._handle = None
+        self._handoff.cancel()
         if self._unsub:
             self._unsub()
             self._unsub = None
         self._pending_event.clear()
+        if self._roi is not None:
+            self._roi.clear_roi("envelope")
 
     # -------------------------------------------------------------- #
     # Stream driver
     # -------------------------------------------------------------- #
     def _on_new_spectrum(self, _args) -> None:
-        spec = self._buffer.get_latest()
+        if not self._gate.offer():
+            return
+        spec, verdict = self._buffer.get_latest_checked()
         if spec is None:
             return
+        if verdict is not None and not verdict.ok:
+            # saturated / spiky frame: drop it before it costs a fit
+            self._gate.rejected(verdict.saturated, verdict.spikes)
+            return
         with self._pending_lock:
+            if self._latest is not None:
+                self._gate.coalesced()
             self._latest = spec
         self._pending_event.set()
 
     def _producer(self, stop: threading.Event):
         while not stop.is_set():
-            if not self._pending_event.wait(timeout=0.1):
+            if not self._clock.wait(self._pending_event, 0.1):
                 continue
 
             # take newest spectrum (coalesce)
@@ -127,10 +156,12 @@ class EnvelopeEngine(RunnableServiceBase):
             while self._rotator.is_busy and not stop.is_set():
                 if self._pending_event.is_set():
                     with self._pending_lock:
-                        spec = self._latest or spec
+                        if self._latest is not None:
+                            spec = self._latest
+                            self._gate.coalesced()
                         self._latest = None
                         self._pending_event.clear()
-                time.sleep(0.01)
+                self._clock.sleep(0.01)
 
             if stop.is_set():
                 break
@@ -139,7 +170,13 @@ class EnvelopeEngine(RunnableServiceBase):
 
     def _on_spectrum(self, spec: Spectrum) -> None:
         try:
-            out = self.step(spec)
+            self._claim_roi()  # follows wavelength_range edits while running
+            with self._handoff.consume(spec):
+                t0 = self._clock.now()
+                try:
+                    out = self.step(spec)
+                finally:
+                    self._record_step(self._clock.now() - t0)
             if out is None:
                 return
 
@@ -153,6 +190,16 @@ class EnvelopeEngine(RunnableServiceBase):
             import traceback
             traceback.print_exc()
 
+    def _claim_roi(self) -> None:
+        if self._roi is not None:
+            self._roi.set_roi("envelope", self._generator.config.wavelength_range)
+
+    def _record_step(self, duration_s: float) -> None:
+        self._gate.record_step(duration_s)
+        stats = self._gate.poll_stats()
+        if stats is not None:
+            self._bus.publish(TOPIC_BACKPRESSURE, stats)
+
     def _on_error(self, _e: BaseException) -> None:
         with self._lock:
             self._handle = None
@@ -178,4 +225,10 @@ class EnvelopeEngine(RunnableServiceBase):
             return None
 
         self._rotator.request_rotation(correction)
+        self._bus.publish(TOPIC_ENVELOPE_TELEMETRY, EnvelopeTelemetry(
+            timestamp=self._clock.time(),
+            metric=self._generator.last_metric,
+            correction_deg=float(correction.Deg),
+            rotator_busy=self._rotator.is_busy,
+        ))
         return out
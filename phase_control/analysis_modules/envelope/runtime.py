@@ -0,0 +1,26 @@
+# phase_control/analysis_modules/envelope/runtime.py
+"""
+Qt-free part of the envelope feature: config + EnvelopeEngine.
+Used by services.py (GUI) and by the headless runner.
+"""
+from __future__ import annotations
+
+from phase_control.analysis_modules.envelope.config import EnvelopeSignalGeneratorConfig
+from phase_control.analysis_modules.envelope.engine import EnvelopeEngine
+from phase_control.core.clock import IClock
+from phase_control.core.concurrency.runners import ICpuTaskRunner
+from phase_control.io.rotator.interfaces import IRotatorController
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
+
+
+def register(c, ctx) -> None:
+    c.register_singleton(EnvelopeSignalGeneratorConfig, lambda c: EnvelopeSignalGeneratorConfig())
+    c.register_singleton(EnvelopeEngine, lambda c: EnvelopeEngine(
+        config=c.get(EnvelopeSignalGeneratorConfig),
+        buffer=c.get(IFrameBuffer),
+        rotator_worker=c.get(IRotatorController),
+        bus=ctx.event_bus,
+        cpu=c.get(ICpuTaskRunner),
+        clock=c.get(IClock),
+        roi=c.get(IRoiRegistry),
+        ))
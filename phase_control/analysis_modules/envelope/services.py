@@ -0,0 +1,29 @@
+# phase_control/analysis_modules/envelope/services.py
+"""
+GUI part of the envelope feature (engine via .runtime, page VM + view).
+
+Imported lazily by EnvelopeModule the first time its page is selected.
+"""
+from __future__ import annotations
+
+from base_qt.view_models.runnable_vm import IUiDispatcher
+from phase_control.analysis_modules.envelope import runtime
+from phase_control.analysis_modules.envelope.config import EnvelopeSignalGeneratorConfig
+from phase_control.analysis_modules.envelope.engine import EnvelopeEngine
+from phase_control.analysis_modules.envelope.ui.envelope_page_view import EnvelopePageView
+from phase_control.analysis_modules.envelope.ui.envelope_page_vm import EnvelopePageVM
+from phase_control.core.plotting.spectrum_plot_VM import SpectrumPlotVM
+
+
+def register(c, ctx) -> None:
+    runtime.register(c, ctx)
+
+    
+    c.register_factory(EnvelopePageVM, lambda c: EnvelopePageVM(
+        c.get(EnvelopeEngine),
+        c.get(IUiDispatcher),
+        ctx.event_bus,
+        c.get(SpectrumPlotVM),
+        c.get(EnvelopeSignalGeneratorConfig)))
+    
+    c.register_factory(EnvelopePageView, lambda c: EnvelopePageView(c.get(EnvelopePageVM)))
@@ -8,9 +8,9 @@ from phase_control.analysis_modules.envelope.config import EnvelopeSignalGenerat
 from phase_control.analysis_modules.envelope.domain.enums import EnvelopeMode
 from phase_control.analysis_modules.envelope.engine import EnvelopeEngine
 from phase_control.core.models import Spectrum
-from phase_control.core.plotting.spectrum_plot_VM import SpectrumPlotVM
+from phase_control.core.plotting.spectrum_plot_VM import PlotPageSuspendMixin, SpectrumPlotVM
 
-class EnvelopePageVM(RunnableVMBase):
+class EnvelopePageVM(PlotPageSuspendMixin, RunnableVMBase):
     mode_changed = Signal(object)  # EnvelopeViewMode
 
     def __init__(
@@ -37,7 +37,7 @@ class EnvelopePageVM(RunnableVMBase):
             return
         self._config.mode = m
         self.mode_changed.emit(self._config.mode)
-        
+
     def start(self):
         self._engine.set_on_result(self._on_new_result)
         super().start()
@@ -47,6 +47,8 @@ class EnvelopePageVM(RunnableVMBase):
         self._engine.set_on_result(None)
     
     def _on_new_result(self, spectra: dict[str, Spectrum]) -> None:
+        if self.is_suspended:
+            return
         for key, spec in spectra.items():
 
             x = spec.wavelengths_nm.copy()
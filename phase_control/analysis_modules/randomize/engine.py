@@ -1,11 +1,12 @@
 import threading
-import time
 from typing import Optional
 
 from base_core.framework.guard.guard import Guard
 from base_core.framework.services.runnable_service_base import RunnableServiceBase
 from base_core.framework.concurrency.interfaces import ITaskRunner, StreamHandle
 from base_core.math.models import Angle, AngleUnit
+from phase_control.core.clock import SYSTEM_CLOCK, IClock, StreamHandOff
+from phase_control.io.readiness import ensure_ready
 from phase_control.io.rotator.interfaces import IRotatorController
 
 
@@ -14,10 +15,12 @@ POLL_S = 0.01
 
 
 class RandomizationEngine(RunnableServiceBase):
-    def __init__(self, *, rotator_worker: IRotatorController, cpu: ITaskRunner) -> None:
+    def __init__(self, *, rotator_worker: IRotatorController, cpu: ITaskRunner, clock: IClock = SYSTEM_CLOCK) -> None:
         super().__init__()
         self._rotator = rotator_worker
         self._cpu = cpu
+        self._clock = clock
+        self._handoff = StreamHandOff(clock)
         self._handle: Optional[StreamHandle] = None
         self._rotation_speed: int = 70
 
@@ -36,13 +39,14 @@ class RandomizationEngine(RunnableServiceBase):
         self.reset()
             
     def start(self) -> None:
+        ensure_ready(rotator=self._rotator.ready)
         self._stop_req.clear()
         self._reset_after_stop = False
         super().start()
 
         self._rotator.request_set_speed(self._rotation_speed)
         self._handle = self._cpu.stream(
-            self._producer,
+            lambda stop: self._handoff.run(self._producer(stop)),
             on_item=self._on_angle,
             on_error=self._on_error,
             on_complete=self._on_complete,
@@ -56,7 +60,8 @@ class RandomizationEngine(RunnableServiceBase):
         super().stop()
         if self._handle:
             self._handle.stop()
-            self._handle = None 
+            self._handle = None
+        self._handoff.cancel()
 
     def reset(self) -> None:
         self._reset_after_stop = True
@@ -65,7 +70,7 @@ class RandomizationEngine(RunnableServiceBase):
     def _producer(self, stop: threading.Event):
         while not stop.is_set() and not self._stop_req.is_set():
             while self._rotator.is_busy and not stop.is_set() and not self._stop_req.is_set():
-                time.sleep(POLL_S)
+                self._clock.sleep(POLL_S)
 
             if stop.is_set() or self._stop_req.is_set():
                 break
@@ -75,12 +80,13 @@ class RandomizationEngine(RunnableServiceBase):
             yield angle
 
         while self._rotator.is_busy:
-            time.sleep(POLL_S)
+            self._clock.sleep(POLL_S)
 
     def _on_angle(self, angle: Angle) -> None:
-        if self._stop_req.is_set():
-            return
-        self._rotator.request_rotation(angle)
+        with self._handoff.consume(angle):
+            if self._stop_req.is_set():
+                return
+            self._rotator.request_rotation(angle)
 
     def _on_complete(self) -> None:
         self._handle = None
@@ -0,0 +1,19 @@
+# phase_control/analysis_modules/randomize/runtime.py
+"""
+Qt-free part of the randomization feature: RandomizationEngine.
+Used by services.py (GUI) and by the headless runner.
+"""
+from __future__ import annotations
+
+from phase_control.analysis_modules.randomize.engine import RandomizationEngine
+from phase_control.core.clock import IClock
+from phase_control.core.concurrency.runners import ICpuTaskRunner
+from phase_control.io.rotator.interfaces import IRotatorController
+
+
+def register(c, ctx) -> None:
+    c.register_singleton(RandomizationEngine, lambda c: RandomizationEngine(
+        rotator_worker=c.get(IRotatorController),
+        cpu=c.get(ICpuTaskRunner),
+        clock=c.get(IClock),
+        ))
@@ -0,0 +1,22 @@
+# phase_control/analysis_modules/randomize/services.py
+"""
+GUI part of the randomization feature (engine via .runtime, page VM + view).
+
+Imported lazily by RandomizationModule the first time its page is selected.
+"""
+from __future__ import annotations
+
+from base_qt.view_models.runnable_vm import IUiDispatcher
+from phase_control.analysis_modules.randomize import runtime
+from phase_control.analysis_modules.randomize.engine import RandomizationEngine
+from phase_control.analysis_modules.randomize.ui.randomization_page_view import RandomizationPageView
+from phase_control.analysis_modules.randomize.ui.randomization_page_vm import RandomizationPageVM
+from phase_control.core.plotting.spectrum_plot_VM import SpectrumPlotVM
+
+
+def register(c, ctx) -> None:
+    runtime.register(c, ctx)
+
+    
+    c.register_factory(RandomizationPageVM, lambda c: RandomizationPageVM(c.get(RandomizationEngine), c.get(IUiDispatcher), ctx.event_bus, c.get(SpectrumPlotVM)))
+    c.register_factory(RandomizationPageView, lambda c: RandomizationPageView(c.get(RandomizationPageVM)))
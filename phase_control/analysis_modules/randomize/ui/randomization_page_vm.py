@@ -1,10 +1,10 @@
 from base_core.framework.guard.guard import Guard
 from base_qt.view_models.runnable_vm import EventBus, IUiDispatcher, RunnableVMBase
 from phase_control.analysis_modules.randomize.engine import RandomizationEngine
-from phase_control.core.plotting.spectrum_plot_VM import SpectrumPlotVM
+from phase_control.core.plotting.spectrum_plot_VM import PlotPageSuspendMixin, SpectrumPlotVM
 
 
-class RandomizationPageVM(RunnableVMBase):
+class RandomizationPageVM(PlotPageSuspendMixin, RunnableVMBase):
     def __init__(self, engine_service: RandomizationEngine, ui: IUiDispatcher, bus: EventBus, plot: SpectrumPlotVM) -> None:
         super().__init__(engine_service, ui, bus)
         self.plot_vm = plot
@@ -17,4 +17,5 @@ class RandomizationPageVM(RunnableVMBase):
     @rotation_speed.setter
     def rotation_speed(self, percent: int) -> None:
         engine = Guard.is_instance(self.engine, RandomizationEngine)
-        engine.rotation_speed = percent  
+        engine.rotation_speed = percent
+
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, fields
+from enum import Enum
+from functools import lru_cache
 import inspect
-from typing import Any, Callable, ClassVar, Sequence, TypeVar, get_type_hints
+from typing import Any, Callable, ClassVar, Optional, Sequence, TypeVar, get_type_hints
 
 import lmfit
 import numpy as np
@@ -15,6 +17,22 @@ from base_core.quantities.models import Length
 T = TypeVar("T", bound="FitParameter1")
 
 
+class FitSolver(str, Enum):
+    LMFIT = "lmfit"      # all parameters through lmfit (Levenberg-Marquardt)
+    VARPRO = "varpro"    # baseline solved exactly, see domain/varpro.py
+
+
+class TrackerKind(str, Enum):
+    FIT = "fit"    # lmfit model fit per spectrum (PhaseTracker)
+    FFT = "fft"    # Fourier-transform sideband phase (FftPhaseTracker)
+
+
+class LockState(str, Enum):
+    CALIBRATING = "calibrating"    # gathering full fits, no usable model yet
+    LOCKED = "locked"              # tracking the phase
+    REACQUIRING = "reacquiring"    # lock lost, re-locking from the last good parameters
+
+
 @dataclass
 class FitParameter:
     """
@@ -156,13 +174,15 @@ class FitParameter1:
     This class knows how to:
       - convert itself into kwargs for the fit function
       - rebuild a new instance from an lmfit result
-      - compute the mean of several FitParameter instances
+      - compute the mean of several instances (phase inverse-variance weighted)
 
     Notes on units (chosen for numerical stability):
       - carrier_wavelength, bandwidth: Length in nm (Prefix.NANO)
       - tau_ps: delay in picoseconds
       - a_R_THz_per_ps, a_L_THz_per_ps: chirp rates in THz/ps
       - phase: Angle (radians)
+      - phase_stderr: standard error of 'phase' [rad] from the fit
+        covariance, 0 = unknown
     """
 
     central_wavelength: Length = Length(794, Prefix.NANO)
@@ -176,6 +196,7 @@ class FitParameter1:
     a_L_THz_per_ps: float = 0.3     # chirp rate dν/dt for L [THz/ps]
 
     residual: float = 0.0
+    phase_stderr: float = 0.0
 
     def to_fit_kwargs(self, func: Callable[..., Any]) -> dict[str, float]:
         """
@@ -207,6 +228,7 @@ class FitParameter1:
 
         - parameters present in 'best_values' are updated
         - 'residual' is set to the squared sum of residuals
+        - 'phase_stderr' is taken from the covariance (0 if not available)
         - all other fields are copied from 'base'
         """
         best = result.best_values
@@ -222,6 +244,10 @@ class FitParameter1:
                 kwargs[name] = conv(best[name])
             elif name == "residual":
                 kwargs[name] = float(np.sum(result.residual ** 2))
+            elif name == "phase_stderr":
+                par = result.params.get("phase")
+                stderr = par.stderr if par is not None and par.vary else None
+                kwargs[name] = float(stderr) if stderr is not None and np.isfinite(stderr) else 0.0
             else:
                 kwargs[name] = getattr(base, name)
 
@@ -232,14 +258,20 @@ class FitParameter1:
         """
         Compute the mean of a sequence of FitParameter instances.
 
-        Numeric/angle/length fields are averaged; other fields are taken
-        from the first element.
+        If every item has a phase_stderr, 'phase' is weighted by 1 / stderr²
+        and the result carries the combined stderr; the stderr says nothing
+        about the other fields, so they (and 'phase' without stderrs) weigh
+        the same. Angles use the circular mean (continued from the first
+        item, so it stays on the same 2π branch); other numeric/length fields
+        the arithmetic one; non-numeric fields are taken from the first element.
         """
         if not items:
             raise ValueError("At least one FitParameter is required.")
 
         type_hints = get_type_hints(cls)
         kwargs: dict[str, Any] = {}
+        weights = phase_weights(items)
+        equal = np.ones(len(items))
 
         for f in fields(cls):
             name = f.name
@@ -249,10 +281,14 @@ class FitParameter1:
             to_float = cls._to_float_conv(field_type)
             from_float = cls._from_float_conv(field_type)
 
-            if field_type in cls._TO_FLOAT:
-                nums = [to_float(v) for v in values]
-                mean_val = sum(nums) / len(nums)
-                kwargs[name] = from_float(mean_val)
+            w = weights if name == "phase" and weights is not None else equal
+            if name == "phase_stderr":
+                kwargs[name] = combined_stderr(weights)
+            elif field_type is Angle:
+                kwargs[name] = from_float(circular_mean([to_float(v) for v in values], w))
+            elif field_type in cls._TO_FLOAT:
+                nums = np.asarray([to_float(v) for v in values], dtype=float)
+                kwargs[name] = from_float(float(np.mean(nums)))
             else:
                 # non-numeric fields: just take the first one
                 kwargs[name] = values[0]
@@ -261,13 +297,11 @@ class FitParameter1:
 
     def copy_from(self, other: "FitParameter") -> None:
         """
-        Copy a subset of fields from another FitParameter/AnalysisConfig.
-
-        Some AnalysisConfig-specific fields are deliberately NOT copied.
+        Copy the fit parameters (the FitParameter1 fields) from another
+        FitParameter1/AnalysisConfig; AnalysisConfig settings stay as they are.
         """
-        for f in fields(self):
-            if f.name not in ("wavelength_range", "avg_spectra", "residuals_threshold", "has_acceleration"):
-                setattr(self, f.name, getattr(other, f.name))
+        for f in fields(FitParameter1):
+            setattr(self, f.name, getattr(other, f.name))
 
     # ---- conversion helpers ---- #
 
@@ -291,6 +325,41 @@ class FitParameter1:
     def _from_float_conv(cls, field_type: type[Any]) -> Callable[[float], Any]:
         return cls._FROM_FLOAT.get(field_type, lambda v: v)
 
+    @classmethod
+    def field_to_float(cls, name: str, value: Any) -> float:
+        """Plain float of a value of field 'name' (Length in nm, Angle in rad)."""
+        return float(cls._to_float_conv(_field_types(FitParameter1).get(name, float))(value))
+
+    @classmethod
+    def field_from_float(cls, name: str, value: float) -> Any:
+        """Inverse of field_to_float: a float as the type of field 'name'."""
+        return cls._from_float_conv(_field_types(FitParameter1).get(name, float))(value)
+
+
+@lru_cache(maxsize=None)
+def _field_types(cls: type) -> dict[str, Any]:
+    return get_type_hints(cls)
+
+
+def phase_weights(items: Sequence[Any]) -> Optional[np.ndarray]:
+    """1 / phase_stderr² per item, None unless every item has a stderr."""
+    stderr = np.asarray([float(getattr(p, "phase_stderr", 0.0)) for p in items], dtype=float)
+    if stderr.size and np.all(stderr > 0) and np.all(np.isfinite(stderr)):
+        return 1.0 / stderr ** 2
+    return None
+
+
+def combined_stderr(weights: Optional[np.ndarray]) -> float:
+    """Stderr of the inverse-variance weighted mean, 0 = unknown."""
+    return 1.0 / float(np.sqrt(np.sum(weights))) if weights is not None else 0.0
+
+
+def circular_mean(phases: Sequence[float], weights: np.ndarray) -> float:
+    """Weighted circular mean, continued from phases[0]."""
+    phi = np.asarray(phases, dtype=float)
+    mean = float(np.arctan2(np.sum(weights * np.sin(phi)), np.sum(weights * np.cos(phi))))
+    anchor = float(phi[0])
+    return anchor + (mean - anchor + np.pi) % (2.0 * np.pi) - np.pi
 
 
 @dataclass
@@ -301,10 +370,47 @@ class AnalysisConfig(FitParameter1):
     Extends FitParameter with:
       - wavelength_range: range in which the fit is performed
       - residuals_threshold: max allowed residual for accepting a phase
-      - avg_spectra: number of spectra to average in PhaseTracker
+      - avg_spectra: number of spectra to average in PhaseTracker (start
+        value of the window with adaptive_avg)
+      - adaptive_avg: size the window from the measured phase scatter,
+        within [avg_spectra_min, avg_spectra_max]
+      - fix_baseline: keep 'baseline' fixed in the initial fits (frames
+        are dark/flat corrected, see io/spectrometer/correction.py)
+      - uniform_nu: fit on the window resampled to a uniform ν grid
+        (core/resampling.py) instead of the cut λ axis
+      - tracker: model fit or FFT sideband phase (always on uniform ν)
+      - fft_window: half-width of the sideband window, relative to tau_ps
+      - fft_min_coherence: FFT phases with a lower sideband coherence
+        against the model reference are not accepted
+      - fft_check_every: phase-only model fit every n-th FFT frame as a
+        cross-check of the FFT phase (0 = never)
+      - solver: nonlinear solver of the initial (full) fits
+      - fit_levels: resolution levels of the initial fits (1 = full
+        resolution only, see domain/multires.py)
+      - phase_stderr_target: stop collecting phase fits early once the
+        weighted mean reaches this standard error [rad], 0 = always
+        collect avg_spectra
+      - lock_loss_frames: consecutive phase fits at or above
+        residuals_threshold that count as a lost lock (0 = never)
+      - reacquire_frames: fast re-lock attempts (one per frame) before
+        falling back to a full calibration
     """
     wavelength_range: Range[Length] = Range(Length(780, Prefix.NANO), Length(810, Prefix.NANO))
     residuals_threshold: float = 15
     avg_spectra: int = 10
+    adaptive_avg: bool = False
+    avg_spectra_min: int = 2
+    avg_spectra_max: int = 50
     has_acceleration: bool = True
+    fix_baseline: bool = False
+    uniform_nu: bool = False
+    tracker: TrackerKind = TrackerKind.FIT
+    fft_window: float = 0.5
+    fft_min_coherence: float = 0.5
+    fft_check_every: int = 0
+    solver: FitSolver = FitSolver.LMFIT
+    fit_levels: int = 1
+    phase_stderr_target: float = 0.0
+    lock_loss_frames: int = 5
+    reacquire_frames: int = 10
     
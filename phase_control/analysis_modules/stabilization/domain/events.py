@@ -1 +1,37 @@
-TOPIC_NEW_ANALYSIS_CONFIG = "stabilization.new_config"
\ No newline at end of file
+from dataclasses import dataclass
+
+
+TOPIC_NEW_ANALYSIS_CONFIG = "stabilization.new_config"
+TOPIC_STABILIZATION_TELEMETRY = "stabilization.telemetry"
+TOPIC_LOCK_STATE = "stabilization.lock_state"
+
+
+@dataclass(frozen=True)
+class StabilizationTelemetry:
+    """
+    Published by AnalysisEngine after every accepted phase.
+    """
+    timestamp: float
+    phase_rad: float
+    residual: float
+    correction_deg: float
+    rotator_busy: bool
+    phase_stderr_rad: float = 0.0      # of the accepted (averaged) phase, 0 = unknown
+    avg_window: int = 0                # frames per accepted phase (PhaseTracker window)
+    settled: bool = False              # PhaseCorrector: error inside the band
+    moves_to_lock: int = 0             # of the last finished acquisition
+    settle_time_s: float = 0.0         # of the last finished acquisition
+    fft_check_rad: float = 0.0         # FFT - fit phase at the last cross-check, 0 = none
+
+
+@dataclass(frozen=True)
+class LockStateChanged:
+    """
+    Published by AnalysisEngine when the tracker's LockState changes;
+    duration_s is the time spent in 'previous' (REACQUIRING -> LOCKED:
+    the recovery time).
+    """
+    timestamp: float
+    state: str
+    previous: str
+    duration_s: float
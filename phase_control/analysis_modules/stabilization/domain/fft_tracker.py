@@ -0,0 +1,196 @@
+# phase_control/modules/stabilization/fft_tracker.py
+"""
+Fourier-transform spectral interferometry (FTSI) phase tracker.
+
+Per spectrum on a uniform ν grid (core/resampling.py):
+
+  - subtract the mean, apodize (Hann) and FFT; the conjugate axis is time [ps]
+  - keep the interference sideband around t = tau_ps (Hann window of
+    half-width fft_window * tau_ps)
+  - inverse FFT -> complex fringe signal s(ν)
+  - phase = angle(<s_ref, s>) / slope
+
+s_ref is the same transform of the model at phase 0 and 'slope' the
+model's phase response (from a second reference at REFERENCE_STEP_RAD), so
+the result is on the scale of the fitted 'phase' parameter whatever the
+sign conventions of the model and the grid. Both are cached per grid and
+fit parameters. One FFT pair per frame, no iterations.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+import numpy as np
+
+from base_core.math.functions import cfg_projection_nu_equal_amplitudes_safe
+from base_core.math.models import Angle
+from phase_control.analysis_modules.stabilization.config import AnalysisConfig, FitParameter1, LockState
+from phase_control.analysis_modules.stabilization.domain.phase_tracker import PhaseTracker
+from phase_control.analysis_modules.stabilization.interfaces import IPhaseTracker
+from phase_control.core.models import Spectrum
+from phase_control.core.resampling import NuResampler
+
+log = logging.getLogger(__name__)
+
+REFERENCE_STEP_RAD = 0.5
+# model phase response below this (|d angle / d phase|) means the window misses the sideband
+MIN_SLOPE = 0.1
+
+
+@dataclass(frozen=True)
+class _Reference:
+    window: np.ndarray         # sideband mask on the FFT axis
+    apodization: np.ndarray
+    s_ref: np.ndarray          # sideband signal of the model at phase 0
+    norm_ref: float
+    slope: float               # d angle / d phase
+
+
+class FftPhaseTracker(IPhaseTracker):
+    """
+    Phase from the interference sideband. The model fit ('calibration', a
+    PhaseTracker on the same config) runs until it has configured the fit
+    parameters the reference is built from; after that it only runs every
+    fft_check_every frames as a cross-check (0 = never), check_error_rad
+    holds the last FFT - fit difference. Without a usable
+    sideband the calibration keeps tracking; lock_loss_frames frames in a
+    row below fft_min_coherence hand the spectra back to the calibration,
+    which re-acquires the lock.
+    """
+
+    current_phase: Angle | None = None
+    avg_window = 1
+
+    def __init__(self, config: AnalysisConfig, calibration: PhaseTracker) -> None:
+        self._config = config
+        self._calibration = calibration
+        self._reference: Optional[_Reference] = None
+        self._reference_for: tuple[Optional[NuResampler], tuple] = (None, ())
+        # fit parameters the reference depends on (everything but phase/residual/stderr)
+        self._key_fields = tuple(
+            f.name for f in fields(FitParameter1) if f.name not in ("phase", "residual", "phase_stderr")
+        )
+        self._frames = 0
+        self._low_frames = 0
+        self.coherence = 0.0
+        self.check_error_rad: Optional[float] = None
+
+    @property
+    def calibrated(self) -> bool:
+        cal = self._calibration
+        return cal.current_phase is not None and cal.lock_state is not LockState.REACQUIRING
+
+    @property
+    def lock_state(self) -> LockState:
+        return self._calibration.lock_state
+
+    def update(self, spectrum: Spectrum) -> None:
+        if not self.calibrated:
+            self.current_phase = None  # no correction; unwrapping restarts from config.phase
+            self._low_frames = 0
+            self._calibration.update(spectrum)
+            return
+
+        phase, coherence = self.measure(spectrum)
+        if phase is None:
+            # no reference for these parameters/grid: the model fit tracks instead
+            self._calibration.update(spectrum)
+            cal = self._calibration.current_phase
+            self.current_phase = Angle(0) if cal is None else cal
+            return
+        self.coherence = coherence
+        self._frames += 1
+
+        if coherence >= self._config.fft_min_coherence:
+            # continue from the last accepted phase like the fit does (no 2π jumps)
+            last = float(self._config.phase)
+            self.current_phase = Angle(last + _wrap(phase - last))
+            self._config.phase = self.current_phase
+            self._config.residual = 1.0 - coherence
+            self._config.phase_stderr = 0.0  # no covariance on this path
+            self._low_frames = 0
+        else:
+            self.current_phase = Angle(0)  # no correction from an untrusted phase
+            self._low_frames += 1
+            if 0 < self._config.lock_loss_frames <= self._low_frames:
+                self._calibration.lose_lock()
+
+        check_every = self._config.fft_check_every
+        if check_every > 0 and self._frames % check_every == 0:
+            check = self._calibration.fit_phase(spectrum)
+            self.check_error_rad = _wrap(phase - float(check.phase))
+            log.debug("fft - fit phase: %g rad", self.check_error_rad)
+
+    def measure(self, spectrum: Spectrum) -> tuple[Optional[float], float]:
+        """(phase [rad] in (-π/|slope|, π/|slope|], coherence 0..1); None without a usable sideband."""
+        resampler: Optional[NuResampler] = getattr(spectrum, "resampler", None)
+        if resampler is None:
+            return None, 0.0
+        ref = self._get_reference(resampler)
+        if ref is None:
+            return None, 0.0
+
+        s = self._sideband(np.asarray(spectrum.intensity, dtype=float), ref)
+        z = np.vdot(ref.s_ref, s)
+        norm = float(np.linalg.norm(s)) * ref.norm_ref
+        coherence = float(abs(z) / norm) if norm > 0 else 0.0
+        return float(np.angle(z)) / ref.slope, coherence
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _get_reference(self, resampler: NuResampler) -> Optional[_Reference]:
+        key = tuple(FitParameter1.field_to_float(name, getattr(self._config, name)) for name in self._key_fields)
+        key += (float(self._config.fft_window),)
+        built_for, built_key = self._reference_for
+        if built_for is resampler and built_key == key:
+            return self._reference  # also caches a failed build
+
+        kwargs = self._config.to_fit_kwargs(cfg_projection_nu_equal_amplitudes_safe)
+        kwargs.pop("phase", None)
+        self._reference = self._build_reference(resampler, kwargs)
+        self._reference_for = (resampler, key)
+        return self._reference
+
+    def _build_reference(self, resampler: NuResampler, kwargs: dict[str, Any]) -> Optional[_Reference]:
+        n = resampler.num_points
+        tau = abs(float(kwargs.get("tau_ps", 0.0)))
+        if n < 8 or tau <= 0 or resampler.step_thz <= 0:
+            return None
+
+        t = np.fft.fftfreq(n, d=resampler.step_thz)  # ps
+        half = max(1e-9, float(self._config.fft_window)) * tau
+        inside = np.abs(t - tau) < half
+        if not np.any(inside):
+            return None
+        window = np.zeros(n)
+        window[inside] = 0.5 * (1.0 + np.cos(np.pi * (t[inside] - tau) / half))
+
+        partial = _Reference(window, np.hanning(n), np.empty(0, dtype=complex), 0.0, 1.0)
+        s0 = self._sideband(self._model(resampler, kwargs, 0.0), partial)
+        s1 = self._sideband(self._model(resampler, kwargs, REFERENCE_STEP_RAD), partial)
+        slope = float(np.angle(np.vdot(s0, s1))) / REFERENCE_STEP_RAD
+        norm = float(np.linalg.norm(s0))
+        if abs(slope) < MIN_SLOPE or norm <= 0:
+            log.debug("fft tracker: no sideband at tau_ps = %g", tau)
+            return None
+        return _Reference(window, partial.apodization, s0, norm, slope)
+
+    @staticmethod
+    def _model(resampler: NuResampler, kwargs: dict[str, Any], phase: float) -> np.ndarray:
+        return np.asarray(
+            cfg_projection_nu_equal_amplitudes_safe(resampler.wavelengths_nm, phase=phase, **kwargs),
+            dtype=float,
+        )
+
+    @staticmethod
+    def _sideband(y: np.ndarray, ref: _Reference) -> np.ndarray:
+        spectrum = np.fft.fft((y - y.mean()) * ref.apodization)
+        return np.fft.ifft(spectrum * ref.window)
+
+
+def _wrap(x: float) -> float:
+    return (x + np.pi) % (2.0 * np.pi) - np.pi
@@ -0,0 +1,107 @@
+# phase_control/modules/stabilization/fit_store.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from phase_control.analysis_modules.stabilization.config import FitParameter1
+
+DEFAULT_FIT_STORE_PATH = Path.home() / ".phase_control" / "stabilization_fit.json"
+
+# Don't rewrite the file for every accepted phase
+SAVE_INTERVAL_S = 60.0
+
+
+def wavelength_axis_hash(wavelengths_nm: Sequence[float]) -> str:
+    """
+    Stable hash of a (cut) wavelength axis; rounded to 1 pm so that float
+    noise from the meta message does not invalidate a stored fit.
+    """
+    arr = np.round(np.asarray(wavelengths_nm, dtype=float), 3)
+    return hashlib.sha1(arr.tobytes()).hexdigest()
+
+
+@dataclass
+class StoredFit:
+    axis_hash: str
+    saved_at: float
+    values: dict[str, float]
+
+    def apply_to(self, target: FitParameter1) -> None:
+        """
+        Write the stored fit parameters into 'target' (an AnalysisConfig);
+        analysis settings (range, thresholds, ...) are left untouched.
+        """
+        for f in fields(FitParameter1):
+            if f.name in self.values:
+                setattr(target, f.name, FitParameter1.field_from_float(f.name, self.values[f.name]))
+
+    @classmethod
+    def from_params(cls, params: FitParameter1, axis_hash: str) -> StoredFit:
+        values = {f.name: FitParameter1.field_to_float(f.name, getattr(params, f.name)) for f in fields(FitParameter1)}
+        return cls(axis_hash=axis_hash, saved_at=time.time(), values=values)
+
+
+class FitParameterStore:
+    """
+    Persists the last converged fit parameters (envelope, tau, chirps,
+    phase, residual) as JSON, tagged with the wavelength-axis hash.
+    """
+
+    def __init__(self, path: Path = DEFAULT_FIT_STORE_PATH, save_interval_s: float = SAVE_INTERVAL_S) -> None:
+        self._path = Path(path)
+        self._save_interval_s = save_interval_s
+        self._last_save = 0.0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self, axis_hash: str) -> Optional[StoredFit]:
+        """
+        Return the stored fit if it exists and was taken on the same axis.
+        """
+        try:
+            raw: dict[str, Any] = json.loads(self._path.read_text(encoding="utf-8"))
+            stored = StoredFit(
+                axis_hash=str(raw["axis_hash"]),
+                saved_at=float(raw["saved_at"]),
+                values={k: float(v) for k, v in raw["values"].items()},
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if stored.axis_hash != axis_hash:
+            return None
+        return stored
+
+    def save(self, params: FitParameter1, axis_hash: str, force: bool = False) -> bool:
+        """
+        Write 'params' (rate limited unless force=True). Returns True if written.
+        """
+        now = time.monotonic()
+        if not force and self._last_save and now - self._last_save < self._save_interval_s:
+            return False
+
+        stored = StoredFit.from_params(params, axis_hash)
+        payload = {"axis_hash": stored.axis_hash, "saved_at": stored.saved_at, "values": stored.values}
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, self._path)  # atomic: never leave a half-written file
+        self._last_save = now
+        return True
+
+    def clear(self) -> None:
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
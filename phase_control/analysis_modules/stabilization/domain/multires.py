@@ -0,0 +1,61 @@
+# phase_control/modules/stabilization/multires.py
+"""
+Coarse-to-fine (multi-resolution) fitting.
+
+The spectrum is binned into a pyramid once per frame (reshape + mean, factor
+PYRAMID_FACTOR per level). The fit runs on the coarsest level first and
+every finer level starts from the previous result, so most solver
+iterations happen on a few dozen points and the full-resolution fit only
+refines. Evaluations are counted per level (LevelStats).
+"""
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from phase_control.analysis_modules.stabilization.config import AnalysisConfig, FitParameter1
+
+PYRAMID_FACTOR = 4
+# coarse levels below this many points are skipped (too few samples per fringe)
+MIN_LEVEL_POINTS = 32
+
+# (x, y, start config) -> (fitted parameters, model evaluations)
+LevelFit = Callable[[np.ndarray, np.ndarray, AnalysisConfig], tuple[FitParameter1, int]]
+
+
+@dataclass(frozen=True)
+class LevelStats:
+    binning: int
+    points: int
+    nfev: int
+    residual: float
+
+    def __str__(self) -> str:
+        return f"x{self.binning}: {self.points} pts, {self.nfev} evals, residual {self.residual:.4g}"
+
+
+def build_pyramid(x: np.ndarray, y: np.ndarray, levels: int, factor: int = PYRAMID_FACTOR) -> list[tuple[int, np.ndarray, np.ndarray]]:
+    """[(binning, x, y), ...] from coarsest to full resolution."""
+    out = [(1, x, y)]
+    for k in range(1, max(1, levels)):
+        b = factor ** k
+        n = (x.size // b) * b
+        if n // b < MIN_LEVEL_POINTS:
+            break
+        out.append((b, x[:n].reshape(-1, b).mean(axis=1), y[:n].reshape(-1, b).mean(axis=1)))
+    return out[::-1]
+
+
+def fit_multires(x: np.ndarray, y: np.ndarray, config: AnalysisConfig, fit: LevelFit) -> tuple[FitParameter1, list[LevelStats]]:
+    """Run 'fit' on every pyramid level of (x, y); 'config' is not modified."""
+    work = copy.copy(config)
+    stats: list[LevelStats] = []
+    params = None
+    for binning, xl, yl in build_pyramid(x, y, config.fit_levels):
+        params, nfev = fit(xl, yl, work)
+        work.copy_from(params)
+        stats.append(LevelStats(binning, int(xl.size), nfev, float(params.residual)))
+    return params, stats
@@ -1,68 +1,184 @@
 # phase_control/modules/stabilization/phase_corrector.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import Enum
 import math
+from typing import Optional
 
 import numpy as np
 
 from base_core.math.enums import AngleUnit
 from base_core.math.models import Angle
+from phase_control.core.clock import SYSTEM_CLOCK, IClock
 
-PHASE_TOLERANCE = Angle(10, AngleUnit.DEG)
+DEFAULT_TOLERANCE_DEG = 10.0
+PHASE_TOLERANCE = Angle(DEFAULT_TOLERANCE_DEG, AngleUnit.DEG)
 
 # Converts phase error [deg] to half-wave-plate rotation [deg]
 CONVERSION_CONST = 1 / 8       # depends on optics
 CORRECTION_SIGN = 1           # depends on QWP orientation
 
 
+class ControllerMode(str, Enum):
+    P = "p"      # one proportional move per accepted phase
+    PI = "pi"    # plus an integral term that learns the drift between moves
+
+
+@dataclass
+class CorrectorConfig:
+    """
+    PhaseCorrector settings; errors and tolerances are phase [deg],
+    max_step_deg is wave-plate rotation [deg]. The defaults reproduce the
+    plain proportional corrector (full correction, 10° deadband).
+
+      - tolerance_deg: an error at or below this counts as settled (no move)
+      - release_deg: once settled, move again only above this (hysteresis,
+        <= tolerance_deg = none)
+      - kp: proportional gain (1 = correct the whole error in one move)
+      - kp_near, schedule_deg: gain for errors below schedule_deg (gain
+        scheduling, schedule_deg 0 = kp everywhere)
+      - ki: integral gain per accepted phase (PI mode only)
+      - integral_limit_deg: clamp of the integral term (anti-windup); keep
+        it below tolerance_deg, a move lands at -integral
+      - max_step_deg: largest wave-plate rotation per move, 0 = unlimited
+    """
+    mode: ControllerMode = ControllerMode.P
+    tolerance_deg: float = DEFAULT_TOLERANCE_DEG
+    release_deg: float = DEFAULT_TOLERANCE_DEG
+    kp: float = 1.0
+    kp_near: float = 1.0
+    schedule_deg: float = 0.0
+    ki: float = 0.05
+    integral_limit_deg: float = 5.0
+    max_step_deg: float = 0.0
+
+
+@dataclass(frozen=True)
+class CorrectorStats:
+    settled: bool
+    moves: int                 # since start
+    moves_to_lock: int         # moves of the last finished acquisition
+    settle_time_s: float       # first error outside the band -> settled, last acquisition
+    integral_deg: float
+
+
 @dataclass
 class PhaseCorrector:
     """
     Convert a measured phase offset into a physical half-wave-plate
-    rotation angle, with wrapping and tolerance logic.
+    rotation angle: deadband with hysteresis, P or PI control (optionally
+    gain-scheduled), anti-windup and a per-move rate limit. An acquisition
+    runs from the first error outside the band until the error settles;
+    its moves and duration are kept in 'stats'.
     """
+    config: CorrectorConfig = field(default_factory=CorrectorConfig)
+    clock: IClock = SYSTEM_CLOCK
     _correction_angle: Angle = Angle(0, AngleUnit.DEG)
     _target_phase = Angle(0, AngleUnit.DEG)
-    
+
+    _integral_deg: float = field(default=0.0, init=False)
+    _settled: bool = field(default=False, init=False)
+    _moves: int = field(default=0, init=False)
+    _acquire_moves: int = field(default=0, init=False)
+    _acquire_start: Optional[float] = field(default=None, init=False)
+    _moves_to_lock: int = field(default=0, init=False)
+    _settle_time_s: float = field(default=0.0, init=False)
+
     @property
     def target_phase(self):
         return self._target_phase
-    
+
     @target_phase.setter
     def target_phase(self, value: Angle):
         self._target_phase = value
-    
+        self._settled = False  # new set point: next error starts an acquisition
+
+    @property
+    def stats(self) -> CorrectorStats:
+        return CorrectorStats(
+            settled=self._settled,
+            moves=self._moves,
+            moves_to_lock=self._moves_to_lock,
+            settle_time_s=self._settle_time_s,
+            integral_deg=self._integral_deg,
+        )
+
+    def reset(self) -> None:
+        """Forget the integral and the settled state (e.g. after the tracker lost lock)."""
+        self._integral_deg = 0.0
+        self._settled = False
+        self._acquire_start = None
+        self._acquire_moves = 0
+
     def update(self, phase: Angle) -> Angle:
         """
         Update the internal correction angle based on the current phase.
 
         Steps:
-          1. wrap phase to [-pi, pi]
-          2. compute phase error relative to STARTING_PHASE
-          3. if |error| > PHASE_TOLERANCE, convert to HWP rotation
-             otherwise, set correction to 0
+          1. compute phase error relative to the target phase
+          2. inside the band (tolerance_deg, release_deg once settled):
+             no rotation, close the acquisition
+          3. otherwise controller output (P or PI), limited to max_step_deg,
+             converted to HWP rotation
         """
         if phase == 0.0:
             return
-        
-        #phase_error = self._wrap_phase_pi(Angle(phase - self._target_phase))
-        phase_error = Angle(phase - self._target_phase)
-        
-        '''
-        if Angle(np.abs(phase_wrapped - self._target_phase)) <= Angle(np.abs(np.abs(phase_wrapped) - np.abs(self._target_phase))):
-            phase_error = Angle(phase_wrapped - self._target_phase)
-        else:
-            phase_error = Angle(np.abs(np.abs(phase_wrapped) - np.abs(self._target_phase)))
-        '''
-        if np.abs(phase_error) > PHASE_TOLERANCE:
-            correction_phase = phase_error
-        else:
-            correction_phase = Angle(0)
-
-        self._correction_angle = self._convert_phase_to_hwp(correction_phase)
+
+        cfg = self.config
+        now = self.clock.time()
+        error_deg = Angle(phase - self._target_phase).Deg
+
+        previous_integral = self._integral_deg
+        if cfg.mode is ControllerMode.PI:
+            # every accepted phase counts, also inside the band: with the right
+            # integral the drift ramp between moves averages to zero
+            limit = abs(cfg.integral_limit_deg)
+            self._integral_deg = float(np.clip(self._integral_deg + cfg.ki * error_deg, -limit, limit))
+
+        band = max(cfg.release_deg, cfg.tolerance_deg) if self._settled else cfg.tolerance_deg
+        if abs(error_deg) <= band:
+            if not self._settled:
+                self._settle(now)
+            self._correction_angle = Angle(0, AngleUnit.DEG)
+            return self._correction_angle
+
+        if self._settled or self._acquire_start is None:
+            self._settled = False
+            self._acquire_start = now
+            self._acquire_moves = 0
+
+        hwp_deg = self._control(error_deg, previous_integral)
+        self._moves += 1
+        self._acquire_moves += 1
+        self._correction_angle = Angle(hwp_deg, AngleUnit.DEG)
         return self._correction_angle
 
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _control(self, error_deg: float, previous_integral: float) -> float:
+        """Controller output as HWP rotation [deg], with anti-windup."""
+        cfg = self.config
+        kp = cfg.kp_near if cfg.schedule_deg > 0 and abs(error_deg) < cfg.schedule_deg else cfg.kp
+
+        hwp_deg = self._convert_phase_to_hwp_deg(kp * error_deg + self._integral_deg)
+        if cfg.max_step_deg > 0 and abs(hwp_deg) > cfg.max_step_deg:
+            hwp_deg = math.copysign(cfg.max_step_deg, hwp_deg)
+            # saturated: keep the integral from growing further
+            if abs(self._integral_deg) > abs(previous_integral):
+                self._integral_deg = previous_integral
+        return hwp_deg
+
+    def _settle(self, now: float) -> None:
+        self._settled = True
+        if self._acquire_start is not None:
+            self._moves_to_lock = self._acquire_moves
+            self._settle_time_s = now - self._acquire_start
+        self._acquire_start = None
+        self._acquire_moves = 0
+
     @staticmethod
     def _wrap_phase_pi(phase: Angle) -> Angle:
         """
@@ -78,6 +194,8 @@ class PhaseCorrector:
         """
         Convert a phase in [rad/deg] to the required half-wave-plate rotation.
         """
-        phase_deg = phase.Deg
-        hwp_deg = CORRECTION_SIGN * phase_deg * CONVERSION_CONST
-        return Angle(hwp_deg, AngleUnit.DEG)
+        return Angle(PhaseCorrector._convert_phase_to_hwp_deg(phase.Deg), AngleUnit.DEG)
+
+    @staticmethod
+    def _convert_phase_to_hwp_deg(phase_deg: float) -> float:
+        return CORRECTION_SIGN * phase_deg * CONVERSION_CONST
@@ -1,35 +1,90 @@
 # phase_control/modules/stabilization/phase_tracker.py
 from __future__ import annotations
 
-from collections import deque
+from dataclasses import fields
 import inspect
-from typing import Any, Deque
+import logging
+import math
+from typing import Any, Optional
 
 import lmfit
-
+import numpy as np
 
 from base_core.math.functions import usCFG_projection, cfg_projection_nu_equal_amplitudes_safe
 from base_core.math.models import Angle
-from phase_control.analysis_modules.stabilization.config import AnalysisConfig, FitParameter, FitParameter1
+from phase_control.analysis_modules.stabilization.config import (
+    AnalysisConfig,
+    FitParameter,
+    FitParameter1,
+    FitSolver,
+    LockState,
+    combined_stderr,
+    phase_weights,
+)
+from phase_control.analysis_modules.stabilization.domain.fit_store import FitParameterStore, wavelength_axis_hash
+from phase_control.analysis_modules.stabilization.domain.multires import LevelStats, fit_multires
+from phase_control.analysis_modules.stabilization.domain.varpro import fit_varpro
+from phase_control.analysis_modules.stabilization.interfaces import IPhaseTracker
 from phase_control.core.models import Spectrum
 
+log = logging.getLogger(__name__)
+
+# fewest phase fits the early stop (phase_stderr_target) combines
+MIN_ADAPTIVE_FITS = 2
+# adaptive window: scatter target without a phase_stderr_target, max resize per batch
+DEFAULT_WINDOW_TARGET_RAD = 0.02
+MAX_WINDOW_STEP = 2.0
+SCATTER_EMA_ALPHA = 0.3
+# re-acquisition template search: phase grid over 2π, tau_ps grid of ±REACQUIRE_TAU_SPAN (relative)
+REACQUIRE_PHASE_STEPS = 16
+REACQUIRE_TAU_STEPS = 5
+REACQUIRE_TAU_SPAN = 0.05
 
-class PhaseTracker:
+
+class PhaseTracker(IPhaseTracker):
     """
     Tracks the current phase by fitting a model to incoming spectra.
 
     Workflow (per spectrum):
+      - if a fit store is given and holds parameters for this wavelength
+        axis, validate them with one phase-only fit and skip gathering
       - during initial phase, gather several full fits to build a good
         starting configuration (FitParameter.mean)
       - once configured, only fit the phase parameter on subsequent spectra
+        and combine a window of them (inverse-variance weighted circular
+        mean), or fewer once the combined stderr reaches phase_stderr_target.
+        The window is avg_spectra (read live) or, with adaptive_avg, sized
+        from the measured phase scatter within [avg_spectra_min, avg_spectra_max]
       - if the residuals are low enough, accept the new phase as current
+      - lock_loss_frames phase fits in a row at or above residuals_threshold
+        mean the lock is lost (lock_state REACQUIRING): every frame then
+        tries a fast re-lock from the last accepted parameters (template
+        search over phase and tau_ps, then a phase + tau_ps fit); after
+        reacquire_frames failures the tracker calibrates again, starting
+        from those parameters
     """
 
     current_phase: Angle | None = None
+    lock_state: LockState = LockState.CALIBRATING
 
-    def __init__(self, start_config: AnalysisConfig) -> None:
+    def __init__(self, start_config: AnalysisConfig, store: Optional[FitParameterStore] = None) -> None:
         self._config: AnalysisConfig = start_config
-        self._fits: Deque[FitParameter1] = deque(maxlen=self._config.avg_spectra)
+        self._fits: list[FitParameter1] = []
+
+        # averaging window: avg_spectra, or adapted to the measured phase scatter
+        self.avg_window = max(1, int(self._config.avg_spectra))
+        self._avg_setting = self._config.avg_spectra
+        self._scatter_var: Optional[float] = None
+
+        self._store = store
+        self._warm_start_tried = store is None
+        self._unsaved_axis: Optional[str] = None  # axis of accepted parameters the store has not written yet
+        self.last_fit_levels: list[LevelStats] = []  # evaluations per level of the last initial fit
+
+        # lock supervision
+        self._last_good: Optional[FitParameter1] = None
+        self._bad_frames = 0
+        self._reacquire_attempts = 0
 
     # ------------------------------------------------------------------ #
     # Public API
@@ -39,6 +94,15 @@ class PhaseTracker:
         """
         Update the internal phase estimate based on a new spectrum.
         """
+        if not self._warm_start_tried:
+            self._warm_start_tried = True
+            if self._try_warm_start(spectrum):
+                return
+
+        if self.lock_state is LockState.REACQUIRING:
+            self._reacquire(spectrum)
+            return
+
         if len(self._fits) < self._config.avg_spectra and self.current_phase is None:
             # Initial phase: gather good starting parameters
             self._fits.append(self._initialize_fit_parameters(spectrum))
@@ -49,13 +113,16 @@ class PhaseTracker:
                 # Once we have enough initial fits, consolidate them
                 self._config.copy_from(FitParameter1.mean(self._fits))
 
-            if len(self._fits) < self._config.avg_spectra:
+            if len(self._fits) < self._window_size() and not self._precise_enough():
                 # Collect phase-only fits for averaging
-                self._fits.append(self._fit_phase(spectrum))
+                fit = self.fit_phase(spectrum)
+                self._fits.append(fit)
                 self.current_phase = Angle(0)
+                self._supervise(fit)
             else:
                 # Average current batch and decide whether to accept phase
                 new_config = FitParameter1.mean(self._fits)
+                self._adapt_window(self._fits)
                 self._fits.clear()
 
                 if new_config.residual < self._config.residuals_threshold:
@@ -63,6 +130,179 @@ class PhaseTracker:
                     self.current_phase = new_config.phase
                     self._config.phase = new_config.phase
                     self._config.residual = new_config.residual
+                    self._config.phase_stderr = new_config.phase_stderr
+                    self._last_good = new_config
+                    self.lock_state = LockState.LOCKED
+                    self._save_config(spectrum)
+
+    def flush(self) -> None:
+        """Write accepted parameters the store's rate limit held back (call on stop/reset)."""
+        if self._store is None or self._unsaved_axis is None or self.lock_state is not LockState.LOCKED:
+            return
+        self._write_store(self._unsaved_axis, force=True)
+
+    def lose_lock(self) -> None:
+        """Start re-acquisition (also called by trackers that detect the loss themselves)."""
+        log.warning("lock lost, re-acquiring")
+        self.lock_state = LockState.REACQUIRING
+        self._fits.clear()
+        self._bad_frames = 0
+        self._reacquire_attempts = 0
+        self.current_phase = Angle(0)  # no correction while re-acquiring
+
+    def _window_size(self) -> int:
+        cfg = self._config
+        if cfg.avg_spectra != self._avg_setting:
+            # edited while running: restart from the new value
+            self._avg_setting = cfg.avg_spectra
+            self.avg_window = max(1, int(cfg.avg_spectra))
+        if not cfg.adaptive_avg:
+            self.avg_window = max(1, int(cfg.avg_spectra))
+        return self.avg_window
+
+    def _adapt_window(self, batch: list[FitParameter1]) -> None:
+        """
+        Size the next window so that the scatter of single-frame phases
+        averages down to the target: N = var / target², smoothed over
+        batches and changed by at most MAX_WINDOW_STEP per batch.
+        """
+        cfg = self._config
+        if not cfg.adaptive_avg or len(batch) < 2:
+            return
+        phases = [float(p.phase) for p in batch]
+        resultant = math.hypot(sum(map(math.cos, phases)), sum(map(math.sin, phases))) / len(phases)
+        var = -2.0 * math.log(max(resultant, 1e-12))  # circular variance
+        self._scatter_var = var if self._scatter_var is None else self._scatter_var + SCATTER_EMA_ALPHA * (var - self._scatter_var)
+
+        target = cfg.phase_stderr_target if cfg.phase_stderr_target > 0 else DEFAULT_WINDOW_TARGET_RAD
+        wanted = math.ceil(self._scatter_var / target ** 2)
+        lo = max(1, int(cfg.avg_spectra_min))
+        hi = max(lo, int(cfg.avg_spectra_max))
+        step_lo = max(1, math.floor(self.avg_window / MAX_WINDOW_STEP))
+        step_hi = math.ceil(self.avg_window * MAX_WINDOW_STEP)
+        self.avg_window = min(hi, max(lo, min(step_hi, max(step_lo, wanted))))
+
+    def _precise_enough(self) -> bool:
+        """Early stop: the weighted mean of the fits so far already meets phase_stderr_target."""
+        target = self._config.phase_stderr_target
+        if target <= 0 or self.current_phase is None or len(self._fits) < MIN_ADAPTIVE_FITS:
+            return False
+        stderr = combined_stderr(phase_weights(self._fits))
+        return 0 < stderr <= target
+
+    # ------------------------------------------------------------------ #
+    # Internals: lock supervision
+    # ------------------------------------------------------------------ #
+
+    def _supervise(self, fit: FitParameter1) -> None:
+        if self.lock_state is not LockState.LOCKED or self._config.lock_loss_frames <= 0:
+            return
+        if fit.residual < self._config.residuals_threshold:
+            self._bad_frames = 0
+            return
+        self._bad_frames += 1
+        if self._bad_frames >= self._config.lock_loss_frames:
+            self.lose_lock()
+
+    def _reacquire(self, spectrum: Spectrum) -> None:
+        """One re-lock attempt from the last accepted parameters."""
+        if self._last_good is not None:
+            self._config.copy_from(self._last_good)
+        self._reacquire_attempts += 1
+
+        try:
+            fit = self._fit_subset(spectrum, ("phase", "tau_ps"), self._template_search(spectrum))
+        except Exception as e:
+            log.debug("re-acquisition fit failed: %s", e)
+            fit = None
+
+        if fit is not None and fit.residual < self._config.residuals_threshold:
+            log.info("re-locked after %d frames, residual: %g", self._reacquire_attempts, fit.residual)
+            self._config.copy_from(fit)
+            self._last_good = fit
+            self.current_phase = fit.phase
+            self.lock_state = LockState.LOCKED
+            return
+
+        if self._reacquire_attempts >= max(1, int(self._config.reacquire_frames)):
+            log.warning("re-acquisition failed, calibrating again")
+            self._fits.clear()
+            self.current_phase = None
+            self.lock_state = LockState.CALIBRATING
+
+    def _template_search(self, spectrum: Spectrum) -> dict[str, float]:
+        """
+        Best (phase, tau_ps) on a coarse grid around the current config; each
+        candidate is scored after solving baseline and scale exactly, so a
+        changed spectrum amplitude does not bias the choice.
+        """
+        x = np.asarray(spectrum.wavelengths_nm, dtype=float)
+        y = np.asarray(spectrum.intensity, dtype=float)
+        kwargs = self._config.to_fit_kwargs(cfg_projection_nu_equal_amplitudes_safe)
+        tau0 = float(kwargs["tau_ps"])
+        ones = np.ones_like(x)
+
+        best_ssr, best = math.inf, {"phase": float(kwargs["phase"]), "tau_ps": tau0}
+        for tau in tau0 * (1.0 + np.linspace(-REACQUIRE_TAU_SPAN, REACQUIRE_TAU_SPAN, REACQUIRE_TAU_STEPS)):
+            for phase in np.linspace(0.0, 2.0 * np.pi, REACQUIRE_PHASE_STEPS, endpoint=False):
+                kwargs.update(phase=phase, tau_ps=tau)
+                g = np.asarray(cfg_projection_nu_equal_amplitudes_safe(x, **kwargs), dtype=float)
+                _, ssr, *_ = np.linalg.lstsq(np.column_stack([ones, g]), y, rcond=None)
+                if ssr.size and float(ssr[0]) < best_ssr:
+                    best_ssr, best = float(ssr[0]), {"phase": float(phase), "tau_ps": float(tau)}
+        return best
+
+    # ------------------------------------------------------------------ #
+    # Internals: warm start
+    # ------------------------------------------------------------------ #
+
+    def _try_warm_start(self, spectrum: Spectrum) -> bool:
+        """
+        Load stored parameters for this wavelength axis and validate them
+        with a single phase-only fit. On success the gathering phase is
+        skipped; on failure the config is restored and gathering runs.
+        """
+        stored = self._store.load(wavelength_axis_hash(spectrum.wavelengths_nm))
+        if stored is None:
+            return False
+
+        backup = {f.name: getattr(self._config, f.name) for f in fields(FitParameter1)}
+        stored.apply_to(self._config)
+
+        try:
+            check = self.fit_phase(spectrum)
+        except Exception:
+            check = None
+
+        if check is None or check.residual >= self._config.residuals_threshold:
+            for name, value in backup.items():
+                setattr(self._config, name, value)
+            log.info("stored fit rejected, gathering configs")
+            return False
+
+        log.info("warm start from stored fit, residual: %g", check.residual)
+        self._config.phase = check.phase
+        self._config.residual = check.residual
+        self._fits.clear()
+        self._fits.append(check)
+        self.current_phase = Angle(0)
+        self._last_good = check
+        self.lock_state = LockState.LOCKED
+        return True
+
+    def _save_config(self, spectrum: Spectrum) -> None:
+        if self._store is None:
+            return
+        # hashed per save: range, uniform ν or ROI/binning may have changed the window
+        self._write_store(wavelength_axis_hash(spectrum.wavelengths_nm), force=False)
+
+    def _write_store(self, axis_hash: str, force: bool) -> None:
+        try:
+            written = self._store.save(self._config, axis_hash, force=force)
+        except OSError as e:
+            log.warning("could not store fit parameters: %s", e)
+            return
+        self._unsaved_axis = None if written else axis_hash
 
     # ------------------------------------------------------------------ #
     # Internals: fitting
@@ -71,12 +311,29 @@ class PhaseTracker:
     def _initialize_fit_parameters(self, spectrum: Spectrum) -> FitParameter1:
         """
         Fit parameters on the given spectrum to obtain good starting values,
-        but keep a_R fixed (not fitted).
+        but keep a_R fixed (not fitted). With fit_levels > 1 the fit runs
+        coarse-to-fine on a binned pyramid of the spectrum.
         """
+        x = np.asarray(spectrum.wavelengths_nm, dtype=float)
+        y = np.asarray(spectrum.intensity, dtype=float)
+        if self._config.fit_levels > 1:
+            params, self.last_fit_levels = fit_multires(x, y, self._config, self._fit_all)
+        else:
+            params, nfev = self._fit_all(x, y, self._config)
+            self.last_fit_levels = [LevelStats(1, int(x.size), nfev, float(params.residual))]
+        log.debug("initial fit: %s", " | ".join(map(str, self.last_fit_levels)))
+        return params
+
+    def _fit_all(self, x: np.ndarray, y: np.ndarray, config: AnalysisConfig) -> tuple[FitParameter1, int]:
+        """One full fit starting from 'config'; returns the parameters and the model evaluations."""
+        if config.solver is FitSolver.VARPRO:
+            result = fit_varpro(x, y, config)
+            return result.params, result.nfev
+
         first_arg_name = self._get_first_arg_name()
         model = lmfit.Model(cfg_projection_nu_equal_amplitudes_safe, independent_vars=[first_arg_name])
 
-        fit_kwargs: dict[str, Any] = self._config.to_fit_kwargs(cfg_projection_nu_equal_amplitudes_safe)
+        fit_kwargs: dict[str, Any] = config.to_fit_kwargs(cfg_projection_nu_equal_amplitudes_safe)
 
         # Build lmfit Parameters object so we can freeze a_R_THz_per_ps
         params = model.make_params(**fit_kwargs)
@@ -84,38 +341,52 @@ class PhaseTracker:
         # Freeze a_R_THz_per_ps
         params["a_R_THz_per_ps"].set(vary=False)
         
-        if not self._config.has_acceleration:
-            self._config.a_L_THz_per_ps = self._config.a_R_THz_per_ps
+        if not config.has_acceleration:
+            config.a_L_THz_per_ps = config.a_R_THz_per_ps
             params["a_L_THz_per_ps"].set(vary=False)
 
+        if config.fix_baseline:
+            params["baseline"].set(vary=False)
+
         # (optional) also freeze envelope params if you don't want to fit them:
         # params["carrier_wavelength"].set(vary=False)
         # params["bandwidth"].set(vary=False)
 
-        # Independent variable
-        fit_kwargs[first_arg_name] = spectrum.wavelengths_nm
-
         result = model.fit(
-            spectrum.intensity,
+            y,
             params=params,                 # <-- crucial
-            **{first_arg_name: spectrum.wavelengths_nm},
+            **{first_arg_name: x},
             max_nfev=int(1_000_000),
         )
-        return FitParameter1.from_fit_result(self._config, result)
+        return FitParameter1.from_fit_result(config, result), int(result.nfev)
 
-    def _fit_phase(self, spectrum: Spectrum) -> FitParameter1:
+    def fit_phase(self, spectrum: Spectrum) -> FitParameter1:
         """
         Fit only the phase parameter on the given spectrum.
         """
+        return self._fit_subset(spectrum, ("phase",))
+
+    def _fit_subset(
+        self,
+        spectrum: Spectrum,
+        vary: tuple[str, ...],
+        start: Optional[dict[str, float]] = None,
+    ) -> FitParameter1:
+        """
+        Fit only the parameters in 'vary', starting from the config
+        (overridden by 'start').
+        """
         first_arg_name = self._get_first_arg_name()
         model = lmfit.Model(cfg_projection_nu_equal_amplitudes_safe, independent_vars=[first_arg_name])
 
         floats = self._config.to_fit_kwargs(cfg_projection_nu_equal_amplitudes_safe)
         param_kwargs: dict[str, Any] = dict(floats)
+        if start:
+            param_kwargs.update(start)
 
         params = model.make_params(**param_kwargs)
         for name, par in params.items():
-            par.vary = (name == "phase")
+            par.vary = (name in vary)
 
         x_kwargs: dict[str, Any] = {first_arg_name: spectrum.wavelengths_nm}
 
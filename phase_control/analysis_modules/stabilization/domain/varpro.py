@@ -0,0 +1,115 @@
+# phase_control/modules/stabilization/varpro.py
+"""
+Variable-projection (VarPro) fit of cfg_projection_nu_equal_amplitudes_safe.
+
+The model is  y = baseline + g(ν; θ)  with the shape g (the model at
+baseline 0) depending nonlinearly on θ = (phase, tau_ps, a_L,
+central_wavelength, bandwidth). For every trial θ the baseline is solved
+exactly, so the nonlinear solver only searches θ (the phase stderr comes
+from the Jacobian of that projected residual):
+
+    r(θ) = y - g(θ) - c(θ),   c = mean(y - g(θ))
+
+The amplitude stays at the model's own scale, as in the lmfit path and the
+phase-only fits that continue from the result, so the returned parameters
+reproduce the reported residual. a_R is held fixed like in the lmfit path.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, Sequence
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from base_core.math.functions import cfg_projection_nu_equal_amplitudes_safe
+from phase_control.analysis_modules.stabilization.config import AnalysisConfig, FitParameter1
+
+DEFAULT_MAX_NFEV = 2_000
+
+
+@dataclass(frozen=True)
+class VarProResult:
+    params: FitParameter1
+    nfev: int              # model evaluations (one per residual call)
+    success: bool
+
+
+def nonlinear_names(config: AnalysisConfig) -> list[str]:
+    names = ["phase", "tau_ps", "central_wavelength", "bandwidth"]
+    if config.has_acceleration:
+        names.append("a_L_THz_per_ps")
+    return names
+
+
+def fit_varpro(
+    wavelengths_nm: Sequence[float] | np.ndarray,
+    intensity: Sequence[float] | np.ndarray,
+    config: AnalysisConfig,
+    max_nfev: int = DEFAULT_MAX_NFEV,
+) -> VarProResult:
+    """Fit starting from the values in 'config' (which is not modified)."""
+    x = np.asarray(wavelengths_nm, dtype=float)
+    y = np.asarray(intensity, dtype=float)
+
+    kwargs: dict[str, Any] = config.to_fit_kwargs(cfg_projection_nu_equal_amplitudes_safe)
+    if not config.has_acceleration:
+        kwargs["a_L_THz_per_ps"] = kwargs["a_R_THz_per_ps"]
+    names = nonlinear_names(config)
+    fixed_baseline = float(kwargs["baseline"]) if config.fix_baseline else None
+    kwargs["baseline"] = 0.0
+    nfev = 0
+
+    def shape(theta: np.ndarray) -> np.ndarray:
+        nonlocal nfev
+        nfev += 1
+        kw = dict(kwargs)
+        kw.update(zip(names, theta))
+        return np.asarray(cfg_projection_nu_equal_amplitudes_safe(x, **kw), dtype=float)
+
+    def solve_baseline(g: np.ndarray) -> float:
+        return fixed_baseline if fixed_baseline is not None else float(np.mean(y - g))
+
+    def residual(theta: np.ndarray) -> np.ndarray:
+        g = shape(theta)
+        return y - g - solve_baseline(g)
+
+    theta0 = np.array([float(kwargs[n]) for n in names])
+    result = least_squares(residual, theta0, method="trf", x_scale="jac", max_nfev=max_nfev)
+
+    g = shape(result.x)
+    c0 = solve_baseline(g)
+    r = y - g - c0
+
+    values = dict(zip(names, result.x))
+    values["baseline"] = c0
+    values["phase_stderr"] = _phase_stderr(result.jac, r, names.index("phase"))
+    if not config.has_acceleration:
+        values["a_L_THz_per_ps"] = kwargs["a_R_THz_per_ps"]
+    return VarProResult(
+        params=_with_values(config, values, float(np.sum(r ** 2))),
+        nfev=nfev,
+        success=bool(result.success),
+    )
+
+
+def _phase_stderr(jac: np.ndarray, r: np.ndarray, index: int) -> float:
+    """sqrt of the covariance diagonal, s² (JᵀJ)⁻¹ with s² = |r|² / (m - p)."""
+    m, p = jac.shape
+    if m <= p:
+        return 0.0
+    cov = np.linalg.pinv(jac.T @ jac) * (float(r @ r) / (m - p))
+    var = float(cov[index, index])
+    return float(np.sqrt(var)) if var > 0 and np.isfinite(var) else 0.0
+
+
+def _with_values(base: AnalysisConfig, values: dict[str, float], residual: float) -> FitParameter1:
+    kwargs: dict[str, Any] = {}
+    for f in fields(FitParameter1):
+        name = f.name
+        if name in values:
+            kwargs[name] = FitParameter1.field_from_float(name, values[name])
+        else:
+            kwargs[name] = getattr(base, name)
+    kwargs["residual"] = residual
+    return FitParameter1(**kwargs)
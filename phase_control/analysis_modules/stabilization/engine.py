@@ -4,7 +4,6 @@ from dataclasses import dataclass
 from typing import Callable, Optional, cast, Any
 
 import threading
-import time
 import numpy as np
 
 from base_core.framework.services.runnable_service_base import RunnableServiceBase
@@ -14,14 +13,27 @@ from base_core.framework.events.event_bus import EventBus
 from base_core.math.functions import usCFG_projection, cfg_projection_nu_equal_amplitudes_safe
 from base_core.math.models import Angle
 from base_core.quantities.models import Length
-from phase_control.analysis_modules.stabilization.config import AnalysisConfig
-from phase_control.analysis_modules.stabilization.domain.events import TOPIC_NEW_ANALYSIS_CONFIG
-from phase_control.analysis_modules.stabilization.domain.phase_corrector import PhaseCorrector
+from phase_control.analysis_modules.stabilization.config import AnalysisConfig, LockState, TrackerKind
+from phase_control.analysis_modules.stabilization.domain.events import (
+    TOPIC_LOCK_STATE,
+    TOPIC_NEW_ANALYSIS_CONFIG,
+    TOPIC_STABILIZATION_TELEMETRY,
+    LockStateChanged,
+    StabilizationTelemetry,
+)
+from phase_control.analysis_modules.stabilization.domain.fft_tracker import FftPhaseTracker
+from phase_control.analysis_modules.stabilization.domain.fit_store import FitParameterStore
+from phase_control.analysis_modules.stabilization.domain.phase_corrector import CorrectorConfig, CorrectorStats, PhaseCorrector
 from phase_control.analysis_modules.stabilization.domain.phase_tracker import PhaseTracker
+from phase_control.analysis_modules.stabilization.interfaces import IPhaseTracker
+from phase_control.core.backpressure import TOPIC_BACKPRESSURE, BackpressureConfig, FrameGate
+from phase_control.core.clock import SYSTEM_CLOCK, IClock, StreamHandOff
 from phase_control.core.models import Spectrum
+from phase_control.core.resampling import NuResamplerCache
 from phase_control.io.events import TOPIC_NEW_SPECTRUM
+from phase_control.io.readiness import ensure_ready
 from phase_control.io.rotator.interfaces import IRotatorController
-from phase_control.io.spectrometer.interfaces import IFrameBuffer
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
 
 class AnalysisEngine(RunnableServiceBase):
     def __init__(
@@ -32,17 +44,28 @@ class AnalysisEngine(RunnableServiceBase):
         rotator_worker: IRotatorController,
         bus: EventBus,
         cpu: ITaskRunner,
+        fit_store: Optional[FitParameterStore] = None,
+        clock: IClock = SYSTEM_CLOCK,
+        backpressure: Optional[BackpressureConfig] = None,
+        roi: Optional[IRoiRegistry] = None,
+        corrector: Optional[CorrectorConfig] = None,
     ) -> None:
         super().__init__()
         self.config = config
+        self._fit_store = fit_store
         self._buffer = buffer
         self._rotator = rotator_worker
         self._bus = bus
         self._cpu = cpu
+        self._clock = clock
+        self._handoff = StreamHandOff(clock)
+        self._gate = FrameGate("stabilization", backpressure, clock)
+        self._roi = roi
+        self._resamplers = NuResamplerCache()
         self._poll = 0.01
 
-        self._phase_tracker = PhaseTracker(cast(AnalysisConfig, self.config))
-        self._phase_corrector = PhaseCorrector()
+        self._phase_corrector = PhaseCorrector(corrector if corrector is not None else CorrectorConfig(), clock)
+        self._make_trackers()
 
         # result callback (VM sets/unsets in bind/unbind)
         self._on_result: Optional[Callable[[dict[str, Spectrum]], None]] = None
@@ -61,6 +84,20 @@ class AnalysisEngine(RunnableServiceBase):
     # -------------------------------------------------------------- #
     # public API
     # -------------------------------------------------------------- #
+    @property
+    def backpressure(self) -> BackpressureConfig:
+        """Load-shedding policy; fields may be changed while running."""
+        return self._gate.config
+
+    @property
+    def corrector(self) -> CorrectorConfig:
+        """Controller settings; fields may be changed while running."""
+        return self._phase_corrector.config
+
+    @property
+    def corrector_stats(self) -> CorrectorStats:
+        return self._phase_corrector.stats
+
     def set_on_result(self, cb: Optional[Callable[[dict[str, Spectrum]], None]]) -> None:
         with self._cb_lock:
             self._on_result = cb
@@ -76,12 +113,15 @@ class AnalysisEngine(RunnableServiceBase):
     # Lifecycle
     # -------------------------------------------------------------- #
     def start(self) -> None:
+        ensure_ready(spectrometer=self._buffer.ready, rotator=self._rotator.ready)
         super().start()
-        
+        self._gate.reset()
+        self._claim_roi()
+
         self._unsub = self._bus.subscribe(TOPIC_NEW_SPECTRUM, self._on_new_spectrum)
 
         self._handle = self._cpu.stream(
-            self._producer,
+            lambda stop: self._handoff.run(self._producer(stop)),
             on_item=self._on_spectrum,
             on_error=self._on_error,
             on_complete=self._on_complete,
@@ -92,36 +132,49 @@ class AnalysisEngine(RunnableServiceBase):
 
     def stop(self) -> None:
         super().stop()
+        self._fit_tracker.flush()
         
         if self._handle:
             self._handle.stop()
             self._handle = None
+        self._handoff.cancel()
         if self._unsub:
             self._unsub()
             self._unsub = None
         self._pending_event.clear()
+        if self._roi is not None:
+            self._roi.clear_roi("stabilization")
         
     def reset(self) -> None:
         # keep subscriptions/stream running (if you want), but reset analysis state
         super().reset()
-        self._phase_tracker = PhaseTracker(self.config)
+        self._fit_tracker.flush()
+        self._make_trackers()
 
     # -------------------------------------------------------------- #
     # Stream driver
     # -------------------------------------------------------------- #
     def _on_new_spectrum(self, _args) -> None:
         # Keep it short. We only latch latest spectrum.
-        spec = self._buffer.get_latest()
-        spec.normalize()
+        if not self._gate.offer():
+            return
+        spec, verdict = self._buffer.get_latest_checked()
         if spec is None:
             return
+        if verdict is not None and not verdict.ok:
+            # saturated / spiky frame: drop it before it costs a fit
+            self._gate.rejected(verdict.saturated, verdict.spikes)
+            return
+        spec.normalize()
         with self._pending_lock:
+            if self._latest is not None:
+                self._gate.coalesced()
             self._latest = spec
         self._pending_event.set()
 
     def _producer(self, stop: threading.Event):
         while not stop.is_set():
-            if not self._pending_event.wait(timeout=0.1):
+            if not self._clock.wait(self._pending_event, 0.1):
                 continue
 
             # take newest spectrum (coalesce)
@@ -137,10 +190,12 @@ class AnalysisEngine(RunnableServiceBase):
             while self._rotator.is_busy and not stop.is_set():
                 if self._pending_event.is_set():
                     with self._pending_lock:
-                        spec = self._latest or spec
+                        if self._latest is not None:
+                            spec = self._latest
+                            self._gate.coalesced()
                         self._latest = None
                         self._pending_event.clear()
-                time.sleep(0.01)
+                self._clock.sleep(0.01)
 
             if stop.is_set():
                 break
@@ -149,7 +204,13 @@ class AnalysisEngine(RunnableServiceBase):
             
     def _on_spectrum(self, spec: Spectrum) -> None:
         try:
-            res = self.step(spec)
+            self._claim_roi()  # follows wavelength_range edits while running
+            with self._handoff.consume(spec):
+                t0 = self._clock.now()
+                try:
+                    res = self.step(spec)
+                finally:
+                    self._record_step(self._clock.now() - t0)
             if res is None:
                 return
 
@@ -167,6 +228,60 @@ class AnalysisEngine(RunnableServiceBase):
             import traceback
             traceback.print_exc()
 
+    def _claim_roi(self) -> None:
+        if self._roi is not None:
+            self._roi.set_roi("stabilization", self.config.wavelength_range)
+
+    def _make_trackers(self) -> None:
+        # the FFT tracker calibrates with (and every fft_check_every frames
+        # cross-checks against) the fit tracker
+        self._fit_tracker = PhaseTracker(cast(AnalysisConfig, self.config), store=self._fit_store)
+        self._fft_tracker = FftPhaseTracker(self.config, calibration=self._fit_tracker)
+        self._lock_state = self._fit_tracker.lock_state
+        self._lock_since = self._clock.time()
+        self._phase_corrector.reset()
+
+    def _fft_check_rad(self, tracker: IPhaseTracker) -> float:
+        if tracker is not self._fft_tracker or self._fft_tracker.check_error_rad is None:
+            return 0.0
+        return float(self._fft_tracker.check_error_rad)
+
+    def _tracker(self) -> IPhaseTracker:
+        """Follows AnalysisConfig.tracker edits while running."""
+        if self.config.tracker is TrackerKind.FFT:
+            return self._fft_tracker
+        return self._fit_tracker
+
+    def _window(self, spectrum: Spectrum) -> Spectrum:
+        """Fit window: resampled to uniform ν (cached operator) or the plain λ cut."""
+        if self.config.uniform_nu or self.config.tracker is TrackerKind.FFT:
+            op = self._resamplers.get(self._buffer.meta, self.config.wavelength_range)
+            resampled = op.resample(spectrum) if op is not None else None
+            if resampled is not None:
+                return resampled
+        return spectrum.cut(self.config.wavelength_range)
+
+    def _publish_lock_state(self, tracker: IPhaseTracker) -> None:
+        state = tracker.lock_state
+        if state is self._lock_state:
+            return
+        now = self._clock.time()
+        self._bus.publish(TOPIC_LOCK_STATE, LockStateChanged(
+            timestamp=now,
+            state=state.value,
+            previous=self._lock_state.value,
+            duration_s=now - self._lock_since,
+        ))
+        self._lock_state, self._lock_since = state, now
+        if state is not LockState.LOCKED:
+            self._phase_corrector.reset()  # the integral belongs to the lost lock
+
+    def _record_step(self, duration_s: float) -> None:
+        self._gate.record_step(duration_s)
+        stats = self._gate.poll_stats()
+        if stats is not None:
+            self._bus.publish(TOPIC_BACKPRESSURE, stats)
+
     def _on_error(self, e: BaseException) -> None:
         # optional: publish/log error
         with self._lock:
@@ -191,10 +306,12 @@ class AnalysisEngine(RunnableServiceBase):
         if spectrum is None:
             return None
 
-        spectrum = spectrum.cut(self.config.wavelength_range)
+        spectrum = self._window(spectrum)
 
-        self._phase_tracker.update(spectrum)
-        current_phase: Optional[Angle] = self._phase_tracker.current_phase
+        tracker = self._tracker()
+        tracker.update(spectrum)
+        self._publish_lock_state(tracker)
+        current_phase: Optional[Angle] = tracker.current_phase
 
         y_fit_arr: Optional[np.ndarray] = None
         y_zero_arr: Optional[np.ndarray] = None
@@ -220,6 +337,21 @@ class AnalysisEngine(RunnableServiceBase):
         
         correction_angle = self._phase_corrector.update(current_phase)
         self._rotator.request_rotation(correction_angle)
+        if correction_angle is not None:
+            stats = self._phase_corrector.stats
+            self._bus.publish(TOPIC_STABILIZATION_TELEMETRY, StabilizationTelemetry(
+                timestamp=self._clock.time(),
+                phase_rad=float(current_phase),
+                residual=float(self.config.residual),
+                correction_deg=float(correction_angle.Deg),
+                rotator_busy=self._rotator.is_busy,
+                phase_stderr_rad=float(self.config.phase_stderr),
+                avg_window=int(tracker.avg_window),
+                settled=stats.settled,
+                moves_to_lock=stats.moves_to_lock,
+                settle_time_s=stats.settle_time_s,
+                fft_check_rad=self._fft_check_rad(tracker),
+            ))
         
         out: dict[str, Spectrum] = {}
         if y_zero_arr is not None:
@@ -0,0 +1,24 @@
+# phase_control/analysis_modules/stabilization/interfaces.py
+from __future__ import annotations
+
+from typing import Optional, Protocol
+
+from base_core.math.models import Angle
+from phase_control.analysis_modules.stabilization.config import LockState
+from phase_control.core.models import Spectrum
+
+
+class IPhaseTracker(Protocol):
+    """
+    Turns windowed spectra into a phase estimate for AnalysisEngine.
+
+    current_phase stays None until the tracker has a usable model; after
+    that it holds the last accepted phase (same scale as the model's
+    'phase' parameter).
+    """
+
+    current_phase: Optional[Angle]
+    avg_window: int     # frames combined per accepted phase
+    lock_state: LockState
+
+    def update(self, spectrum: Spectrum) -> None: ...
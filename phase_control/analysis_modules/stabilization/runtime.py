@@ -0,0 +1,29 @@
+# phase_control/analysis_modules/stabilization/runtime.py
+"""
+Qt-free part of the stabilization feature: config + AnalysisEngine.
+Used by services.py (GUI) and by the headless runner.
+"""
+from __future__ import annotations
+
+from phase_control.analysis_modules.stabilization.config import AnalysisConfig
+from phase_control.analysis_modules.stabilization.domain.fit_store import FitParameterStore
+from phase_control.analysis_modules.stabilization.engine import AnalysisEngine
+from phase_control.core.clock import IClock
+from phase_control.core.concurrency.runners import ICpuTaskRunner
+from phase_control.io.rotator.interfaces import IRotatorController
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
+
+
+def register(c, ctx) -> None:
+    c.register_singleton(AnalysisConfig, lambda c: AnalysisConfig())
+    c.register_singleton(FitParameterStore, lambda c: FitParameterStore())
+    c.register_singleton(AnalysisEngine, lambda c: AnalysisEngine(
+        config=c.get(AnalysisConfig),
+        buffer=c.get(IFrameBuffer),
+        rotator_worker=c.get(IRotatorController),
+        bus=ctx.event_bus,
+        cpu=c.get(ICpuTaskRunner),
+        clock=c.get(IClock),
+        roi=c.get(IRoiRegistry),
+        fit_store=c.get(FitParameterStore),
+        ))
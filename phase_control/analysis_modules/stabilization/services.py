@@ -0,0 +1,29 @@
+# phase_control/analysis_modules/stabilization/services.py
+"""
+GUI part of the stabilization feature (engine via .runtime, VMs, views).
+Pulls in lmfit, scipy and pyqtgraph.
+
+Imported lazily by StabilizationModule the first time one of its views
+is requested; see phase_control.core.lazy_loader.
+"""
+from __future__ import annotations
+
+from base_qt.views.registry.interfaces import IViewRegistry
+from phase_control.analysis_modules.stabilization import runtime
+from phase_control.analysis_modules.stabilization.config import AnalysisConfig
+from phase_control.analysis_modules.stabilization.engine import AnalysisEngine
+from phase_control.analysis_modules.stabilization.ui.analysis_config_view import AnalysisConfigView
+from phase_control.analysis_modules.stabilization.ui.analysis_config_vm import AnalysisConfigVM
+from phase_control.analysis_modules.stabilization.ui.stabiliation_page_VM import StabilizationPageVM
+from phase_control.analysis_modules.stabilization.ui.stabilization_page_view import StabilizationPageView
+from phase_control.core.plotting.spectrum_plot_VM import SpectrumPlotVM
+from base_qt.app.interfaces import IUiDispatcher
+
+
+def register(c, ctx) -> None:
+    runtime.register(c, ctx)
+
+    c.register_factory(StabilizationPageVM, lambda c: StabilizationPageVM(c.get(AnalysisEngine), c.get(IUiDispatcher), ctx.event_bus, c.get(SpectrumPlotVM)))
+    c.register_factory(AnalysisConfigVM, lambda c: AnalysisConfigVM(ui=c.get(IUiDispatcher), bus=ctx.event_bus, config=c.get(AnalysisConfig)))
+    c.register_factory(StabilizationPageView, lambda c: StabilizationPageView(c.get(StabilizationPageVM), c.get(IViewRegistry)))
+    c.register_factory(AnalysisConfigView, lambda c: AnalysisConfigView(c.get(AnalysisConfigVM)))
@@ -19,6 +19,7 @@ from base_qt.views.bases.view_base import ViewBase
 from base_core.quantities.enums import Prefix
 from base_core.quantities.models import Length
 from base_core.math.models import Angle, Range
+from phase_control.analysis_modules.stabilization.config import FitSolver, TrackerKind
 from phase_control.analysis_modules.stabilization.ui.analysis_config_vm import AnalysisConfigVM
 from base_qt.ui.toggle_switch import ToggleSwitch
 
@@ -39,18 +40,46 @@ class AnalysisConfigView(ViewBase[AnalysisConfigVM]):
         self._wl_max = QDoubleSpinBox(); self._wl_max.setButtonSymbols(QAbstractSpinBox.NoButtons)
         self._res_thresh = QDoubleSpinBox(); self._res_thresh.setButtonSymbols(QAbstractSpinBox.NoButtons)
         self._avg = QSpinBox(); self._avg.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self._fit_levels = QSpinBox(); self._fit_levels.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self._stderr_target = QDoubleSpinBox(); self._stderr_target.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self._adaptive_avg = ToggleSwitch(text_on="ON", text_off="OFF")
+        self._avg_min = QSpinBox(); self._avg_min.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self._avg_max = QSpinBox(); self._avg_max.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self._lock_loss = QSpinBox(); self._lock_loss.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self._reacquire = QSpinBox(); self._reacquire.setButtonSymbols(QAbstractSpinBox.NoButtons)
         self._has_accel = ToggleSwitch(text_on="ON", text_off="OFF")
+        self._fix_baseline = ToggleSwitch(text_on="ON", text_off="OFF")
+        self._uniform_nu = ToggleSwitch(text_on="ON", text_off="OFF")
+        self._fft_tracker = ToggleSwitch(text_on="FFT", text_off="FIT")
+        self._varpro = ToggleSwitch(text_on="VarPro", text_off="lmfit")
 
         for sb in (self._wl_min, self._wl_max):
             sb.setDecimals(3); sb.setRange(-1e6, 1e6); sb.setSingleStep(0.1)
         self._res_thresh.setDecimals(3); self._res_thresh.setRange(0, 1e9); self._res_thresh.setSingleStep(0.5)
         self._avg.setRange(1, 10000)
+        self._fit_levels.setRange(1, 5)
+        self._avg_min.setRange(1, 10000)
+        self._avg_max.setRange(1, 10000)
+        self._lock_loss.setRange(0, 10000)
+        self._reacquire.setRange(1, 10000)
+        self._stderr_target.setDecimals(4); self._stderr_target.setRange(0, 10); self._stderr_target.setSingleStep(0.001)
 
         f1.addRow("Wavelength min [nm]", self._wl_min)
         f1.addRow("Wavelength max [nm]", self._wl_max)
         f1.addRow("Residual threshold", self._res_thresh)
         f1.addRow("Avg spectra", self._avg)
+        f1.addRow("Adaptive averaging", self._adaptive_avg)
+        f1.addRow("Avg spectra min", self._avg_min)
+        f1.addRow("Avg spectra max", self._avg_max)
+        f1.addRow("Phase stderr target [rad]", self._stderr_target)
+        f1.addRow("Lock loss frames", self._lock_loss)
+        f1.addRow("Re-acquire frames", self._reacquire)
         f1.addRow("Has Acceleration", self._has_accel)
+        f1.addRow("Fix baseline", self._fix_baseline)
+        f1.addRow("Uniform ν grid", self._uniform_nu)
+        f1.addRow("Phase tracker", self._fft_tracker)
+        f1.addRow("Initial fit solver", self._varpro)
+        f1.addRow("Fit levels", self._fit_levels)
         root.addWidget(g1)
 
         # --- FitParameter ---
@@ -119,7 +148,18 @@ class AnalysisConfigView(ViewBase[AnalysisConfigVM]):
         cfg.wavelength_range = Range(Length(self._wl_min.value(), Prefix.NANO), Length(self._wl_max.value(), Prefix.NANO))
         cfg.residuals_threshold = float(self._res_thresh.value())
         cfg.avg_spectra = int(self._avg.value())
+        cfg.phase_stderr_target = float(self._stderr_target.value())
+        cfg.adaptive_avg = bool(self._adaptive_avg.isChecked())
+        cfg.avg_spectra_min = int(self._avg_min.value())
+        cfg.avg_spectra_max = int(self._avg_max.value())
+        cfg.lock_loss_frames = int(self._lock_loss.value())
+        cfg.reacquire_frames = int(self._reacquire.value())
         cfg.has_acceleration = bool(self._has_accel.isChecked())
+        cfg.fix_baseline = bool(self._fix_baseline.isChecked())
+        cfg.uniform_nu = bool(self._uniform_nu.isChecked())
+        cfg.tracker = TrackerKind.FFT if self._fft_tracker.isChecked() else TrackerKind.FIT
+        cfg.solver = FitSolver.VARPRO if self._varpro.isChecked() else FitSolver.LMFIT
+        cfg.fit_levels = int(self._fit_levels.value())
 
         # ---- fit params only if not running ----
         if not self.vm.is_running():
@@ -151,7 +191,18 @@ class AnalysisConfigView(ViewBase[AnalysisConfigVM]):
         setv(self._wl_max, cfg.wavelength_range.max.value(Prefix.NANO))
         setv(self._res_thresh, float(cfg.residuals_threshold))
         setv(self._avg, int(cfg.avg_spectra))
+        setv(self._stderr_target, float(cfg.phase_stderr_target))
+        setv(self._adaptive_avg, bool(cfg.adaptive_avg))
+        setv(self._avg_min, int(cfg.avg_spectra_min))
+        setv(self._avg_max, int(cfg.avg_spectra_max))
+        setv(self._lock_loss, int(cfg.lock_loss_frames))
+        setv(self._reacquire, int(cfg.reacquire_frames))
         setv(self._has_accel, bool(cfg.has_acceleration))
+        setv(self._fix_baseline, bool(cfg.fix_baseline))
+        setv(self._uniform_nu, bool(cfg.uniform_nu))
+        setv(self._fft_tracker, cfg.tracker is TrackerKind.FFT)
+        setv(self._varpro, cfg.solver is FitSolver.VARPRO)
+        setv(self._fit_levels, int(cfg.fit_levels))
 
         setv(self._carrier, cfg.central_wavelength.value(Prefix.NANO))
         setv(self._bw, cfg.bandwidth.value(Prefix.NANO))
@@ -10,11 +10,11 @@ from base_qt.view_models.runnable_vm import RunnableVMBase
 from phase_control.analysis_modules.stabilization.config import AnalysisConfig
 from phase_control.analysis_modules.stabilization.engine import AnalysisEngine
 from phase_control.core.models import Spectrum
-from phase_control.core.plotting.spectrum_plot_VM import SpectrumPlotVM
+from phase_control.core.plotting.spectrum_plot_VM import PlotPageSuspendMixin, SpectrumPlotVM
 from base_qt.app.interfaces import IUiDispatcher
 
 
-class StabilizationPageVM(RunnableVMBase):
+class StabilizationPageVM(PlotPageSuspendMixin, RunnableVMBase):
     
     def __init__(self, engine_service: AnalysisEngine, ui: IUiDispatcher, bus: EventBus, plot: SpectrumPlotVM) -> None:
         super().__init__(engine_service, ui, bus)
@@ -25,7 +25,7 @@ class StabilizationPageVM(RunnableVMBase):
 
     def set_phase_pi(self, value: float) -> None:
         self._engine.target_phase = Angle(float(value) * np.pi)
-        
+
     def start(self):
         self._engine.set_on_result(self._on_new_result)
         super().start()
@@ -35,6 +35,8 @@ class StabilizationPageVM(RunnableVMBase):
         self._engine.set_on_result(None)
     
     def _on_new_result(self, spectra: dict[str, Spectrum]) -> None:
+        if self.is_suspended:
+            return
         for key, spec in spectra.items():
 
             x = spec.wavelengths_nm.copy()
@@ -12,6 +12,7 @@ from phase_control.app.ui.main_window_view import MainWindowView
 from phase_control.app.ui.main_window_vm import MainWindowViewModel
 from phase_control.app.ui.menu_bar_VM import MenuBarViewModel
 from phase_control.app.ui.menu_bar_view import MenuBarView
+from phase_control.io.device_status import DeviceStatusBoard
 
 
 class AppModule(BaseModule):
@@ -30,7 +31,11 @@ class AppModule(BaseModule):
         c.register_singleton(IViewRegistry, lambda c: ViewRegistry())
 
         # --- Shell VM + MenuBar -------------------------------------------
-        c.register_factory(MainWindowViewModel, lambda c: MainWindowViewModel(c.get(IViewRegistry), ctx.event_bus))
+        c.register_factory(MainWindowViewModel, lambda c: MainWindowViewModel(
+            c.get(IViewRegistry),
+            ctx.event_bus,
+            device_status=c.get(DeviceStatusBoard),
+        ))
         c.register_factory(MenuBarViewModel, lambda c: MenuBarViewModel())
         
         # If you want exactly one menubar instance, you can register it as singleton.
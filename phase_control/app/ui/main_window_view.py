@@ -27,6 +27,7 @@ class MainWindowView(MainWindowViewBase[MainWindowViewModel]):
     
     def __init__(self, vm: MainWindowViewModel, registry: IViewRegistry):
         self._shown_page: Optional[ViewBase] = None
+        self._device_states: Dict[str, str] = {}
         super().__init__(vm, registry, title="Phase Control")
 
     def build_ui(self) -> None:
@@ -67,6 +68,17 @@ class MainWindowView(MainWindowViewBase[MainWindowViewModel]):
         grid.addWidget(left, 0, 0)
         grid.addWidget(right, 0, 1)
         root.addLayout(grid)
+
+        # --- Device / status row ----------------------------------------
+        status_row = QHBoxLayout()
+        status_row.setContentsMargins(0, 0, 0, 0)
+        status_row.setSpacing(8)
+        self._devices_label = QLabel("", self.central)
+        self._status_label = QLabel("", self.central)
+        status_row.addWidget(self._devices_label)
+        status_row.addStretch(1)
+        status_row.addWidget(self._status_label)
+        root.addLayout(status_row)
         
         # --- Single-page host -------------------------------------------
         self._page_host = QWidget(self.central)
@@ -82,6 +94,11 @@ class MainWindowView(MainWindowViewBase[MainWindowViewModel]):
         self._fill_combo_box()
 
         self.connect_binding(self.vm.selected_page_changed, self._show_page)
+        self.connect_binding(self.vm.device_state_changed, self._on_device_state_changed)
+        self.connect_binding(self.vm.status_changed, self._status_label.setText)
+
+        self._device_states.update(self.vm.device_states())
+        self._render_device_states()
 
         self.connect_binding(self._module_box.currentIndexChanged, self._on_combo_changed)
         self.connect_binding(self._btn_run.clicked, self.vm.run_selected_module)
@@ -96,16 +113,32 @@ class MainWindowView(MainWindowViewBase[MainWindowViewModel]):
         if page_id is not None:
             self.vm.select_page(str(page_id))
 
+    @Slot(str, str)
+    def _on_device_state_changed(self, device: str, state: str) -> None:
+        self._device_states[device] = state
+        self._render_device_states()
+
+    def _render_device_states(self) -> None:
+        self._devices_label.setText(
+            "   ".join(f"{name}: {state}" for name, state in sorted(self._device_states.items()))
+        )
+
     @Slot()
     def _show_page(self) -> None:
+        # pages are owned (and closed on eviction) by the VM's page cache,
+        # so the previous page is only detached and hidden here
         old = self._shown_page
         if old is not None:
             self._page_host_layout.removeWidget(old)
-            old.close()
+            old.hide()
             self._shown_page = None
 
-        self._page_host_layout.addWidget(self.vm.current_page)
-        self._shown_page = self.vm.current_page
+        page = self.vm.current_page
+        if page is None:
+            return
+        self._page_host_layout.addWidget(page)
+        page.show()
+        self._shown_page = page
 
     def _fill_combo_box(self):
         self._module_box.blockSignals(True)
@@ -119,6 +152,6 @@ class MainWindowView(MainWindowViewBase[MainWindowViewModel]):
             self._module_box.blockSignals(False)
             
     def closeEvent(self, event):
-        if self._shown_page is not None:
-            self._shown_page.close()
-        return super().closeEvent(event)
\ No newline at end of file
+        self._shown_page = None
+        self.vm.release_pages()
+        return super().closeEvent(event)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from argparse import OPTIONAL
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from PySide6.QtCore import QObject, Signal
 
@@ -12,21 +13,43 @@ from base_qt.views.bases.view_base import ViewBase
 from base_qt.views.registry.enums import ViewKind
 from base_qt.views.registry.interfaces import IViewRegistry
 from base_qt.views.registry.models import ViewSpec
+from phase_control.core.interfaces import ISuspendable
+from phase_control.io.device_status import DeviceStatusBoard
+from phase_control.io.events import TOPIC_DEVICE_STATE, DeviceStateEventArgs
+from phase_control.io.readiness import DeviceNotReadyError
 
+# Max number of page instances kept alive (shown page included)
+MAX_CACHED_PAGES = 2
 
 
 class MainWindowViewModel(QObject):
     selected_page_changed = Signal()
+    device_state_changed = Signal(str, str)  # device, state text
+    status_changed = Signal(str)
 
-    def __init__(self, registry: IViewRegistry, event_bus: EventBus) -> None:
+    def __init__(
+        self,
+        registry: IViewRegistry,
+        event_bus: EventBus,
+        max_cached_pages: int = MAX_CACHED_PAGES,
+        device_status: Optional[DeviceStatusBoard] = None,
+    ) -> None:
         super().__init__()
         self._bus = event_bus
+        self._device_status = device_status
 
         self._page_specs: List[ViewSpec] = []
         self._selected_id: Optional[str] = None
         self._current_page: Optional[ViewBase] = None
 
+        # LRU page cache: least recently shown first
+        self._pages: OrderedDict[str, ViewBase] = OrderedDict()
+        self._max_cached_pages = max(1, int(max_cached_pages))
+
         self._load_pages(registry)
+
+        # bus callbacks arrive on IO threads; the Qt signal is queued to the UI thread
+        self._unsub_device_state = self._bus.subscribe(TOPIC_DEVICE_STATE, self._on_device_state)
         
     @property
     def current_page(self) -> Optional[ViewBase]:
@@ -35,14 +58,52 @@ class MainWindowViewModel(QObject):
     def select_page(self, page_id: str) -> None:
         if self._selected_id == page_id:
             return
+        spec = next((s for s in self._page_specs if s.id == page_id), None)
+        if spec is None:
+            return
+
+        if self._current_page is not None:
+            self._suspend(self._current_page)
+
+        page = self._pages.pop(page_id, None)
+        if page is None:
+            page = spec.factory()
+        self._pages[page_id] = page
+        self._resume(page)
+
         self._selected_id = page_id
-        self._current_page = next(s for s in self._page_specs if s.id == page_id).factory()
+        self._current_page = page
+        self._evict_pages()
         self.selected_page_changed.emit()
 
+    def device_states(self) -> Dict[str, str]:
+        if self._device_status is None:
+            return {}
+        return {name: self._format_state(args) for name, args in self._device_status.snapshot().items()}
+
+    def release_pages(self) -> None:
+        """
+        Suspend and close every cached page (used on window close).
+        """
+        for page in self._pages.values():
+            self._suspend(page)
+            page.close()
+        self._pages.clear()
+        self._current_page = None
+        self._selected_id = None
+        if self._unsub_device_state is not None:
+            self._unsub_device_state()
+            self._unsub_device_state = None
+
     def run_selected_module(self) -> None:
         if self._selected_id is None:
             return
-        self._get_vm().start()
+        try:
+            self._get_vm().start()
+        except DeviceNotReadyError as e:
+            self.status_changed.emit(str(e))
+            return
+        self.status_changed.emit("")
         
     def stop_selected_module(self) -> None:
         if self._selected_id is None:
@@ -62,6 +123,33 @@ class MainWindowViewModel(QObject):
 
         self._page_specs = pages
 
+    def _on_device_state(self, args: DeviceStateEventArgs) -> None:
+        self.device_state_changed.emit(args.device, self._format_state(args))
+
+    @staticmethod
+    def _format_state(args: DeviceStateEventArgs) -> str:
+        if args.error:
+            return f"{args.state.value} ({args.error})"
+        return args.state.value
+
+    def _evict_pages(self) -> None:
+        while len(self._pages) > self._max_cached_pages:
+            _, page = self._pages.popitem(last=False)
+            self._suspend(page)  # drops its bus handlers, so the page can be freed
+            page.close()
+
+    @staticmethod
+    def _suspend(page: ViewBase) -> None:
+        vm = getattr(page, "vm", None)
+        if isinstance(vm, ISuspendable):
+            vm.suspend()
+
+    @staticmethod
+    def _resume(page: ViewBase) -> None:
+        vm = getattr(page, "vm", None)
+        if isinstance(vm, ISuspendable):
+            vm.resume()
+
     def _get_vm(self) -> IRunnable:
         vm = self._current_page.vm
         if (vm is not None and isinstance(vm, IRunnable)):
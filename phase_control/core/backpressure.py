@@ -0,0 +1,165 @@
+# phase_control/core/backpressure.py
+"""
+Load shedding for the spectrum-driven engines.
+
+Every TOPIC_NEW_SPECTRUM is offered to a FrameGate before the engine converts
+it. The policy decides which frames are even considered; frames that are
+accepted but overwritten before the analysis thread picks them up count as
+coalesced; frames that fail the quality check (io/spectrometer/quality.py)
+count as rejected. Counters are published as BackpressureStats on
+TOPIC_BACKPRESSURE.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from phase_control.core.clock import SYSTEM_CLOCK, IClock
+
+TOPIC_BACKPRESSURE = "engine.backpressure"
+
+# smoothing of the frame interval / step duration estimates
+EMA_ALPHA = 0.1
+MAX_DECIMATION = 100
+
+
+class BackpressureMode(str, Enum):
+    LATEST_WINS = "latest_wins"    # analyse the newest frame whenever idle
+    EVERY_NTH = "every_nth"        # only consider every N-th frame
+    ADAPTIVE = "adaptive"          # pick N so that analysis uses ~cpu_budget of the frame time
+
+
+@dataclass
+class BackpressureConfig:
+    mode: BackpressureMode = BackpressureMode.LATEST_WINS
+    every_n: int = 2
+    cpu_budget: float = 0.8        # share of the frame interval analysis may use (ADAPTIVE)
+    stats_interval_s: float = 1.0
+
+
+@dataclass(frozen=True)
+class BackpressureStats:
+    engine: str
+    mode: str
+    received: int
+    processed: int
+    dropped_policy: int            # skipped by decimation
+    dropped_coalesced: int         # overwritten by a newer frame before analysis
+    rejected_saturated: int        # failed the quality check: saturation
+    rejected_spikes: int           # failed the quality check: spikes (cosmic rays)
+    processing_rate_hz: float      # since the previous stats event
+    decimation: int                # current N (1 = every frame considered)
+    step_ms: float                 # smoothed analysis step duration
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_policy + self.dropped_coalesced
+
+    @property
+    def rejected(self) -> int:
+        return self.rejected_saturated + self.rejected_spikes
+
+
+class FrameGate:
+    """
+    Thread-safe counters + decimation decision. offer() runs on the
+    publisher's thread, everything else on the engine's analysis thread.
+    """
+
+    def __init__(self, engine: str, config: Optional[BackpressureConfig] = None, clock: IClock = SYSTEM_CLOCK) -> None:
+        self._engine = engine
+        self.config = config if config is not None else BackpressureConfig()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._received = 0
+            self._processed = 0
+            self._dropped_policy = 0
+            self._dropped_coalesced = 0
+            self._rejected_saturated = 0
+            self._rejected_spikes = 0
+            self._phase = 0
+            self._last_arrival: Optional[float] = None
+            self._interval_s: Optional[float] = None
+            self._step_s: Optional[float] = None
+            self._stats_t = self._clock.now()
+            self._stats_processed = 0
+
+    @property
+    def decimation(self) -> int:
+        cfg = self.config
+        if cfg.mode is BackpressureMode.EVERY_NTH:
+            return max(1, int(cfg.every_n))
+        if cfg.mode is BackpressureMode.ADAPTIVE:
+            if not self._interval_s or not self._step_s:
+                return 1
+            budget = max(1e-3, cfg.cpu_budget) * self._interval_s
+            return min(MAX_DECIMATION, max(1, math.ceil(self._step_s / budget)))
+        return 1
+
+    def offer(self) -> bool:
+        """Called for every new frame; False = drop it (policy)."""
+        now = self._clock.now()
+        with self._lock:
+            self._received += 1
+            if self._last_arrival is not None:
+                self._interval_s = _ema(self._interval_s, now - self._last_arrival)
+            self._last_arrival = now
+
+            n = self.decimation
+            self._phase = (self._phase + 1) % n if n > 1 else 0
+            if self._phase != 0:
+                self._dropped_policy += 1
+                return False
+            return True
+
+    def coalesced(self, count: int = 1) -> None:
+        with self._lock:
+            self._dropped_coalesced += count
+
+    def rejected(self, saturated: int, spikes: int) -> None:
+        """A frame failed the quality check (counted once, saturation first)."""
+        with self._lock:
+            if saturated:
+                self._rejected_saturated += 1
+            elif spikes:
+                self._rejected_spikes += 1
+
+    def record_step(self, duration_s: float) -> None:
+        with self._lock:
+            self._processed += 1
+            self._step_s = _ema(self._step_s, duration_s)
+
+    def poll_stats(self) -> Optional[BackpressureStats]:
+        """Stats once per stats_interval_s, else None."""
+        now = self._clock.now()
+        with self._lock:
+            elapsed = now - self._stats_t
+            if elapsed < self.config.stats_interval_s:
+                return None
+            rate = (self._processed - self._stats_processed) / elapsed if elapsed > 0 else 0.0
+            self._stats_t = now
+            self._stats_processed = self._processed
+            return BackpressureStats(
+                engine=self._engine,
+                mode=self.config.mode.value,
+                received=self._received,
+                processed=self._processed,
+                dropped_policy=self._dropped_policy,
+                dropped_coalesced=self._dropped_coalesced,
+                rejected_saturated=self._rejected_saturated,
+                rejected_spikes=self._rejected_spikes,
+                processing_rate_hz=rate,
+                decimation=self.decimation,
+                step_ms=(self._step_s or 0.0) * 1e3,
+            )
+
+
+def _ema(prev: Optional[float], value: float) -> float:
+    return value if prev is None else prev + EMA_ALPHA * (value - prev)
@@ -0,0 +1,32 @@
+# phase_control/core/bootstrap.py
+"""
+Container wiring shared by the Qt app (app.py) and the headless runner.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from base_core.framework.app import AppContext
+from base_core.framework.concurrency.task_runner import TaskRunner
+from base_core.framework.di import Container
+from phase_control.core.clock import SYSTEM_CLOCK, IClock
+from phase_control.core.concurrency.runners import ICpuTaskRunner, IRotatorTaskRunner, ISpectrometerTaskRunner
+
+
+def register_clock(c: Container, clock: IClock = SYSTEM_CLOCK) -> None:
+    """Engines and devices take their time from IClock (VirtualClock in simulations)."""
+    c.register_instance(IClock, clock)
+
+
+def register_task_runners(c: Container, ctx: AppContext) -> None:
+    io_spectrometer_exec = ThreadPoolExecutor(max_workers=2, thread_name_prefix="io.spectrometer")
+    io_rotator_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io.rotator")
+    cpu_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpu") 
+
+    c.register_singleton(ISpectrometerTaskRunner, lambda c: TaskRunner(io_spectrometer_exec))
+    c.register_singleton(IRotatorTaskRunner, lambda c: TaskRunner(io_rotator_exec))
+    c.register_singleton(ICpuTaskRunner, lambda c: TaskRunner(cpu_exec))
+
+    ctx.lifecycle.add(lambda: io_spectrometer_exec.shutdown(wait=False))
+    ctx.lifecycle.add(lambda: io_rotator_exec.shutdown(wait=False))
+    ctx.lifecycle.add(lambda: cpu_exec.shutdown(wait=False))
@@ -0,0 +1,344 @@
+# phase_control/core/clock.py
+"""
+Injectable time source for engines, rotator and simulators.
+
+SystemClock is the real thing. VirtualClock lets simulations run hours of
+operation in seconds: time only moves when no work is pending - nobody
+holds or pins the clock and no waiter is runnable - and then jumps straight
+to the earliest pending deadline. Components must therefore block through
+the clock instead of time.sleep/Event.wait, wrap work that must appear
+instantaneous (one analysis step, one simulated frame) in clock.hold(), and
+cover hand-offs to another thread (a yielded item, a queued move) with a
+clock.pin() that the receiving side releases once it holds the clock.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterable, Iterator, Optional, Protocol, TypeVar, runtime_checkable
+
+T = TypeVar("T")
+
+
+@runtime_checkable
+class IClock(Protocol):
+    def now(self) -> float:
+        """Monotonic seconds (intervals, deadlines)."""
+        ...
+
+    def time(self) -> float:
+        """Epoch seconds (timestamps in telemetry)."""
+        ...
+
+    def sleep(self, seconds: float) -> None: ...
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        """Event.wait() measured on this clock. Returns event.is_set()."""
+        ...
+
+    def hold(self) -> ContextManager[None]:
+        """Keep virtual time from advancing while the block runs."""
+        ...
+
+    def pin(self) -> "ClockPin":
+        """Keep virtual time from advancing until the pin is released (any thread)."""
+        ...
+
+
+class ClockPin:
+    """Pending hand-off; release() is idempotent and thread-agnostic."""
+
+    def __init__(self, clock: Optional["VirtualClock"] = None) -> None:
+        self._clock = clock
+        self._released = clock is None
+
+    def release(self) -> None:
+        if self._clock is not None:
+            self._clock._release(self)
+
+
+_NO_PIN = ClockPin()
+
+
+class SystemClock(IClock):
+    def now(self) -> float:
+        return time.monotonic()
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        return event.wait(timeout)
+
+    def hold(self) -> ContextManager[None]:
+        return nullcontext()
+
+    def pin(self) -> ClockPin:
+        return _NO_PIN
+
+
+SYSTEM_CLOCK = SystemClock()
+
+# real-time poll interval of the VirtualClock driver while work is pending
+# (Event.set() does not notify the clock); it never moves virtual time
+_EVENT_POLL_S = 0.0005
+
+
+class VirtualClock(IClock):
+    """
+    Discrete-event clock. Drive it from one thread with run_for()/advance().
+
+    Time advances explicitly: run_for() wakes the waiters that are due
+    (deadline reached or event set) one at a time, in (deadline,
+    registration) order, and lets the next one go only when no hold, pin
+    or woken waiter is left; with nobody due it jumps to the earliest
+    deadline. A waiter inside hold() holds again as it leaves the clock, so
+    nothing depends on real-time settling. Determinism assumes that the
+    participants (engine producers, simulated devices) only block through
+    this clock and are always either blocked in it, holding it or covered
+    by a pin.
+    """
+
+    def __init__(self, start: float = 0.0, epoch: Optional[float] = None) -> None:
+        self._now = float(start)
+        self._epoch = time.time() if epoch is None else float(epoch)
+
+        self._cond = threading.Condition()
+        self._waiters: dict[int, tuple[float, Optional[threading.Event]]] = {}
+        self._next_id = 0
+        self._holds = 0
+        self._pins = 0
+        self._admitted: set[int] = set()   # woken, not yet left the clock
+        self._driving = False
+        self._local = threading.local()   # per-thread hold depth
+
+    # ------------------------------------------------------------------ #
+    # IClock
+    # ------------------------------------------------------------------ #
+
+    def now(self) -> float:
+        return self._now
+
+    def time(self) -> float:
+        return self._epoch + self._now
+
+    def sleep(self, seconds: float) -> None:
+        with self._cond:
+            deadline = self._now + max(0.0, seconds)
+            wid = self._register(deadline, None)
+            try:
+                while not self._may_leave(wid):
+                    self._cond.wait()
+            finally:
+                self._unregister(wid)
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        if event.is_set():
+            return True
+        with self._cond:
+            deadline = math.inf if timeout is None else self._now + max(0.0, timeout)
+            wid = self._register(deadline, event)
+            try:
+                while not self._may_leave(wid):
+                    self._cond.wait(_EVENT_POLL_S)
+            finally:
+                self._unregister(wid)
+            return event.is_set()
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        with self._cond:
+            self._local.depth = self._depth() + 1
+            self._holds += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._local.depth = self._depth() - 1
+                self._holds -= 1
+                self._cond.notify_all()
+
+    def pin(self) -> ClockPin:
+        with self._cond:
+            self._pins += 1
+            return ClockPin(self)
+
+    # ------------------------------------------------------------------ #
+    # Driving
+    # ------------------------------------------------------------------ #
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward unconditionally and wake all due waiters at once."""
+        with self._cond:
+            self._now += max(0.0, seconds)
+            self._admitted.update(wid for wid, _ in self._due())
+            self._cond.notify_all()
+
+    def run_for(self, duration: float, until: Optional[Callable[[], bool]] = None, real_timeout: Optional[float] = None) -> bool:
+        """
+        Advance from deadline to deadline for 'duration' virtual seconds.
+        Stops early (returns True) once until() is true.
+        """
+        end = self._now + duration
+        real_end = None if real_timeout is None else time.monotonic() + real_timeout
+        self._set_driving(True)
+        try:
+            return self._drive(end, until, real_end)
+        finally:
+            self._set_driving(False)
+
+    def _drive(self, end: float, until: Optional[Callable[[], bool]], real_end: Optional[float]) -> bool:
+        while True:
+            if until is not None and until():
+                return True
+            if self._now >= end:
+                return False
+            if real_end is not None and time.monotonic() > real_end:
+                raise TimeoutError("VirtualClock.run_for exceeded its real-time budget.")
+
+            with self._cond:
+                if self._holds > 0 or self._pins > 0 or self._admitted:
+                    # woken by hold/pin release and waiter exit; the timeout
+                    # only catches an Event.set() from a non-participant
+                    self._cond.wait(_EVENT_POLL_S)
+                    continue
+                due = self._due()
+                if due:
+                    self._admitted.add(min(due, key=lambda w: (w[1], w[0]))[0])
+                    self._cond.notify_all()
+                    continue
+                pending = [d for d, _ in self._waiters.values()]
+                target = min([*pending, end])
+                if target > self._now:
+                    self._now = target
+
+    def _set_driving(self, driving: bool) -> None:
+        with self._cond:
+            self._driving = driving
+            self._cond.notify_all()
+
+    def _may_leave(self, wid: int) -> bool:
+        """Admitted by the driver; without a driver (e.g. shutting down) as soon as due."""
+        if wid in self._admitted:
+            return True
+        if self._driving:
+            return False
+        deadline, event = self._waiters[wid]
+        return self._now >= deadline or (event is not None and event.is_set())
+
+    def _due(self) -> list[tuple[int, float]]:
+        """(id, order key) of waiters that may wake now (caller holds _cond)."""
+        now = self._now
+        return [
+            (wid, min(d, now))
+            for wid, (d, e) in self._waiters.items()
+            if wid not in self._admitted and (d <= now or (e is not None and e.is_set()))
+        ]
+
+    def _release(self, pin: ClockPin) -> None:
+        with self._cond:
+            if not pin._released:
+                pin._released = True
+                self._pins -= 1
+                self._cond.notify_all()
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def _register(self, deadline: float, event: Optional[threading.Event]) -> int:
+        # a thread blocked in the clock does not hold it, even inside hold()
+        self._holds -= self._depth()
+        wid = self._next_id
+        self._next_id += 1
+        self._waiters[wid] = (deadline, event)
+        self._cond.notify_all()
+        return wid
+
+    def _unregister(self, wid: int) -> None:
+        self._holds += self._depth()
+        self._waiters.pop(wid, None)
+        self._admitted.discard(wid)
+        self._cond.notify_all()
+
+
+class StreamHandOff:
+    """
+    Clock bookkeeping for a stream producer and its on_item consumer.
+
+    run() drives the producer under clock.hold() (time blocked in the clock
+    excepted) but never holds across its yield. Instead every item pins the
+    clock until consume(item) has taken the hold for it, and the producer
+    pins it until it runs again, so whichever thread the runner uses for
+    on_item, no virtual time passes between producing and consuming. Items
+    are consumed in order; consuming one also releases older items that the
+    runner dropped.
+    """
+
+    def __init__(self, clock: IClock) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._items: deque[tuple[object, ClockPin]] = deque()
+        self._resume: Optional[ClockPin] = None
+
+    def run(self, producer: Iterable[T]) -> Iterator[T]:
+        items = iter(producer)
+        try:
+            while True:
+                with self._clock.hold():
+                    self._set_resume(None)
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    with self._lock:
+                        self._items.append((item, self._clock.pin()))
+                    self._set_resume(self._clock.pin())
+                yield item
+        finally:
+            self._set_resume(None)
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    @contextmanager
+    def consume(self, item: object) -> Iterator[None]:
+        """Hold the clock for one on_item call and release the item's pin."""
+        with self._clock.hold():
+            try:
+                yield
+            finally:
+                self._release_through(item)
+
+    def cancel(self) -> None:
+        """Release all pins (stream stopped or abandoned)."""
+        with self._lock:
+            pins = [pin for _, pin in self._items]
+            self._items.clear()
+        for pin in pins:
+            pin.release()
+        self._set_resume(None)
+
+    def _release_through(self, item: object) -> None:
+        pins = []
+        with self._lock:
+            if any(queued is item for queued, _ in self._items):
+                while True:
+                    queued, pin = self._items.popleft()
+                    pins.append(pin)
+                    if queued is item:
+                        break
+        for pin in pins:
+            pin.release()
+
+    def _set_resume(self, pin: Optional[ClockPin]) -> None:
+        with self._lock:
+            old, self._resume = self._resume, pin
+        if old is not None:
+            old.release()
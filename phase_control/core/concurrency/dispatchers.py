@@ -0,0 +1,39 @@
+# phase_control/core/concurrency/dispatchers.py
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Optional
+
+
+class QueueDispatcher:
+    """
+    Qt-free dispatcher: runs posted callables in order on one worker thread.
+
+    Used by the headless runner in place of QtDispatcher so that slow
+    consumers (telemetry file writes, logging) never run on an engine or
+    IO thread.
+    """
+
+    def __init__(self, name: str = "dispatcher", maxsize: int = 0) -> None:
+        self._queue: queue.Queue[Optional[Callable[[], None]]] = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def post(self, fn: Callable[[], None]) -> None:
+        self._queue.put(fn)
+
+    def close(self, timeout: float | None = 2.0) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            fn = self._queue.get()
+            if fn is None:
+                return
+            try:
+                fn()
+            except Exception:
+                import traceback
+                traceback.print_exc()
@@ -0,0 +1,21 @@
+# phase_control/core/interfaces.py
+from __future__ import annotations
+
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class ISuspendable(Protocol):
+    """
+    Something that can be paused while it is not visible.
+
+    A suspended object holds no bus subscriptions; resume() restores the
+    ones suspend() dropped. Both calls are idempotent. Pages that are
+    evicted or closed are suspended first, so the bus keeps no reference
+    to them.
+    """
+
+    @property
+    def is_suspended(self) -> bool: ...
+    def suspend(self) -> None: ...
+    def resume(self) -> None: ...
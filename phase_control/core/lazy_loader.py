@@ -0,0 +1,59 @@
+# phase_control/core/lazy_loader.py
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Any, Optional
+
+from base_core.framework.app import AppContext
+from base_core.framework.di import Container
+
+
+class LazyModuleLoader:
+    """
+    Defers importing (and DI-registering) a heavy feature package until
+    it is first needed.
+
+    The target module must expose ``register(c, ctx)``; it is imported
+    and registered exactly once, on the first call to load(). Feature
+    modules use this from a ViewSpec factory so that lmfit, scipy,
+    pyqtgraph etc. are only imported when the page is first selected.
+    """
+
+    def __init__(self, module_path: str, c: Container, ctx: AppContext) -> None:
+        self._module_path = module_path
+        self._c = c
+        self._ctx = ctx
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        if self._module is not None:
+            return self._module
+
+        with self._lock:
+            if self._module is None:
+                t0 = time.perf_counter()
+                module = importlib.import_module(self._module_path)
+                module.register(self._c, self._ctx)
+                self._module = module
+                self._ctx.log.info(
+                    "Lazy-loaded %s in %.1f ms", self._module_path, (time.perf_counter() - t0) * 1e3
+                )
+        return self._module
+
+    def get(self, key: Any) -> Any:
+        """
+        Load the target module (if needed) and resolve 'key' from the container.
+        'key' may be a type or the name of an attribute of the target module.
+        """
+        module = self.load()
+        if isinstance(key, str):
+            key = getattr(module, key)
+        return self._c.get(key)
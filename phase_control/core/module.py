@@ -6,7 +6,7 @@ from base_core.framework.modules import BaseModule
 from phase_control.app.module import AppModule
 from phase_control.core.plotting.spectrum_plot_VM import SpectrumPlotVM
 from base_qt.app.interfaces import IUiDispatcher
-from phase_control.io.spectrometer.interfaces import IFrameBuffer
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
 
 
 
@@ -16,5 +16,5 @@ class CoreModule(BaseModule):
 
     def register(self, c, ctx) -> None:
         
-        c.register_factory(SpectrumPlotVM, lambda c: SpectrumPlotVM(c.get(IUiDispatcher), ctx.event_bus, c.get(IFrameBuffer)))
+        c.register_factory(SpectrumPlotVM, lambda c: SpectrumPlotVM(c.get(IUiDispatcher), ctx.event_bus, c.get(IFrameBuffer), c.get(IRoiRegistry)))
         
\ No newline at end of file
@@ -14,7 +14,9 @@ from base_qt.view_models.thread_safe_vm_base import ThreadSafeVMBase, ui_thread
 from phase_control.io.events import TOPIC_NEW_SPECTRUM
 from base_qt.app.interfaces import IUiDispatcher
 from phase_control.io.spectrometer.frame_buffer import FrameBuffer
-from phase_control.io.spectrometer.interfaces import IFrameBuffer
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
+
+PLOT_RANGE = Range(Length(780, Prefix.NANO), Length(810, Prefix.NANO))
 
 
 class SpectrumPlotVM(ThreadSafeVMBase):
@@ -30,14 +32,17 @@ class SpectrumPlotVM(ThreadSafeVMBase):
     
     _normalize_spectrum = True
 
-    def __init__(self, ui: IUiDispatcher, bus: EventBus, buffer: IFrameBuffer) -> None:
+    def __init__(self, ui: IUiDispatcher, bus: EventBus, buffer: IFrameBuffer, roi: Optional[IRoiRegistry] = None) -> None:
         super().__init__(ui, bus)
+        self._bus = bus
         self._buffer = buffer
+        self._roi = roi
+        self._roi_owner = f"plot.{id(self)}"
 
         self._series: Dict[str, np.ndarray] = {}
         self._unsub: Optional[Callable[[], None]] = None
-        
-        self.sub_event(TOPIC_NEW_SPECTRUM, self._on_new_spectrum)
+
+        self.resume()
     
     @property
     def normalize_spectrum(self) -> bool:
@@ -65,21 +70,54 @@ class SpectrumPlotVM(ThreadSafeVMBase):
         self._series.clear()
         self.cleared.emit()
 
+    @property
+    def is_suspended(self) -> bool:
+        return self._unsub is None
+
+    def suspend(self) -> None:
+        # hidden plot: no handler on the bus, no normalize/cut per frame
+        self.unbind()
+
+    def resume(self) -> None:
+        if self._unsub is None:
+            self._unsub = self._bus.subscribe(TOPIC_NEW_SPECTRUM, self._on_new_spectrum)
+        if self._roi is not None:
+            self._roi.set_roi(self._roi_owner, PLOT_RANGE)
+
     def unbind(self) -> None:
+        """Drop the bus handler and the ROI claim (also what frees a closed page)."""
         if self._unsub is not None:
             self._unsub()
             self._unsub = None
+        if self._roi is not None:
+            self._roi.clear_roi(self._roi_owner)
             
     def _on_new_spectrum(self, args) -> None:
-        if self._normalize_spectrum == True:
-            spec = self._buffer.get_latest()
-            spec.normalize()
-        else:
-            spec = self._buffer.get_latest()
-            
+        spec = self._buffer.get_latest()
         if spec is None:
             return
-        cut = spec.cut(Range(Length(780, Prefix.NANO), Length(810, Prefix.NANO)))
+        if self._normalize_spectrum == True:
+            spec.normalize()
+        cut = spec.cut(PLOT_RANGE)
         x = cut.wavelengths_nm.copy()
         y = cut.intensity.copy()
-        self.apply_spectrum(x, y, "live")  
\ No newline at end of file
+        self.apply_spectrum(x, y, "live")
+
+
+class PlotPageSuspendMixin:
+    """
+    ISuspendable for page VMs whose live updates all go through their
+    SpectrumPlotVM ('plot_vm'): suspending the page suspends the plot.
+    """
+
+    plot_vm: SpectrumPlotVM
+
+    @property
+    def is_suspended(self) -> bool:
+        return self.plot_vm.is_suspended
+
+    def suspend(self) -> None:
+        self.plot_vm.suspend()
+
+    def resume(self) -> None:
+        self.plot_vm.resume()  
\ No newline at end of file
@@ -0,0 +1,150 @@
+# phase_control/core/resampling.py
+"""
+Resampling of the spectrometer's λ axis onto a uniform frequency grid.
+
+The stabilization model is a function of ν, but the detector samples λ on a
+nonuniform grid. NuResampler is a sparse linear map (two weights per output
+point, linear interpolation in ν) from the full detector axis onto N points
+spaced uniformly in ν inside the analysis window:
+
+    intensity_nu = operator @ intensity_full
+
+It folds the wavelength cut in, so one matrix-vector product replaces
+Spectrum.cut(), and the output axis (ν and the matching λ = c / ν) is built
+once. Operators are cached per StreamMeta and window (NuResamplerCache).
+The output is ordered by ascending wavelength like the input, i.e. ν
+decreases with a constant step; FFT-based analysis can use it directly.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from base_core.math.models import Range
+from base_core.quantities.enums import Prefix
+from base_core.quantities.models import Length
+from phase_control.core.models import Spectrum
+
+if TYPE_CHECKING:
+    from phase_control.io.spectrometer.models import StreamMeta
+
+# speed of light in nm * THz
+C_NM_THZ = 299_792.458
+
+
+@dataclass(frozen=True)
+class NuResampler:
+    matrix: sparse.csr_matrix      # (num_points, num_pixels)
+    nu_thz: np.ndarray             # uniform grid, descending
+    wavelengths_nm: np.ndarray     # c / nu_thz, ascending
+    wavelengths: list[Length]
+    wavelengths_nm_list: list[float]
+
+    @property
+    def num_points(self) -> int:
+        return int(self.nu_thz.size)
+
+    @property
+    def num_pixels(self) -> int:
+        return int(self.matrix.shape[1])
+
+    @property
+    def step_thz(self) -> float:
+        """Grid spacing (positive)."""
+        return float(abs(self.nu_thz[1] - self.nu_thz[0])) if self.nu_thz.size > 1 else 0.0
+
+    def apply(self, intensity: Sequence[float] | np.ndarray) -> np.ndarray:
+        return self.matrix @ np.asarray(intensity, dtype=float)
+
+    def resample(self, spectrum: Spectrum) -> Optional[ResampledSpectrum]:
+        """None if 'spectrum' is not on the axis this operator was built for."""
+        if len(spectrum.intensity) != self.num_pixels:
+            return None
+        return ResampledSpectrum(self.wavelengths, self.apply(spectrum.intensity), self)
+
+
+@dataclass(slots=True)
+class ResampledSpectrum(Spectrum):
+    """Spectrum on a NuResampler grid; axis properties come precomputed."""
+    resampler: Optional[NuResampler] = None
+
+    @property
+    def wavelengths_nm(self) -> list[float]:
+        return self.resampler.wavelengths_nm_list
+
+    @property
+    def nu_thz(self) -> np.ndarray:
+        return self.resampler.nu_thz
+
+
+def build_nu_resampler(
+    wavelengths_nm: Sequence[float],
+    range_nm: tuple[float, float],
+    num_points: Optional[int] = None,
+) -> Optional[NuResampler]:
+    """
+    Operator for the pixels inside [lo, hi] nm; 'num_points' defaults to the
+    number of pixels in the window. None if the window holds fewer than two
+    pixels.
+    """
+    wl = np.asarray(wavelengths_nm, dtype=float)
+    lo, hi = range_nm
+    idx = np.flatnonzero((wl >= lo) & (wl <= hi))
+    if idx.size < 2:
+        return None
+
+    nu = C_NM_THZ / wl[idx]
+    order = np.argsort(nu)
+    nu_src = nu[order]
+    cols_src = idx[order]
+
+    n = int(num_points) if num_points else int(idx.size)
+    nu_out = np.linspace(nu_src[-1], nu_src[0], max(2, n))  # descending = ascending λ
+
+    j = np.clip(np.searchsorted(nu_src, nu_out, side="right") - 1, 0, nu_src.size - 2)
+    span = nu_src[j + 1] - nu_src[j]
+    t = np.divide(nu_out - nu_src[j], span, out=np.zeros_like(nu_out), where=span > 0)
+    t = np.clip(t, 0.0, 1.0)
+
+    rows = np.repeat(np.arange(nu_out.size), 2)
+    cols = np.column_stack([cols_src[j], cols_src[j + 1]]).ravel()
+    data = np.column_stack([1.0 - t, t]).ravel()
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(nu_out.size, wl.size))
+
+    wl_out = C_NM_THZ / nu_out
+    return NuResampler(
+        matrix=matrix,
+        nu_thz=nu_out,
+        wavelengths_nm=wl_out,
+        wavelengths=[Length(w, Prefix.NANO) for w in wl_out],
+        wavelengths_nm_list=wl_out.tolist(),
+    )
+
+
+class NuResamplerCache:
+    """
+    Last operator per (StreamMeta, window). A new META (ROI, binning) or a
+    window edit rebuilds it; every other frame reuses it.
+    """
+
+    def __init__(self, num_points: Optional[int] = None) -> None:
+        self.num_points = num_points
+        self._lock = threading.Lock()
+        self._key: Optional[tuple] = None
+        self._meta: Optional[StreamMeta] = None
+        self._op: Optional[NuResampler] = None
+
+    def get(self, meta: Optional[StreamMeta], range_wl: Range[Length]) -> Optional[NuResampler]:
+        if meta is None or meta.wavelengths is None:
+            return None
+        key = (range_wl.min.value(Prefix.NANO), range_wl.max.value(Prefix.NANO), self.num_points)
+        with self._lock:
+            if meta is self._meta and key == self._key:
+                return self._op
+            op = build_nu_resampler(meta.wavelengths, key[:2], self.num_points)
+            self._meta, self._key, self._op = meta, key, op
+            return op
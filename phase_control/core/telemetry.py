@@ -0,0 +1,53 @@
+# phase_control/core/telemetry.py
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+from base_core.framework.events import EventBus
+from phase_control.core.concurrency.dispatchers import QueueDispatcher
+
+
+class TelemetryWriter:
+    """
+    Writes bus events as JSON lines: {"topic": ..., <dataclass fields>}.
+
+    Bus callbacks only enqueue; formatting and writing run on the given
+    dispatcher so a slow disk or terminal never stalls an engine thread.
+    """
+
+    def __init__(self, bus: EventBus, dispatcher: QueueDispatcher, out: TextIO, topics: Iterable[str]) -> None:
+        self._dispatcher = dispatcher
+        self._out = out
+        self._unsubs: list[Callable[[], None]] = [
+            bus.subscribe(topic, self._make_handler(topic)) for topic in topics
+        ]
+
+    def close(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._dispatcher.post(self._out.flush)
+
+    def _make_handler(self, topic: str) -> Callable[[Any], None]:
+        def handler(payload: Any) -> None:
+            self._dispatcher.post(lambda: self._write(topic, payload))
+        return handler
+
+    def _write(self, topic: str, payload: Any) -> None:
+        record: dict[str, Any] = {"topic": topic}
+        fields = self._to_dict(payload)
+        if fields is not None:
+            record.update(fields)
+        self._out.write(json.dumps(record, default=str) + "\n")
+
+    @staticmethod
+    def _to_dict(payload: Any) -> Optional[dict[str, Any]]:
+        if dataclasses.is_dataclass(payload) and not isinstance(payload, type):
+            return dataclasses.asdict(payload)
+        if isinstance(payload, dict):
+            return dict(payload)
+        if payload in (None, ""):
+            return None
+        return {"value": payload}
@@ -0,0 +1,372 @@
+# phase_control/io/archive.py
+"""
+Compressed, chunked archive for long runs: raw frames + engine telemetry.
+
+File layout (little endian):
+
+  MAGIC
+  u32 header_len, header_len bytes JSON (stream meta, dtype, codec, ...)
+  chunk*:
+    CHUNK_HEADER (kind, n_records, t_first, t_last, raw_len, comp_len)
+    comp_len bytes compressed payload
+  footer (only after a clean close):
+    JSON chunk index, u64 footer offset, FOOTER_MAGIC
+
+Frame chunks hold up to 'chunk_frames' frames. The first frame of a chunk is
+stored as is, every following one as the difference to its predecessor, so
+each chunk decodes on its own. Telemetry chunks hold JSON lines. The chunk
+index (t_first/t_last per chunk) gives random access to any time range
+without decompressing the rest of the file; if the footer is missing (crash)
+it is rebuilt by walking the chunk headers.
+"""
+from __future__ import annotations
+
+import bz2
+import dataclasses
+import json
+import lzma
+import queue
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Optional
+
+import numpy as np
+
+from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
+from phase_control.io.spectrometer.recorder import parse_timestamp
+
+MAGIC = b"PCARCH1\n"
+FOOTER_MAGIC = b"PCIDX1\n\0"
+CHUNK_HEADER = struct.Struct("<BIddII")
+
+KIND_FRAMES = 1
+KIND_TELEMETRY = 2
+
+FRAME_INDEX_DTYPE = np.dtype([("seq", "<u8"), ("timestamp", "<f8")])
+
+CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+
+DEFAULT_CHUNK_FRAMES = 256
+DEFAULT_QUEUE_SIZE = 4_096
+
+
+@dataclass(frozen=True)
+class ChunkInfo:
+    offset: int          # file offset of the chunk header
+    kind: int
+    n_records: int
+    t_first: float
+    t_last: float
+
+
+def _encode_deltas(counts: np.ndarray) -> np.ndarray:
+    out = counts.copy()
+    out[1:] = np.diff(counts, axis=0)
+    return out
+
+
+def _decode_deltas(deltas: np.ndarray) -> np.ndarray:
+    return np.cumsum(deltas, axis=0, dtype=deltas.dtype)
+
+
+class ArchiveWriter:
+    """
+    Appends frames and telemetry to an archive on a dedicated thread.
+
+    append_frame()/append_telemetry() never block; when the bounded queue
+    is full the record is counted in 'dropped'.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        meta: StreamMeta,
+        *,
+        dtype: np.dtype | str = np.int32,
+        chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+        codec: str = "zlib",
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; expected one of {', '.join(CODECS)}")
+
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._meta = meta
+        self._dtype = np.dtype(dtype)
+        self._chunk_frames = max(1, int(chunk_frames))
+        self._compress = CODECS[codec][0]
+
+        self._f: BinaryIO = open(self._path, "wb")
+        header = json.dumps({
+            "version": 1,
+            "codec": codec,
+            "dtype": self._dtype.str,
+            "chunk_frames": self._chunk_frames,
+            "device_index": meta.device_index,
+            "num_pixels": meta.num_pixels,
+            "wavelengths": meta.wavelengths,
+            "regions": meta.regions,
+            "binning": meta.binning,
+            "created": time.time(),
+        }).encode("utf-8")
+        self._f.write(MAGIC)
+        self._f.write(struct.pack("<I", len(header)))
+        self._f.write(header)
+
+        self._chunks: list[ChunkInfo] = []
+        self._frames: list[np.ndarray] = []
+        self._frame_index: list[tuple[int, float]] = []
+        self._telemetry: list[tuple[float, str]] = []
+
+        self._unsubs: list[Callable[[], None]] = []
+        self._queue: queue.Queue[Optional[tuple]] = queue.Queue(maxsize=queue_size)
+        self._dropped = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="io.archive", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def append(self, seq: int, frame: StreamFrame) -> bool:
+        """
+        IFrameSink entry point (see SpectrometerService.add_frame_sink).
+        """
+        return self.append_frame(seq, frame)
+
+    def append_frame(self, seq: int, frame: StreamFrame) -> bool:
+        return self._put((KIND_FRAMES, seq, frame, time.time()))
+
+    def append_telemetry(self, topic: str, payload: Any, timestamp: Optional[float] = None) -> bool:
+        return self._put((KIND_TELEMETRY, topic, payload, timestamp if timestamp is not None else time.time()))
+
+    def attach_bus(self, bus, topics: Iterable[str]) -> None:
+        """
+        Archive every event published on 'topics' as telemetry.
+        """
+        for topic in topics:
+            self._unsubs.append(bus.subscribe(topic, lambda payload, t=topic: self.append_telemetry(t, payload)))
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        if self._closed:
+            return
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ------------------------------------------------------------------ #
+    # Writer thread
+    # ------------------------------------------------------------------ #
+
+    def _put(self, item: tuple) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self._dropped += 1
+            return False
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                if item[0] == KIND_FRAMES:
+                    self._add_frame(*item[1:])
+                else:
+                    self._add_telemetry(*item[1:])
+        finally:
+            self._flush_frames()
+            self._flush_telemetry()
+            self._write_footer()
+            self._f.close()
+
+    def _add_frame(self, seq: int, frame: StreamFrame, received: float) -> None:
+        counts = np.asarray(frame.counts, dtype=self._dtype)
+        if counts.shape != (self._meta.num_pixels,):
+            self._dropped += 1
+            return
+        ts = parse_timestamp(frame.timestamp)
+        self._frames.append(counts)
+        self._frame_index.append((seq, received if np.isnan(ts) else ts))
+        if len(self._frames) >= self._chunk_frames:
+            self._flush_frames()
+            # keep telemetry chunks aligned with frame chunks in time
+            self._flush_telemetry()
+
+    def _add_telemetry(self, topic: str, payload: Any, timestamp: float) -> None:
+        record: dict[str, Any] = {"topic": topic, "t": timestamp}
+        if dataclasses.is_dataclass(payload) and not isinstance(payload, type):
+            record.update(dataclasses.asdict(payload))
+        elif isinstance(payload, dict):
+            record.update(payload)
+        elif payload not in (None, ""):
+            record["value"] = payload
+        self._telemetry.append((timestamp, json.dumps(record, default=str)))
+        if len(self._telemetry) >= 4 * self._chunk_frames:
+            self._flush_telemetry()
+
+    def _flush_frames(self) -> None:
+        if not self._frames:
+            return
+        counts = np.stack(self._frames)
+        index = np.array(self._frame_index, dtype=FRAME_INDEX_DTYPE)
+        raw = index.tobytes() + _encode_deltas(counts).tobytes()
+        self._write_chunk(KIND_FRAMES, len(self._frames), float(index["timestamp"].min()), float(index["timestamp"].max()), raw)
+        self._frames.clear()
+        self._frame_index.clear()
+
+    def _flush_telemetry(self) -> None:
+        if not self._telemetry:
+            return
+        times = [t for t, _ in self._telemetry]
+        raw = "\n".join(line for _, line in self._telemetry).encode("utf-8")
+        self._write_chunk(KIND_TELEMETRY, len(self._telemetry), min(times), max(times), raw)
+        self._telemetry.clear()
+
+    def _write_chunk(self, kind: int, n: int, t_first: float, t_last: float, raw: bytes) -> None:
+        comp = self._compress(raw)
+        offset = self._f.tell()
+        self._f.write(CHUNK_HEADER.pack(kind, n, t_first, t_last, len(raw), len(comp)))
+        self._f.write(comp)
+        self._f.flush()
+        self._chunks.append(ChunkInfo(offset, kind, n, t_first, t_last))
+
+    def _write_footer(self) -> None:
+        offset = self._f.tell()
+        index = json.dumps([dataclasses.astuple(c) for c in self._chunks]).encode("utf-8")
+        self._f.write(index)
+        self._f.write(struct.pack("<Q", offset))
+        self._f.write(FOOTER_MAGIC)
+
+
+class ArchiveReader:
+    """
+    Random access to an archive by time range; only chunks overlapping
+    the requested range are read and decompressed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._f: BinaryIO = open(Path(path), "rb")
+        if self._f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a phase control archive.")
+        (header_len,) = struct.unpack("<I", self._f.read(4))
+        self.header: dict[str, Any] = json.loads(self._f.read(header_len))
+        self._data_start = self._f.tell()
+
+        self.meta = StreamMeta(
+            device_index=int(self.header["device_index"]),
+            num_pixels=int(self.header["num_pixels"]),
+            wavelengths=self.header.get("wavelengths"),
+            regions=[tuple(r) for r in self.header["regions"]] if self.header.get("regions") else None,
+            binning=int(self.header.get("binning", 1)),
+        )
+        self._dtype = np.dtype(self.header["dtype"])
+        self._decompress = CODECS[self.header["codec"]][1]
+        self.chunks: list[ChunkInfo] = self._read_footer() or self._scan_chunks()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> ArchiveReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def read_frames(self, t_start: float = -np.inf, t_end: float = np.inf) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return (index, counts) for all frames with t_start <= timestamp <= t_end.
+        index has FRAME_INDEX_DTYPE, counts has shape (n, num_pixels).
+        """
+        indices: list[np.ndarray] = []
+        counts: list[np.ndarray] = []
+        n_pix = self.meta.num_pixels
+        for chunk in self._overlapping(KIND_FRAMES, t_start, t_end):
+            raw = self._read_payload(chunk)
+            split = chunk.n_records * FRAME_INDEX_DTYPE.itemsize
+            index = np.frombuffer(raw[:split], dtype=FRAME_INDEX_DTYPE)
+            deltas = np.frombuffer(raw[split:], dtype=self._dtype).reshape(chunk.n_records, n_pix)
+            mask = (index["timestamp"] >= t_start) & (index["timestamp"] <= t_end)
+            indices.append(index[mask])
+            counts.append(_decode_deltas(deltas)[mask])
+
+        if not indices:
+            return np.empty((0,), dtype=FRAME_INDEX_DTYPE), np.empty((0, n_pix), dtype=self._dtype)
+        return np.concatenate(indices), np.concatenate(counts)
+
+    def read_telemetry(self, t_start: float = -np.inf, t_end: float = np.inf, topic: Optional[str] = None) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        for chunk in self._overlapping(KIND_TELEMETRY, t_start, t_end):
+            for line in self._read_payload(chunk).decode("utf-8").splitlines():
+                rec = json.loads(line)
+                if t_start <= rec["t"] <= t_end and (topic is None or rec["topic"] == topic):
+                    out.append(rec)
+        return out
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _overlapping(self, kind: int, t_start: float, t_end: float) -> Iterable[ChunkInfo]:
+        return (c for c in self.chunks if c.kind == kind and c.t_last >= t_start and c.t_first <= t_end)
+
+    def _read_payload(self, chunk: ChunkInfo) -> bytes:
+        self._f.seek(chunk.offset)
+        kind, n, t0, t1, raw_len, comp_len = CHUNK_HEADER.unpack(self._f.read(CHUNK_HEADER.size))
+        raw = self._decompress(self._f.read(comp_len))
+        if len(raw) != raw_len:
+            raise ValueError(f"Corrupt chunk at offset {chunk.offset}.")
+        return raw
+
+    def _read_footer(self) -> Optional[list[ChunkInfo]]:
+        tail = 8 + len(FOOTER_MAGIC)
+        self._f.seek(0, 2)
+        size = self._f.tell()
+        if size < self._data_start + tail:
+            return None
+        self._f.seek(size - tail)
+        (offset,) = struct.unpack("<Q", self._f.read(8))
+        if self._f.read(len(FOOTER_MAGIC)) != FOOTER_MAGIC:
+            return None
+        self._f.seek(offset)
+        raw = self._f.read(size - tail - offset)
+        return [ChunkInfo(*row) for row in json.loads(raw)]
+
+    def _scan_chunks(self) -> list[ChunkInfo]:
+        """
+        Rebuild the chunk index from the chunk headers (archive not closed cleanly).
+        """
+        chunks: list[ChunkInfo] = []
+        self._f.seek(0, 2)
+        size = self._f.tell()
+        offset = self._data_start
+        while offset + CHUNK_HEADER.size <= size:
+            self._f.seek(offset)
+            kind, n, t0, t1, raw_len, comp_len = CHUNK_HEADER.unpack(self._f.read(CHUNK_HEADER.size))
+            end = offset + CHUNK_HEADER.size + comp_len
+            if kind not in (KIND_FRAMES, KIND_TELEMETRY) or end > size:
+                break
+            chunks.append(ChunkInfo(offset, kind, n, t0, t1))
+            offset = end
+        return chunks
@@ -0,0 +1,35 @@
+# phase_control/io/device_status.py
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Optional
+
+from base_core.framework.events import EventBus
+from phase_control.io.events import TOPIC_DEVICE_STATE, DeviceStateEventArgs
+
+
+class DeviceStatusBoard:
+    """
+    Last known bring-up state per device.
+
+    Listens to TOPIC_DEVICE_STATE so that views created after the devices
+    started (e.g. the main window) can still show the current state.
+    """
+
+    def __init__(self, bus: EventBus) -> None:
+        self._states: Dict[str, DeviceStateEventArgs] = {}
+        self._lock = threading.Lock()
+        self._unsub: Optional[Callable[[], None]] = bus.subscribe(TOPIC_DEVICE_STATE, self._on_state)
+
+    def snapshot(self) -> Dict[str, DeviceStateEventArgs]:
+        with self._lock:
+            return dict(self._states)
+
+    def close(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _on_state(self, args: DeviceStateEventArgs) -> None:
+        with self._lock:
+            self._states[args.device] = args
@@ -0,0 +1,121 @@
+# phase_control/io/devices.py
+"""
+Qt-free device wiring shared by IOModule (GUI) and the headless runner.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Optional, Sequence
+
+from base_core.framework.json.json_endpoint import JsonlSubprocessEndpoint
+from elliptec.config import ELL14Config
+from phase_control.core.clock import IClock
+from phase_control.core.concurrency.runners import IRotatorTaskRunner, ISpectrometerTaskRunner
+from phase_control.io.device_status import DeviceStatusBoard
+from phase_control.io.events import TOPIC_DEVICE_STATE, DeviceState, DeviceStateEventArgs
+from phase_control.io.rotator.interfaces import IRotatorController
+from phase_control.io.rotator.rotator_worker import RotatorController
+from phase_control.io.spectrometer.correction import CalibrationStore, FrameCorrection
+from phase_control.io.spectrometer.flow_control import FlowControlConfig
+from phase_control.io.spectrometer.frame_buffer import FrameBuffer
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
+from phase_control.io.spectrometer.quality import FrameQuality, HotPixelMask, QualityConfig
+from phase_control.io.spectrometer.roi import RoiConfig, RoiRegistry
+from phase_control.io.spectrometer.spectrometer_service import SpectrometerService
+from spm_002.config import PYTHON32_PATH
+
+DEFAULT_ROTATOR_PORT = "COM3"
+DEFAULT_SPECTROMETER_ARGV = (PYTHON32_PATH, "-u", "-m", "spm_002.spectrometer_server")
+
+
+def register_devices(
+    c,
+    ctx,
+    *,
+    rotator_port: str = DEFAULT_ROTATOR_PORT,
+    spectrometer_argv: Optional[Sequence[str]] = None,
+    flow_control: Optional[FlowControlConfig] = None,
+    roi: Optional[RoiConfig] = None,
+    quality: Optional[QualityConfig] = None,
+) -> None:
+    """
+    'spectrometer_argv' replaces the acquisition process command line, e.g.
+    fake_server.fake_spectrometer_argv() to run without hardware.
+    'flow_control' sets the credit window (see flow_control.py), 'roi'
+    the server-side cropping/binning (see roi.py), 'quality' the frame
+    rejection thresholds (see quality.py).
+    """
+    argv = list(spectrometer_argv or DEFAULT_SPECTROMETER_ARGV)
+
+    c.register_singleton(CalibrationStore, lambda c: CalibrationStore())
+    c.register_singleton(FrameCorrection, lambda c: FrameCorrection(c.get(CalibrationStore)))
+    c.register_singleton(HotPixelMask, lambda c: HotPixelMask())
+    c.register_singleton(FrameQuality, lambda c: FrameQuality(quality, c.get(HotPixelMask)))
+    c.register_singleton(IFrameBuffer, lambda c: FrameBuffer(c.get(FrameCorrection), c.get(FrameQuality)))
+    c.register_singleton(DeviceStatusBoard, lambda c: DeviceStatusBoard(ctx.event_bus))
+
+    c.register_singleton(FlowControlConfig, lambda c: flow_control or FlowControlConfig())
+    c.register_singleton(IRoiRegistry, lambda c: RoiRegistry(roi))
+    c.register_singleton(JsonlSubprocessEndpoint, lambda c: JsonlSubprocessEndpoint(argv=argv))
+    c.register_singleton(SpectrometerService, lambda c: SpectrometerService(
+            io=c.get(ISpectrometerTaskRunner),
+            endpoint=c.get(JsonlSubprocessEndpoint),
+            bus=ctx.event_bus,                 
+            buffer=c.get(IFrameBuffer),
+            flow_control=c.get(FlowControlConfig),
+            roi=c.get(IRoiRegistry),
+            correction=c.get(FrameCorrection),
+            quality=c.get(FrameQuality)))
+
+    c.register_singleton(ELL14Config, lambda c: ELL14Config())
+    c.register_singleton(
+        IRotatorController,
+        lambda c: RotatorController(
+            port=rotator_port,
+            io=c.get(IRotatorTaskRunner),
+            config=c.get(ELL14Config),
+            clock=c.get(IClock)))
+
+
+def start_devices(c, ctx) -> dict[str, Future[None]]:
+    """
+    Bring spectrometer and rotator up in parallel on their own IO runners.
+    Does not block; returns the readiness future per device.
+    """
+    c.get(DeviceStatusBoard)  # subscribe before the first state is published
+
+    spectrometer: SpectrometerService = c.get(SpectrometerService)
+    rotator = c.get(IRotatorController)
+    rotator.open()
+
+    ready = {
+        "spectrometer": spectrometer.start_async(),
+        "rotator": rotator.ready,
+    }
+    for device, fut in ready.items():
+        _publish_readiness(ctx, device, fut)
+    return ready
+
+
+def stop_devices(c, ctx) -> None:
+    c.get(DeviceStatusBoard).close()
+    c.get(IRotatorController).close()
+    spectrometer: SpectrometerService = c.get(SpectrometerService)
+    spectrometer.stop_recording()
+    spectrometer.stop()
+
+
+def _publish_readiness(ctx, device: str, ready: Future[None]) -> None:
+    bus = ctx.event_bus
+    bus.publish(TOPIC_DEVICE_STATE, DeviceStateEventArgs(device, DeviceState.STARTING))
+
+    def on_done(fut: Future[None]) -> None:
+        exc = None if fut.cancelled() else fut.exception()
+        if fut.cancelled() or exc is not None:
+            ctx.log.error("%s bring-up failed: %s", device, exc)
+            bus.publish(TOPIC_DEVICE_STATE, DeviceStateEventArgs(device, DeviceState.FAILED, str(exc)))
+        else:
+            ctx.log.info("%s ready", device)
+            bus.publish(TOPIC_DEVICE_STATE, DeviceStateEventArgs(device, DeviceState.READY))
+
+    ready.add_done_callback(on_done)
@@ -1,12 +1,27 @@
 from dataclasses import dataclass
+from enum import Enum
 
 
 TOPIC_NEW_SPECTRUM = "io.new_spectrum"
 TOPIC_NEW_CONFIG = "io.new_config"
 TOPIC_ACQ_ERROR = "io.acquisition_error"
+TOPIC_DEVICE_STATE = "io.device_state"
+
+
+class DeviceState(str, Enum):
+    STARTING = "starting"
+    READY = "ready"
+    FAILED = "failed"
 
 
 @dataclass(frozen=True)
 class NewSpectrumEventArgs:
     timestamp: float
     device_index: int
+
+
+@dataclass(frozen=True)
+class DeviceStateEventArgs:
+    device: str
+    state: DeviceState
+    error: str | None = None
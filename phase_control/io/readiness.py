@@ -0,0 +1,38 @@
+# phase_control/io/readiness.py
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Optional
+
+
+class DeviceNotReadyError(RuntimeError):
+    """Raised when an engine is started before the devices it needs are up."""
+
+
+def new_ready_future() -> Future[None]:
+    return Future()
+
+
+def set_ready(fut: Future[None]) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+def set_failed(fut: Future[None], exc: BaseException) -> None:
+    if not fut.done():
+        fut.set_exception(exc)
+
+
+def is_ready(fut: Optional[Future[None]]) -> bool:
+    return fut is not None and fut.done() and not fut.cancelled() and fut.exception() is None
+
+
+def ensure_ready(**devices: Future[None]) -> None:
+    """
+    Raise DeviceNotReadyError unless every given readiness future completed successfully.
+
+    Usage: ensure_ready(spectrometer=buffer.ready, rotator=rotator.ready)
+    """
+    missing = [name for name, fut in devices.items() if not is_ready(fut)]
+    if missing:
+        raise DeviceNotReadyError(f"Device(s) not ready: {', '.join(missing)}")
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from concurrent.futures import Future
 from typing import Protocol, runtime_checkable
 
 from base_core.math.models import Angle
@@ -10,7 +11,11 @@ class IRotatorController(Protocol):
     @property
     def is_busy(self) -> bool: ...
     @property
+    def busy_for_s(self) -> float: ...
+    @property
     def config(self) -> ELL14Config: ...
+    @property
+    def ready(self) -> Future[None]: ...
     def open(self) -> None: ...
     def close(self) -> None: ...
     def request_rotation(self, angle: Angle) -> None: ...
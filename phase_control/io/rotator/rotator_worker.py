@@ -1,40 +1,64 @@
 # rotator_worker.py
+from concurrent.futures import Future
 import threading
 from base_core.framework.concurrency.task_runner import ITaskRunner
 from base_core.math.models import Angle
 from elliptec.base.enums import StatusCode
 from elliptec.config import ELL14Config
 from elliptec.elliptec_ell14 import Rotator
+from phase_control.core.clock import SYSTEM_CLOCK, IClock
+from phase_control.io.readiness import new_ready_future, set_failed, set_ready
 from phase_control.io.rotator.interfaces import IRotatorController
 
 
 class RotatorController(IRotatorController):
-    def __init__(self, port: str, io: ITaskRunner, config: ELL14Config):
+    def __init__(self, port: str, io: ITaskRunner, config: ELL14Config, clock: IClock = SYSTEM_CLOCK):
         self._port = port
         self._runner = io
         self._config = config
+        self._clock = clock
         self._rotator: Rotator | None = None
 
         self._busy = threading.Event()
         self._busy_lock = threading.Lock()
         self._busy_gen = 0  # increments for each scheduled command
+        self._busy_since = 0.0
+
+        # completes once the device is open and homed
+        self._ready: Future[None] = new_ready_future()
 
     @property
     def is_busy(self) -> bool:
         # IMPORTANT: no hardware / serial reads here
         return self._busy.is_set()
+
+    @property
+    def busy_for_s(self) -> float:
+        """Seconds since the rotator became busy (0 when idle)."""
+        if not self._busy.is_set():
+            return 0.0
+        return self._clock.now() - self._busy_since
     
     @property
     def config(self) -> ELL14Config:
         return self._config
 
+    @property
+    def ready(self) -> Future[None]:
+        return self._ready
+
     def open(self) -> None:
         gen = self._mark_busy()
+        ready = self._renew_ready()
 
         def work() -> None:
             try:
                 r = self._ensure_open()
                 r.home()
+                set_ready(ready)
+            except BaseException as e:
+                set_failed(ready, e)
+                raise
             finally:
                 self._clear_busy(gen)
 
@@ -48,6 +72,7 @@ class RotatorController(IRotatorController):
 
     def close(self) -> None:
         gen = self._mark_busy()
+        self._renew_ready()
 
         def work() -> None:
             try:
@@ -69,6 +94,7 @@ class RotatorController(IRotatorController):
 
     def request_restart(self) -> None:
         gen = self._mark_busy()
+        ready = self._renew_ready()
 
         def work() -> None:
             try:
@@ -78,6 +104,10 @@ class RotatorController(IRotatorController):
                     finally:
                         self._rotator = None
                 self._ensure_open()
+                set_ready(ready)
+            except BaseException as e:
+                set_failed(ready, e)
+                raise
             finally:
                 self._clear_busy(gen)
 
@@ -88,10 +118,17 @@ class RotatorController(IRotatorController):
             drop_outdated=True,
         )
 
+    def _renew_ready(self) -> Future[None]:
+        if self._ready.done():
+            self._ready = new_ready_future()
+        return self._ready
+
     def _mark_busy(self) -> int:
         with self._busy_lock:
             self._busy_gen += 1
             gen = self._busy_gen
+            if not self._busy.is_set():
+                self._busy_since = self._clock.now()
             self._busy.set()
             return gen
 
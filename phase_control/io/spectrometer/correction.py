@@ -0,0 +1,205 @@
+# phase_control/io/spectrometer/correction.py
+"""
+Dark-frame and flat-field correction between SpectrometerService and the
+consumers.
+
+References are averaged from live frames (ReferenceCapture is a frame sink)
+and cached per exposure setting: in memory and as '<key>.npz' in the
+calibration directory, where the key covers device, exposure and the
+(ROI-cropped) wavelength axis. FrameBuffer applies
+
+    corrected = (counts - dark) * gain,   gain = mean(flat - dark) / (flat - dark)
+
+in place on the float copy it makes anyway; recorders and archives keep
+the raw frames.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from phase_control.io.spectrometer.interfaces import IFrameSink
+from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CALIBRATION_DIR = Path.home() / ".phase_control" / "calibration"
+DEFAULT_REFERENCE_FRAMES = 50
+# flat-field pixels with less response than this (relative to the mean) keep gain 1
+MIN_FLAT_RESPONSE = 0.05
+
+
+def correction_key(meta: StreamMeta, exposure_ms: float) -> str:
+    """Cache key: device, exposure and the exact wavelength axis sent."""
+    axis = np.round(np.asarray(meta.wavelengths or [], dtype=float), 3)
+    digest = hashlib.sha1(axis.tobytes()).hexdigest()[:12]
+    return f"dev{meta.device_index}_exp{float(exposure_ms):g}ms_{meta.num_pixels}px_{digest}"
+
+
+def flat_gain(flat: np.ndarray, dark: Optional[np.ndarray]) -> np.ndarray:
+    response = np.asarray(flat, dtype=float) - (dark if dark is not None else 0.0)
+    mean = float(np.mean(response[response > 0])) if np.any(response > 0) else 0.0
+    gain = np.ones_like(response)
+    if mean <= 0:
+        return gain
+    ok = response > MIN_FLAT_RESPONSE * mean
+    gain[ok] = mean / response[ok]
+    return gain
+
+
+class CalibrationStore:
+    """One '<key>.npz' per exposure setting with optional 'dark' and 'flat' arrays."""
+
+    def __init__(self, root: Path = DEFAULT_CALIBRATION_DIR) -> None:
+        self._root = Path(root)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def load(self, key: str) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        try:
+            with np.load(self._root / f"{key}.npz") as data:
+                dark = data["dark"] if "dark" in data.files else None
+                flat = data["flat"] if "flat" in data.files else None
+        except (OSError, ValueError, KeyError):
+            return None, None
+        return dark, flat
+
+    def save(self, key: str, dark: Optional[np.ndarray], flat: Optional[np.ndarray]) -> None:
+        arrays = {name: arr for name, arr in (("dark", dark), ("flat", flat)) if arr is not None}
+        path = self._root / f"{key}.npz"
+        if not arrays:
+            path.unlink(missing_ok=True)
+            return
+        self._root.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)  # atomic: never leave a half-written file
+
+
+class ReferenceCapture(IFrameSink):
+    """Averages the next 'frames' raw frames; 'result' completes with the mean."""
+
+    def __init__(self, frames: int = DEFAULT_REFERENCE_FRAMES, num_pixels: Optional[int] = None) -> None:
+        self._frames = max(1, int(frames))
+        self._num_pixels = num_pixels
+        self._sum: Optional[np.ndarray] = None
+        self._count = 0
+        self.result: Future[np.ndarray] = Future()
+
+    def append(self, seq: int, frame: StreamFrame) -> bool:
+        if self.result.done():
+            return False
+        counts = np.asarray(frame.counts, dtype=float)
+        if self._num_pixels is not None and counts.size != self._num_pixels:
+            return False
+        if self._sum is None:
+            self._sum = np.zeros_like(counts)
+        self._sum += counts
+        self._count += 1
+        if self._count >= self._frames:
+            self.result.set_result(self._sum / self._count)
+        return True
+
+    def close(self) -> None:
+        if not self.result.done():
+            self.result.cancel()
+
+
+class FrameCorrection:
+    """
+    Dark/flat references for the current exposure setting. select() is
+    called by SpectrometerService on META and config changes, apply() by
+    FrameBuffer for every spectrum it builds.
+    """
+
+    def __init__(self, store: Optional[CalibrationStore] = None, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._store = store
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[Optional[np.ndarray], Optional[np.ndarray]]] = {}
+        self._key: Optional[str] = None
+        self._dark: Optional[np.ndarray] = None
+        self._flat: Optional[np.ndarray] = None
+        self._gain: Optional[np.ndarray] = None
+        self._save_error: Optional[str] = None
+
+    @property
+    def save_error(self) -> Optional[str]:
+        """Why the last reference change could not be stored (None once a save succeeds)."""
+        return self._save_error
+
+    @property
+    def key(self) -> Optional[str]:
+        return self._key
+
+    @property
+    def dark(self) -> Optional[np.ndarray]:
+        return self._dark
+
+    @property
+    def flat(self) -> Optional[np.ndarray]:
+        return self._flat
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and (self._dark is not None or self._gain is not None)
+
+    def select(self, meta: StreamMeta, exposure_ms: float) -> None:
+        key = correction_key(meta, exposure_ms)
+        with self._lock:
+            if key == self._key:
+                return
+            if key not in self._cache:
+                self._cache[key] = self._store.load(key) if self._store is not None else (None, None)
+            self._key = key
+            self._set(*self._cache[key])
+
+    def set_dark(self, dark: Optional[np.ndarray]) -> None:
+        self._update(dark=dark, flat=self._flat)
+
+    def set_flat(self, flat: Optional[np.ndarray]) -> None:
+        self._update(dark=self._dark, flat=flat)
+
+    def clear(self) -> None:
+        self._update(dark=None, flat=None)
+
+    def apply(self, counts: np.ndarray) -> np.ndarray:
+        """(counts - dark) * gain, in place on a float array."""
+        if not self.enabled:
+            return counts
+        dark, gain = self._dark, self._gain
+        if dark is not None and dark.shape == counts.shape:
+            np.subtract(counts, dark, out=counts)
+        if gain is not None and gain.shape == counts.shape:
+            np.multiply(counts, gain, out=counts)
+        return counts
+
+    def _update(self, *, dark: Optional[np.ndarray], flat: Optional[np.ndarray]) -> None:
+        with self._lock:
+            if self._key is None:
+                raise RuntimeError("Meta data has to be initialized.")
+            self._cache[self._key] = (dark, flat)
+            self._set(dark, flat)
+            key = self._key
+        if self._store is not None:
+            try:
+                self._store.save(key, dark, flat)
+            except OSError as e:
+                log.warning("could not store calibration %s: %s", key, e)
+                self._save_error = str(e)
+            else:
+                self._save_error = None
+
+    def _set(self, dark: Optional[np.ndarray], flat: Optional[np.ndarray]) -> None:
+        self._dark = None if dark is None else np.asarray(dark, dtype=float)
+        self._flat = None if flat is None else np.asarray(flat, dtype=float)
+        self._gain = None if self._flat is None else flat_gain(self._flat, self._dark)
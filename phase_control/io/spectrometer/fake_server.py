@@ -0,0 +1,318 @@
+# phase_control/io/spectrometer/fake_server.py
+"""
+Stand-in for spm_002.spectrometer_server (no hardware, any OS).
+
+Speaks the same JSON-lines protocol on stdin/stdout:
+
+  -> META  at start and after every ROI change (device_index, num_pixels, wavelengths, regions, binning)
+  -> FRAME at --rate Hz (timestamp, device_index, counts, seq, skipped)
+  <- CMD   SET_CONFIG (stored, acknowledged; 'roi' applied, see roi.py) / SHUTDOWN (acknowledged, exit)
+  <- CMD   credit (flow control, see flow_control.py)
+
+Frames are synthetic spectral interference: a Gaussian spectrum times
+(1 + V cos(2 pi tau (nu - nu0) + phi(t))) with a slowly drifting phase,
+plus shot-like noise. Select it instead of the real server with
+
+    ctx.config["spectrometer_argv"] = fake_spectrometer_argv(rate_hz=500)
+
+or run it directly to look at the stream:
+
+    python -m phase_control.io.spectrometer.fake_server --pixels 2048 --rate 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, TextIO
+
+import numpy as np
+
+from phase_control.io.spectrometer.flow_control import CMD_CREDIT
+from phase_control.io.spectrometer.roi import crop_bin, pixel_regions
+from spm_002.enums import CmdName, MsgType
+
+SPEED_OF_LIGHT_NM_PER_FS = 299.792458
+
+# correlation of CMD replies: the request's "id" is echoed back
+REPLY_TYPE = "reply"
+
+
+@dataclass
+class FakeSpectrometerOptions:
+    num_pixels: int = 2048
+    rate_hz: float = 100.0          # 0 = as fast as possible
+    device_index: int = 0
+    wl_min_nm: float = 760.0
+    wl_max_nm: float = 840.0
+    center_nm: float = 800.0
+    bandwidth_nm: float = 20.0      # 1/e half width
+    delay_fs: float = 300.0         # inter-pulse delay -> fringe spacing
+    visibility: float = 0.8
+    amplitude: float = 30_000.0      # peak ~ background + 1.8 * amplitude, below full scale
+    background: float = 800.0
+    noise: float = 1.0              # scale of sqrt(counts) noise
+    phase_drift_rad_s: float = 0.2
+    frames: int = 0                 # 0 = unlimited
+    seed: Optional[int] = None
+
+
+def fake_spectrometer_argv(**options: Any) -> list[str]:
+    """
+    Endpoint argv that runs this module with the current interpreter.
+    Keyword arguments are FakeSpectrometerOptions fields.
+    """
+    argv = [sys.executable, "-u", "-m", "phase_control.io.spectrometer.fake_server"]
+    for key, value in options.items():
+        if value is None:
+            continue
+        argv += ["--" + key.replace("_", "-"), str(value)]
+    return argv
+
+
+class SpectrumSynthesizer:
+    """Precomputes the static parts so a frame costs a few vector ops."""
+
+    def __init__(self, opts: FakeSpectrometerOptions) -> None:
+        self._opts = opts
+        self._rng = np.random.default_rng(opts.seed)
+
+        self.wavelengths = np.linspace(opts.wl_min_nm, opts.wl_max_nm, opts.num_pixels)
+        nu = SPEED_OF_LIGHT_NM_PER_FS / self.wavelengths               # PHz
+        nu0 = SPEED_OF_LIGHT_NM_PER_FS / opts.center_nm
+        sigma = nu0 * opts.bandwidth_nm / opts.center_nm
+
+        self._envelope = opts.amplitude * np.exp(-(((nu - nu0) / sigma) ** 2))
+        self._carrier = 2.0 * math.pi * opts.delay_fs * (nu - nu0)
+
+    def frame(self, t: float) -> np.ndarray:
+        o = self._opts
+        phi = o.phase_drift_rad_s * t + 0.3 * math.sin(0.5 * t)
+        clean = o.background + self._envelope * (1.0 + o.visibility * np.cos(self._carrier + phi))
+        if o.noise > 0:
+            clean = clean + o.noise * np.sqrt(clean) * self._rng.standard_normal(clean.shape)
+        return np.clip(np.rint(clean), 0, 65_535).astype(np.int64)
+
+
+class FakeSpectrometerServer:
+    def __init__(self, opts: FakeSpectrometerOptions, out: TextIO = sys.stdout, inp: TextIO = sys.stdin) -> None:
+        self._opts = opts
+        self._out = out
+        self._inp = inp
+        self._synth = SpectrumSynthesizer(opts)
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.config: dict[str, Any] = {}
+
+        # flow control; push mode until the first credit command
+        self._credit = threading.Condition()
+        self._window: Optional[int] = None
+        self._ack = 0
+        self._seq = 0
+        self._pending: Optional[tuple[str, np.ndarray]] = None
+        self._skipped = 0
+
+        # ROI: detector pixel spans sent, None = full detector
+        self._regions: Optional[list[tuple[int, int]]] = None
+        self._binning = 1
+
+    def run(self) -> int:
+        reader = threading.Thread(target=self._read_commands, name="fake_server.stdin", daemon=True)
+        reader.start()
+
+        o = self._opts
+        with self._credit:
+            self._send_meta()
+
+        period = 1.0 / o.rate_hz if o.rate_hz > 0 else 0.0
+        t0 = time.perf_counter()
+        next_due = t0
+        acquired = 0
+        try:
+            while not self._stop.is_set() and (o.frames <= 0 or acquired < o.frames):
+                if not period:
+                    # free running: acquire only when the frame can go out
+                    with self._credit:
+                        while not self._has_credit() and not self._stop.is_set():
+                            self._credit.wait(0.1)
+                    if self._stop.is_set():
+                        break
+
+                now = time.perf_counter()
+                self._offer(repr(time.time()), self._synth.frame(now - t0))
+                acquired += 1
+
+                if period:
+                    next_due += period
+                    if next_due - time.perf_counter() < -period:
+                        next_due = time.perf_counter()  # fell behind: don't burst to catch up
+                    self._wait_until(next_due)
+        except (BrokenPipeError, ValueError):
+            # parent closed the pipe
+            return 0
+        return 0
+
+    # ------------------------------------------------------------------ #
+    # Flow control
+    # ------------------------------------------------------------------ #
+
+    def _has_credit(self) -> bool:
+        return self._window is None or self._seq + 1 - self._ack <= self._window
+
+    def _offer(self, timestamp: str, counts: np.ndarray) -> None:
+        """Send the frame if there is credit, else keep it as the newest pending one."""
+        with self._credit:
+            if self._pending is not None:
+                self._skipped += 1   # merged away by a newer frame
+            self._pending = (timestamp, counts)
+        self._flush()
+
+    def _flush(self) -> None:
+        with self._credit:
+            if self._pending is None or not self._has_credit():
+                return
+            (timestamp, counts), self._pending = self._pending, None
+            if self._regions is not None:
+                counts = crop_bin(counts, self._regions, self._binning)
+            self._seq += 1
+            # sent under the credit lock so seq and ROI order match pipe order
+            self._send({
+                "type": _wire(MsgType.FRAME),
+                "timestamp": timestamp,
+                "device_index": self._opts.device_index,
+                "counts": counts.tolist(),
+                "seq": self._seq,
+                "skipped": self._skipped,
+            })
+            self._skipped = 0
+
+    # ------------------------------------------------------------------ #
+    # ROI
+    # ------------------------------------------------------------------ #
+
+    def _apply_roi(self, roi: Optional[dict[str, Any]]) -> None:
+        wl = self._synth.wavelengths
+        if roi:
+            binning = max(1, int(roi.get("binning", 1)))
+            # nothing of the requested range on the detector: send all of it
+            regions = pixel_regions(wl, roi.get("regions_nm") or [], binning) or pixel_regions(wl, [], binning)
+        else:
+            binning, regions = 1, None
+        with self._credit:
+            if regions == self._regions and binning == self._binning:
+                return
+            self._regions, self._binning = regions, binning
+            self._send_meta()
+
+    def _send_meta(self) -> None:
+        """Caller holds the credit lock (frames after this use the new layout)."""
+        wl = self._synth.wavelengths
+        if self._regions is not None:
+            wl = crop_bin(wl, self._regions, self._binning, reduce="mean")
+        self._send({
+            "type": _wire(MsgType.META),
+            "device_index": self._opts.device_index,
+            "num_pixels": int(wl.size),
+            "wavelengths": wl.tolist(),
+            "regions": [list(r) for r in self._regions] if self._regions is not None else None,
+            "binning": self._binning,
+        })
+
+    def _wait_until(self, deadline: float) -> None:
+        """Sleep until the next acquisition; a pending frame goes out as soon as credit arrives."""
+        while not self._stop.is_set():
+            delay = deadline - time.perf_counter()
+            if delay <= 0:
+                return
+            with self._credit:
+                if self._pending is None or not self._has_credit():
+                    self._credit.wait(delay)
+            self._flush()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _send(self, msg: dict[str, Any]) -> None:
+        line = json.dumps(msg, separators=(",", ":"))
+        with self._write_lock:
+            self._out.write(line + "\n")
+            self._out.flush()
+
+    def _read_commands(self) -> None:
+        for line in self._inp:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            if msg.get("type") != _wire(MsgType.CMD):
+                continue
+            self._on_command(msg)
+            if self._stop.is_set():
+                return
+        # stdin closed: the parent is gone
+        self._stop.set()
+
+    def _on_command(self, msg: dict[str, Any]) -> None:
+        name = msg.get("name")
+        reply: dict[str, Any] = {"type": REPLY_TYPE, "id": msg.get("id"), "name": name, "ok": True}
+
+        shutdown = name == _wire(CmdName.SHUTDOWN)
+        if name == _wire(CmdName.SET_CONFIG):
+            self.config = dict(msg.get("args") or {})
+            self._apply_roi(self.config.get("roi"))
+        elif name == CMD_CREDIT:
+            args = msg.get("args") or {}
+            with self._credit:
+                self._window = max(1, int(args.get("window", 1)))
+                self._ack = max(self._ack, int(args.get("ack", 0)))
+                self._credit.notify_all()
+        elif not shutdown:
+            reply["ok"] = False
+            reply["error"] = f"unknown command {name!r}"
+
+        try:
+            self._send(reply)
+        except (BrokenPipeError, ValueError):
+            shutdown = True
+        if shutdown:
+            self._stop.set()
+
+
+def _wire(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = FakeSpectrometerOptions()
+    parser = argparse.ArgumentParser(description="Synthetic spm_002 spectrometer server.")
+    parser.add_argument("--num-pixels", "--pixels", type=int, default=defaults.num_pixels)
+    parser.add_argument("--rate-hz", "--rate", type=float, default=defaults.rate_hz, help="frames/s, 0 = unlimited")
+    parser.add_argument("--device-index", type=int, default=defaults.device_index)
+    parser.add_argument("--wl-min-nm", type=float, default=defaults.wl_min_nm)
+    parser.add_argument("--wl-max-nm", type=float, default=defaults.wl_max_nm)
+    parser.add_argument("--center-nm", type=float, default=defaults.center_nm)
+    parser.add_argument("--bandwidth-nm", type=float, default=defaults.bandwidth_nm)
+    parser.add_argument("--delay-fs", type=float, default=defaults.delay_fs)
+    parser.add_argument("--visibility", type=float, default=defaults.visibility)
+    parser.add_argument("--amplitude", type=float, default=defaults.amplitude)
+    parser.add_argument("--background", type=float, default=defaults.background)
+    parser.add_argument("--noise", type=float, default=defaults.noise)
+    parser.add_argument("--phase-drift-rad-s", type=float, default=defaults.phase_drift_rad_s)
+    parser.add_argument("--frames", type=int, default=defaults.frames, help="stop after N frames, 0 = unlimited")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    opts = FakeSpectrometerOptions(**vars(args))
+    return FakeSpectrometerServer(opts).run()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
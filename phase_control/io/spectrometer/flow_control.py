@@ -0,0 +1,121 @@
+# phase_control/io/spectrometer/flow_control.py
+"""
+Credit-based flow control between SpectrometerService and the acquisition
+process.
+
+Without it the server pushes every frame it acquires and the pipe plus the
+JSON parse thread absorb whatever the app does not keep up with. With it the
+app grants a window of in-flight frames:
+
+  <- CMD   credit {"window": N, "ack": seq}
+  -> FRAME {..., "seq": s, "skipped": k}
+
+The server may send frame s only while s - ack <= window. When it runs out
+of credit it keeps acquiring but holds only the newest frame (the older ones
+are merged away and reported as 'skipped' on the next frame), or, when free
+running, stops acquiring until credit arrives. 'ack' is cumulative (the last
+seq the app has consumed), so a lost or superseded credit message is
+harmless. Servers that do not know the command reject it and keep pushing.
+
+"Consumed" means parsed and stored in the FrameBuffer, not analysed: the
+window bounds what sits in the pipe and the parse thread. The buffer only
+keeps the latest frame and the engines drop what they cannot keep up with
+(their gates may skip a frame without reading it), so acknowledging on
+read would stall the stream whenever no consumer takes the newest frame.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+# wire name of the credit command (not part of spm_002.enums.CmdName)
+CMD_CREDIT = "credit"
+
+
+@dataclass
+class FlowControlConfig:
+    enabled: bool = True
+    window: int = 4            # frames in flight (sent, not yet consumed)
+    ack_every: int = 0         # consumed frames per credit message, 0 = window // 2
+
+    @property
+    def ack_interval(self) -> int:
+        if self.ack_every > 0:
+            return min(self.ack_every, self.window)
+        return max(1, self.window // 2)
+
+
+@dataclass(frozen=True)
+class FlowControlStats:
+    active: bool               # server accepted the credit protocol
+    window: int
+    received: int
+    skipped: int               # frames the server merged away for lack of credit
+    acks_sent: int
+    last_seq: int
+    disabled_reason: Optional[str] = None   # why the server refused credits, if it did
+
+
+class CreditWindow:
+    """
+    Client-side bookkeeping: remembers the last consumed seq and decides
+    when a new credit message is due. Called from the parse thread.
+    """
+
+    def __init__(self, config: Optional[FlowControlConfig] = None) -> None:
+        self.config = config if config is not None else FlowControlConfig()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.active = False
+            self._disabled_reason: Optional[str] = None
+            self._last_seq = 0
+            self._acked = 0
+            self._received = 0
+            self._skipped = 0
+            self._acks_sent = 0
+
+    def grant(self) -> dict:
+        """Credit message args acknowledging everything consumed so far."""
+        with self._lock:
+            self.active = True
+            self._acked = self._last_seq
+            self._acks_sent += 1
+            return {"window": max(1, int(self.config.window)), "ack": self._acked}
+
+    def consumed(self, seq: Optional[int], skipped: int = 0) -> bool:
+        """
+        Record one consumed frame. True if a credit message is due.
+        Frames without 'seq' come from a server that does not do credits.
+        """
+        with self._lock:
+            self._received += 1
+            self._skipped += int(skipped or 0)
+            if seq is None:
+                return False
+            self._last_seq = max(self._last_seq, int(seq))
+            return self.active and self._last_seq - self._acked >= self.config.ack_interval
+
+    def reject(self, reason: str) -> bool:
+        """The server refused the credit command: it keeps pushing. True if it was active."""
+        with self._lock:
+            was_active = self.active
+            self.active = False
+            self._disabled_reason = reason
+            return was_active
+
+    @property
+    def stats(self) -> FlowControlStats:
+        with self._lock:
+            return FlowControlStats(
+                active=self.active,
+                window=int(self.config.window),
+                received=self._received,
+                skipped=self._skipped,
+                acks_sent=self._acks_sent,
+                last_seq=self._last_seq,
+                disabled_reason=self._disabled_reason,
+            )
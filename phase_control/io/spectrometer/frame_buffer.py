@@ -1,32 +1,57 @@
 # phase_control/io/frame_buffer.py
 from __future__ import annotations
 
+from concurrent.futures import Future
 from typing import Optional
 
+import numpy as np
+
 from phase_control.core.models import Spectrum
 from base_core.framework.concurrency.buffer import Buffer
+from phase_control.io.spectrometer.correction import FrameCorrection
 from phase_control.io.spectrometer.interfaces import IFrameBuffer
+from phase_control.io.spectrometer.quality import FrameQuality, FrameVerdict
+from phase_control.io.readiness import new_ready_future, set_ready
 from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
 
 
 class FrameBuffer(IFrameBuffer, Buffer[StreamFrame]):
     _meta: Optional[StreamMeta] = None
 
+    def __init__(self, correction: Optional[FrameCorrection] = None, quality: Optional[FrameQuality] = None) -> None:
+        super().__init__()
+        self._ready: Future[None] = new_ready_future()
+        self._correction = correction
+        self._quality = quality
+
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
 
+    @property
+    def ready(self) -> Future[None]:
+        return self._ready
+
+    @property
+    def meta(self) -> Optional[StreamMeta]:
+        return self._meta
+
     def set_meta_data(self,  meta: StreamMeta):
         self._meta = meta
+        set_ready(self._ready)
         
     def get_latest(self) -> Spectrum | None:
-        
+        spec, _ = self.get_latest_checked()
+        return spec
+
+    def get_latest_checked(self) -> tuple[Spectrum | None, FrameVerdict | None]:
+        """Latest spectrum plus its quality verdict (None without a quality stage)."""
         if self._meta is None:
             raise RuntimeError("Meta data has to be initialized.")
         
         frame = self.get()
         if  frame is None:
-            return None
+            return None, None
 
         return self._to_spectrum(frame)
 
@@ -34,12 +59,26 @@ class FrameBuffer(IFrameBuffer, Buffer[StreamFrame]):
     # Internals
     # ------------------------------------------------------------------ #
 
-    def _to_spectrum(self, frame: StreamFrame) -> Spectrum:
+    def _to_spectrum(self, frame: StreamFrame) -> tuple[Spectrum | None, FrameVerdict | None]:
         """
         Convert a StreamFrame into a Spectrum instance using the meta
-        information (wavelength axis).
+        information (wavelength axis): hot pixels repaired and quality
+        checked on the raw counts, then dark/flat corrected.
         """
-        if self._meta.wavelengths is None:
+        meta = self._meta
+        if meta.wavelengths is None:
             raise ValueError("Wavelengths not available in stream meta data.")
+        if len(frame.counts) != len(meta.wavelengths):
+            # frame from before a meta (ROI) change
+            return None, None
+
+        if self._correction is None and self._quality is None:
+            return Spectrum.from_raw_data(meta.wavelengths, frame.counts), None
 
-        return Spectrum.from_raw_data(self._meta.wavelengths, frame.counts)
+        # always a copy: repairs and corrections below are in place, and the
+        # frame may be shared with replay/archive sinks and other consumers
+        counts = np.array(frame.counts, dtype=float)
+        verdict = self._quality.inspect(frame, counts, meta) if self._quality is not None else None
+        if self._correction is not None:
+            counts = self._correction.apply(counts)
+        return Spectrum.from_raw_data(meta.wavelengths, counts), verdict
@@ -1,10 +1,13 @@
 # phase_control/io/interfaces.py
 from __future__ import annotations
 
-from typing import Any, Protocol
+from concurrent.futures import Future
+from typing import Any, Optional, Protocol
 
+from base_core.math.models import Range
+from base_core.quantities.models import Length
 from phase_control.core.models import Spectrum
-from phase_control.io.spectrometer.models import StreamMeta
+from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
 
 
 class IFrameBuffer(Protocol):
@@ -16,6 +19,44 @@ class IFrameBuffer(Protocol):
     and let each module interpret it.
     """
     
+    @property
+    def ready(self) -> Future[None]:
+        """Completes once meta data (wavelength axis) is available."""
+        ...
+
+    @property
+    def meta(self) -> Optional[StreamMeta]:
+        """Meta data the current spectra are built from (None before the first META)."""
+        ...
+
     def set_meta_data(self,  meta: StreamMeta): ...
 
+    def set(self, frame: StreamFrame) -> None: ...
+
     def get_latest(self) -> Spectrum: ...
+
+    def get_latest_checked(self) -> tuple[Spectrum | None, Any]:
+        """Latest spectrum plus its FrameVerdict (None if no quality stage is configured)."""
+        ...
+
+
+class IFrameSink(Protocol):
+    """
+    Receives every raw frame (recorders, archives). append() is called on
+    the acquisition thread and must not block.
+    """
+
+    def append(self, seq: int, frame: StreamFrame) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+class IRoiRegistry(Protocol):
+    """
+    Wavelength ranges consumers need; the acquisition process only sends
+    their union (see roi.py). Setting an unchanged range is cheap.
+    """
+
+    def set_roi(self, owner: str, range_wl: Range[Length]) -> None: ...
+
+    def clear_roi(self, owner: str) -> None: ...
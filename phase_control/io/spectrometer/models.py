@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 @dataclass(slots=True)
@@ -10,12 +10,14 @@ class StreamMeta:
     """
     Static information about the spectrometer stream.
 
-    This is sent once as the initial 'meta' JSON object by the
-    32-bit acquisition process.
+    This is sent as the initial 'meta' JSON object by the 32-bit
+    acquisition process, and again whenever the ROI changes (see roi.py).
     """
     device_index: int
     num_pixels: int
     wavelengths: Optional[List[float]]  # may be None if not available
+    regions: Optional[List[Tuple[int, int]]] = None  # detector pixel spans sent, None = full detector
+    binning: int = 1
 
 
 @dataclass(slots=True)
@@ -0,0 +1,223 @@
+# phase_control/io/spectrometer/quality.py
+"""
+Pre-fit frame quality: hot-pixel repair, saturation and spike detection on
+the raw counts, before any correction or fitting.
+
+  - hot pixels: persistent detector indices (learned from a dark reference),
+    replaced by the mean of their neighbours in every frame
+  - saturation: pixels at >= saturation_level of the detector full scale
+    (times 'binning' for binned frames)
+  - spikes (cosmic rays): pixels whose change against the previous frame
+    exceeds the change of both neighbours by spike_sigma times the shot
+    noise. Fringes that drift between frames change smoothly from pixel to
+    pixel; a one-pixel hit does not.
+
+Everything is a handful of vector operations (a few microseconds per frame),
+so engines can drop bad frames before they reach the fit.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOT_PIXEL_PATH = Path.home() / ".phase_control" / "hot_pixels.json"
+DEFAULT_FULL_SCALE = 65_535
+
+
+@dataclass
+class QualityConfig:
+    enabled: bool = True
+    full_scale: int = DEFAULT_FULL_SCALE
+    saturation_level: float = 0.98     # fraction of full scale counted as saturated
+    max_saturated: int = 0             # saturated pixels tolerated per frame
+    spike_sigma: float = 8.0           # in units of the expected shot noise
+    max_spikes: int = 0                # spike pixels tolerated per frame
+    counts_per_electron: float = 1.0   # detector gain, scales the shot noise
+    read_noise: float = 10.0           # counts (rms), noise floor for dark pixels
+    hot_sigma: float = 8.0             # robust z-score of a dark pixel to count as hot
+
+
+@dataclass(frozen=True)
+class FrameVerdict:
+    saturated: int
+    spikes: int
+    ok: bool
+
+
+class HotPixelMask:
+    """
+    Hot detector pixels per device, persisted as JSON. Indices are detector
+    pixels; frame_indices() maps them onto the (ROI/binned) frame layout.
+    """
+
+    def __init__(self, path: Optional[Path] = DEFAULT_HOT_PIXEL_PATH) -> None:
+        self._path = None if path is None else Path(path)
+        self._pixels: dict[int, np.ndarray] = {}
+        self._cache: tuple[Optional[StreamMeta], np.ndarray] = (None, np.empty(0, dtype=np.intp))
+        self._save_error: Optional[str] = None
+        self._load()
+
+    @property
+    def save_error(self) -> Optional[str]:
+        """Why the last change could not be stored (None once a save succeeds)."""
+        return self._save_error
+
+    def pixels(self, device_index: int) -> np.ndarray:
+        return self._pixels.get(device_index, np.empty(0, dtype=np.intp))
+
+    def set_pixels(self, device_index: int, pixels: np.ndarray) -> None:
+        self._pixels[device_index] = np.unique(np.asarray(pixels, dtype=np.intp))
+        self._cache = (None, self._cache[1])
+        self._save()
+
+    def learn_from_dark(self, dark: np.ndarray, meta: StreamMeta, sigma: float) -> int:
+        """Add pixels whose dark level is an outlier; returns the number of hot pixels found."""
+        dark = np.asarray(dark, dtype=float)
+        med = float(np.median(dark))
+        mad = float(np.median(np.abs(dark - med))) * 1.4826
+        if mad <= 0:
+            return 0
+        hot = np.flatnonzero(dark - med > sigma * mad)
+        detector = _frame_to_detector(hot, meta)
+        self.set_pixels(meta.device_index, np.concatenate([self.pixels(meta.device_index), detector]))
+        return int(hot.size)
+
+    def frame_indices(self, meta: StreamMeta) -> np.ndarray:
+        cached_meta, idx = self._cache
+        if cached_meta is meta:
+            return idx
+        idx = _detector_to_frame(self.pixels(meta.device_index), meta)
+        self._cache = (meta, idx)
+        return idx
+
+    def _load(self) -> None:
+        if self._path is None:
+            return
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+            self._pixels = {int(k): np.asarray(v, dtype=np.intp) for k, v in raw.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            self._pixels = {}
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+            tmp.write_text(json.dumps({str(k): v.tolist() for k, v in self._pixels.items()}), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError as e:
+            log.warning("could not store hot pixel mask %s: %s", self._path, e)
+            self._save_error = str(e)
+        else:
+            self._save_error = None
+
+
+class FrameQuality:
+    """
+    Inspects each StreamFrame once (the verdict is cached for the consumers
+    that look at the same frame) and repairs hot pixels in the caller's copy.
+    """
+
+    def __init__(self, config: Optional[QualityConfig] = None, mask: Optional[HotPixelMask] = None) -> None:
+        self.config = config if config is not None else QualityConfig()
+        self.mask = mask if mask is not None else HotPixelMask(None)
+        self._lock = threading.Lock()
+        self._frame: Optional[StreamFrame] = None
+        self._verdict: Optional[FrameVerdict] = None
+        self._previous: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._frame = None
+            self._verdict = None
+            self._previous = None
+
+    def learn_hot_pixels(self, dark: np.ndarray, meta: StreamMeta) -> int:
+        return self.mask.learn_from_dark(dark, meta, self.config.hot_sigma)
+
+    def repair(self, counts: np.ndarray, meta: StreamMeta) -> np.ndarray:
+        """Replace hot pixels by the mean of their neighbours, in place on a float array."""
+        hot = self.mask.frame_indices(meta)
+        if hot.size:
+            left = counts[np.maximum(hot - 1, 0)]
+            right = counts[np.minimum(hot + 1, counts.size - 1)]
+            counts[hot] = 0.5 * (left + right)
+        return counts
+
+    def inspect(self, frame: StreamFrame, counts: np.ndarray, meta: StreamMeta) -> FrameVerdict:
+        """'counts' is the float copy of frame.counts; hot pixels are repaired in place."""
+        cfg = self.config
+        self.repair(counts, meta)
+
+        with self._lock:
+            if frame is self._frame and self._verdict is not None:
+                return self._verdict
+            if not cfg.enabled:
+                verdict = FrameVerdict(0, 0, True)
+            else:
+                full = cfg.saturation_level * cfg.full_scale * max(1, meta.binning)
+                saturated = int(np.count_nonzero(counts >= full))
+                spikes = self._count_spikes(counts)
+                ok = saturated <= cfg.max_saturated and spikes <= cfg.max_spikes
+                verdict = FrameVerdict(saturated, spikes, ok)
+            self._frame = frame
+            self._verdict = verdict
+            return verdict
+
+    def _count_spikes(self, counts: np.ndarray) -> int:
+        prev, self._previous = self._previous, counts.copy()
+        if prev is None or prev.shape != counts.shape or counts.size < 3:
+            return 0
+        cfg = self.config
+        diff = counts - prev
+        # a hit raises one pixel above both neighbours; drifting fringes move
+        # them together, and a hit in the previous frame only lowers the pixel
+        excess = diff[1:-1] - np.maximum(diff[:-2], diff[2:])
+        # shot noise of 'excess' ~ 2 * (var(now) + var(prev)) for Poisson counts
+        var = 2.0 * cfg.counts_per_electron * (np.abs(counts[1:-1]) + np.abs(prev[1:-1])) + cfg.read_noise ** 2
+        return int(np.count_nonzero((excess > 0) & (excess * excess > (cfg.spike_sigma ** 2) * var)))
+
+
+def _detector_to_frame(pixels: np.ndarray, meta: StreamMeta) -> np.ndarray:
+    if pixels.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if not meta.regions:
+        b = max(1, meta.binning)
+        idx = pixels // b
+        return np.unique(idx[idx < meta.num_pixels])
+    b = max(1, meta.binning)
+    out = []
+    offset = 0
+    for start, stop in meta.regions:
+        inside = pixels[(pixels >= start) & (pixels < stop)]
+        out.append(offset + (inside - start) // b)
+        offset += (stop - start) // b
+    return np.unique(np.concatenate(out)).astype(np.intp)
+
+
+def _frame_to_detector(indices: np.ndarray, meta: StreamMeta) -> np.ndarray:
+    """Every detector pixel of the given frame bins."""
+    b = max(1, meta.binning)
+    regions = meta.regions or [(0, meta.num_pixels * b)]
+    starts = []
+    offset = 0
+    for start, stop in regions:
+        n = (stop - start) // b
+        sel = indices[(indices >= offset) & (indices < offset + n)]
+        starts.append(start + (sel - offset) * b)
+        offset += n
+    first = np.concatenate(starts) if starts else np.empty(0, dtype=np.intp)
+    return (first[:, None] + np.arange(b)[None, :]).ravel().astype(np.intp)
@@ -0,0 +1,233 @@
+# phase_control/io/spectrometer/recorder.py
+"""
+Append-only raw frame recorder.
+
+A recording '<stem>' consists of three files:
+
+  <stem>.frames   counts, fixed stride (num_pixels * itemsize), preallocated
+  <stem>.index    one INDEX_DTYPE record per frame (seq, device/receive time)
+  <stem>.json     header: dtype, num_pixels, capacity, count, wavelengths
+
+Both binary files are plain arrays, so open_recording() maps them with
+np.memmap for instant random access (also while a run is in progress).
+"""
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
+
+INDEX_DTYPE = np.dtype([("seq", "<u8"), ("timestamp", "<f8"), ("received", "<f8")])
+
+DEFAULT_CAPACITY = 10_000      # frames preallocated (file grows by this much when full)
+DEFAULT_QUEUE_SIZE = 1_024     # frames buffered between acquisition and disk
+FLUSH_EVERY = 256              # frames between header/memmap flushes
+
+
+def parse_timestamp(ts: Any) -> float:
+    """
+    StreamFrame.timestamp arrives as a string (epoch seconds or ISO 8601).
+    """
+    try:
+        return float(ts)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(ts)).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+def _paths(stem: Path) -> tuple[Path, Path, Path]:
+    stem = str(stem)
+    return Path(stem + ".frames"), Path(stem + ".index"), Path(stem + ".json")
+
+
+class FrameRecorder:
+    """
+    Writes frames to a memory-mapped, fixed-stride file on a dedicated thread.
+
+    append() never blocks: frames go into a bounded queue and are counted
+    as dropped if the writer falls behind (disk stall).
+    """
+
+    def __init__(
+        self,
+        stem: Path,
+        meta: StreamMeta,
+        *,
+        dtype: np.dtype | str = np.int32,
+        capacity: int = DEFAULT_CAPACITY,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self._frames_path, self._index_path, self._header_path = _paths(stem)
+        self._frames_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._meta = meta
+        self._dtype = np.dtype(dtype)
+        self._num_pixels = int(meta.num_pixels)
+        self._grow_by = max(1, int(capacity))
+        self._capacity = 0
+        self._count = 0
+        self._dropped = 0
+
+        self._frames: Optional[np.memmap] = None
+        self._index: Optional[np.memmap] = None
+        self._grow(self._grow_by)
+
+        self._queue: queue.Queue[Optional[tuple[int, StreamFrame, float]]] = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="io.recorder", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def append(self, seq: int, frame: StreamFrame) -> bool:
+        """
+        Queue one frame for writing. Returns False if it had to be dropped.
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((seq, frame, time.time()))
+            return True
+        except queue.Full:
+            self._dropped += 1
+            return False
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ------------------------------------------------------------------ #
+    # Writer thread
+    # ------------------------------------------------------------------ #
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                self._write(*item)
+                if self._count % FLUSH_EVERY == 0:
+                    self._flush()
+        finally:
+            self._flush()
+            self._frames = None
+            self._index = None
+
+    def _write(self, seq: int, frame: StreamFrame, received: float) -> None:
+        counts = np.asarray(frame.counts, dtype=self._dtype)
+        if counts.shape != (self._num_pixels,):
+            self._dropped += 1
+            return
+
+        if self._count >= self._capacity:
+            self._flush()
+            self._grow(self._capacity + self._grow_by)
+
+        i = self._count
+        self._frames[i] = counts
+        self._index[i] = (seq, parse_timestamp(frame.timestamp), received)
+        self._count = i + 1
+
+    def _grow(self, capacity: int) -> None:
+        """
+        (Re)allocate both files to 'capacity' frames and remap them.
+        """
+        self._frames = None
+        self._index = None
+        for path, stride in (
+            (self._frames_path, self._num_pixels * self._dtype.itemsize),
+            (self._index_path, INDEX_DTYPE.itemsize),
+        ):
+            with open(path, "ab") as f:
+                f.truncate(capacity * stride)
+
+        self._frames = np.memmap(self._frames_path, dtype=self._dtype, mode="r+", shape=(capacity, self._num_pixels))
+        self._index = np.memmap(self._index_path, dtype=INDEX_DTYPE, mode="r+", shape=(capacity,))
+        self._capacity = capacity
+        self._write_header()
+
+    def _flush(self) -> None:
+        if self._frames is not None:
+            self._frames.flush()
+        if self._index is not None:
+            self._index.flush()
+        self._write_header()
+
+    def _write_header(self) -> None:
+        header = {
+            "dtype": self._dtype.str,
+            "num_pixels": self._num_pixels,
+            "capacity": self._capacity,
+            "count": self._count,
+            "dropped": self._dropped,
+            "device_index": self._meta.device_index,
+            "wavelengths": self._meta.wavelengths,
+            "regions": self._meta.regions,
+            "binning": self._meta.binning,
+        }
+        tmp = Path(str(self._header_path) + ".tmp")
+        tmp.write_text(json.dumps(header), encoding="utf-8")
+        tmp.replace(self._header_path)
+
+
+@dataclass
+class Recording:
+    meta: StreamMeta
+    frames: np.ndarray       # (count, num_pixels) memmap
+    index: np.ndarray        # (count,) INDEX_DTYPE memmap
+
+    def __len__(self) -> int:
+        return int(self.frames.shape[0])
+
+
+def open_recording(stem: Path) -> Recording:
+    """
+    Map a recording read-only. Only the first 'count' frames (as of the
+    last header flush) are exposed.
+    """
+    frames_path, index_path, header_path = _paths(stem)
+    header = json.loads(header_path.read_text(encoding="utf-8"))
+
+    dtype = np.dtype(header["dtype"])
+    num_pixels = int(header["num_pixels"])
+    count = int(header["count"])
+
+    meta = StreamMeta(
+        device_index=int(header["device_index"]),
+        num_pixels=num_pixels,
+        wavelengths=header.get("wavelengths"),
+        regions=[tuple(r) for r in header["regions"]] if header.get("regions") else None,
+        binning=int(header.get("binning", 1)),
+    )
+    if count == 0:
+        return Recording(meta, np.empty((0, num_pixels), dtype=dtype), np.empty((0,), dtype=INDEX_DTYPE))
+
+    frames = np.memmap(frames_path, dtype=dtype, mode="r", shape=(count, num_pixels))
+    index = np.memmap(index_path, dtype=INDEX_DTYPE, mode="r", shape=(count,))
+    return Recording(meta, frames, index)
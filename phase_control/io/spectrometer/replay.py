@@ -0,0 +1,211 @@
+# phase_control/io/spectrometer/replay.py
+"""
+Replays a recorded run (FrameRecorder stem or compressed archive) into an
+IFrameBuffer and publishes TOPIC_NEW_SPECTRUM exactly like SpectrometerService,
+so engines run on real data without hardware.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from base_core.framework.events import EventBus
+from phase_control.io.archive import MAGIC, ArchiveReader
+from phase_control.io.events import TOPIC_NEW_SPECTRUM, NewSpectrumEventArgs
+from phase_control.io.readiness import new_ready_future, set_ready
+from phase_control.io.spectrometer.interfaces import IFrameBuffer
+from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
+from phase_control.io.spectrometer.recorder import open_recording
+
+
+class ReplayMode(str, Enum):
+    ORIGINAL = "original"      # keep the recorded inter-frame timing (scaled by 'speed')
+    FIXED_RATE = "fixed_rate"  # constant 'rate_hz'
+    MAX_SPEED = "max_speed"    # no pacing at all
+
+
+@dataclass(slots=True)
+class ReplayData:
+    meta: StreamMeta
+    timestamps: np.ndarray     # (n,) device time [s]
+    counts: np.ndarray         # (n, num_pixels)
+
+    def __len__(self) -> int:
+        return int(self.counts.shape[0])
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    published: int = 0
+    elapsed_s: float = 0.0
+    max_lag_s: float = 0.0     # worst delay behind the playback schedule
+
+    @property
+    def rate_hz(self) -> float:
+        return self.published / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def load_replay(path: Path, t_start: float = -np.inf, t_end: float = np.inf) -> ReplayData:
+    """
+    Load frames from a recording stem ('<stem>.json' exists) or an archive file.
+    """
+    path = Path(path)
+    if path.is_file():
+        with open(path, "rb") as f:
+            is_archive = f.read(len(MAGIC)) == MAGIC
+    else:
+        is_archive = False
+
+    if is_archive:
+        with ArchiveReader(path) as reader:
+            index, counts = reader.read_frames(t_start, t_end)
+            return ReplayData(reader.meta, np.asarray(index["timestamp"], dtype=float), counts)
+
+    rec = open_recording(path)
+    ts = np.asarray(rec.index["timestamp"], dtype=float)
+    sel = (ts >= t_start) & (ts <= t_end)
+    return ReplayData(rec.meta, ts[sel], np.asarray(rec.frames[sel]))
+
+
+class ReplaySpectrometer:
+    """
+    Stand-in for SpectrometerService that feeds recorded frames on its own thread.
+    """
+
+    def __init__(
+        self,
+        data: ReplayData,
+        buffer: IFrameBuffer,
+        bus: EventBus,
+        *,
+        mode: ReplayMode = ReplayMode.ORIGINAL,
+        rate_hz: float = 50.0,
+        speed: float = 1.0,
+        loop: bool = False,
+    ) -> None:
+        if len(data) == 0:
+            raise ValueError("Replay data contains no frames.")
+        if mode is ReplayMode.FIXED_RATE and rate_hz <= 0:
+            raise ValueError("rate_hz must be > 0.")
+        if speed <= 0:
+            raise ValueError("speed must be > 0.")
+
+        self._data = data
+        self._buffer = buffer
+        self._bus = bus
+        self._mode = mode
+        self._rate_hz = rate_hz
+        self._speed = speed
+        self._loop = loop
+
+        self._ready: Future[None] = new_ready_future()
+        self._stats = ReplayStats()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> Future[None]:
+        return self._ready
+
+    @property
+    def stats(self) -> ReplayStats:
+        return self._stats
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._stats = ReplayStats()
+        self._buffer.set_meta_data(self._data.meta)
+        set_ready(self._ready)
+        self._thread = threading.Thread(target=self._run, name="io.replay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until playback finished (never returns True with loop=True)."""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    # ------------------------------------------------------------------ #
+    # Playback thread
+    # ------------------------------------------------------------------ #
+
+    def _schedule(self) -> np.ndarray:
+        """Offset [s] of every frame from the start of one pass."""
+        n = len(self._data)
+        if self._mode is ReplayMode.FIXED_RATE:
+            return np.arange(n, dtype=float) / self._rate_hz
+        if self._mode is ReplayMode.MAX_SPEED:
+            return np.zeros(n, dtype=float)
+
+        ts = self._data.timestamps
+        offsets = np.nan_to_num(ts - ts[0], nan=0.0)
+        # tolerate clock jumps in the recording: never go back in time
+        return np.maximum.accumulate(np.clip(offsets, 0.0, None)) / self._speed
+
+    def _run(self) -> None:
+        data = self._data
+        device_index = data.meta.device_index
+        schedule = self._schedule()
+        period = float(schedule[-1]) + (1.0 / self._rate_hz if self._mode is ReplayMode.FIXED_RATE else 0.0)
+        pace = self._mode is not ReplayMode.MAX_SPEED
+
+        stats = self._stats
+        t0 = time.perf_counter()
+        seq = 0
+        try:
+            while not self._stop.is_set():
+                pass_start = t0 + (seq // len(data)) * period if pace else t0
+                for i in range(len(data)):
+                    if self._stop.is_set():
+                        return
+                    if pace:
+                        due = pass_start + schedule[i]
+                        delay = due - time.perf_counter()
+                        if delay > 0:
+                            if self._stop.wait(delay):
+                                return
+                        else:
+                            stats.max_lag_s = max(stats.max_lag_s, -delay)
+
+                    frame = StreamFrame(
+                        timestamp=repr(float(data.timestamps[i])),
+                        device_index=device_index,
+                        counts=data.counts[i],
+                    )
+                    self._buffer.set(frame)
+                    self._bus.publish(
+                        TOPIC_NEW_SPECTRUM,
+                        NewSpectrumEventArgs(timestamp=frame.timestamp, device_index=device_index),
+                    )
+                    seq += 1
+                    stats.published = seq
+                    stats.elapsed_s = time.perf_counter() - t0
+
+                if not self._loop:
+                    return
+        except Exception:
+            import traceback
+            traceback.print_exc()
+        finally:
+            stats.elapsed_s = time.perf_counter() - t0
@@ -0,0 +1,184 @@
+# phase_control/io/spectrometer/roi.py
+"""
+Regions of interest pushed down to the acquisition process.
+
+Consumers (engines, plots) register the wavelength range they actually use;
+SpectrometerService sends the union with SET_CONFIG
+
+  <- CMD  SET_CONFIG {..., "roi": {"regions_nm": [[lo, hi], ...], "binning": n}}
+  -> META {..., "num_pixels": m, "wavelengths": [...], "regions": [[start, stop], ...], "binning": n}
+
+and the server only serializes those pixels (summed over 'binning' adjacent
+pixels, wavelength = bin centre). 'regions' are detector pixel spans
+[start, stop), in order, so a frame is the concatenation of the binned
+regions. Without registered regions the full detector is sent.
+
+The stock spm_002 server does not know 'roi', so cropping is off by default
+(RoiConfig.enabled). A SET_CONFIG the server rejects because of it turns
+it off for the session (RoiRegistry.reject) and the config is sent again
+without it, i.e. full frames.
+
+The pixel helpers below are shared by every server implementation.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from base_core.math.models import Range
+from base_core.quantities.enums import Prefix
+from base_core.quantities.models import Length
+from phase_control.io.spectrometer.interfaces import IRoiRegistry
+
+# extra wavelength around every region so small config edits do not reconfigure the server
+DEFAULT_MARGIN_NM = 1.0
+
+
+@dataclass
+class RoiConfig:
+    enabled: bool = False      # needs a server that knows 'roi' (e.g. fake_server)
+    binning: int = 1
+    margin_nm: float = DEFAULT_MARGIN_NM
+
+
+class RoiRegistry(IRoiRegistry):
+    """
+    Owner -> wavelength range. Listeners are called (outside the lock)
+    only when the 'roi' entry sent to the server (to_wire()) changes.
+    """
+
+    def __init__(self, config: Optional[RoiConfig] = None) -> None:
+        self.config = config if config is not None else RoiConfig()
+        self._lock = threading.Lock()
+        self._ranges: dict[str, tuple[float, float]] = {}
+        self._listeners: tuple[Callable[[], None], ...] = ()
+        self._rejected: Optional[str] = None
+
+    @property
+    def rejected_reason(self) -> Optional[str]:
+        """Why the server refused 'roi' (cropping is off since), None if it did not."""
+        return self._rejected
+
+    def set_roi(self, owner: str, range_wl: Range[Length]) -> None:
+        lo = range_wl.min.value(Prefix.NANO)
+        hi = range_wl.max.value(Prefix.NANO)
+        with self._lock:
+            if self._ranges.get(owner) == (lo, hi):
+                return
+            before = self._wire()
+            self._ranges[owner] = (lo, hi)
+            changed = self._wire() != before
+        if changed:
+            self._notify()
+
+    def clear_roi(self, owner: str) -> None:
+        with self._lock:
+            before = self._wire()
+            if self._ranges.pop(owner, None) is None:
+                return
+            changed = self._wire() != before
+        if changed:
+            self._notify()
+
+    def reject(self, reason: str) -> bool:
+        """The server refused 'roi': send full frames from now on. True if it was in use."""
+        with self._lock:
+            was_used = self._rejected is None and self._wire() is not None
+            self._rejected = reason
+            return was_used
+
+    def subscribe(self, listener: Callable[[], None]) -> Callable[[], None]:
+        self._listeners = self._listeners + (listener,)
+
+        def unsubscribe() -> None:
+            self._listeners = tuple(l for l in self._listeners if l is not listener)
+
+        return unsubscribe
+
+    def regions_nm(self) -> list[tuple[float, float]]:
+        """Union of all registered ranges (plus margin), sorted and merged."""
+        with self._lock:
+            return self._regions_nm()
+
+    def to_wire(self) -> Optional[dict]:
+        """'roi' entry of SET_CONFIG, None = full detector."""
+        with self._lock:
+            return self._wire()
+
+    def _regions_nm(self) -> list[tuple[float, float]]:
+        margin = max(0.0, self.config.margin_nm)
+        spans = sorted((lo - margin, hi + margin) for lo, hi in self._ranges.values())
+        merged: list[tuple[float, float]] = []
+        for lo, hi in spans:
+            if merged and lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        return merged
+
+    def _wire(self) -> Optional[dict]:
+        if not self.config.enabled or self._rejected is not None:
+            return None
+        regions = self._regions_nm()
+        binning = max(1, int(self.config.binning))
+        if not regions and binning == 1:
+            return None
+        return {"regions_nm": [list(r) for r in regions], "binning": binning}
+
+    def _notify(self) -> None:
+        for listener in self._listeners:
+            listener()
+
+
+# ---------------------------------------------------------------------- #
+# Server side
+# ---------------------------------------------------------------------- #
+
+def pixel_regions(
+    wavelengths: Sequence[float],
+    regions_nm: Sequence[Sequence[float]],
+    binning: int = 1,
+) -> list[tuple[int, int]]:
+    """
+    Detector pixel spans [start, stop) covering 'regions_nm', merged and
+    widened to whole bins. No regions = the full detector.
+    """
+    wl = np.asarray(wavelengths, dtype=float)
+    n = wl.size
+    b = max(1, int(binning))
+
+    spans: list[tuple[int, int]] = []
+    for lo, hi in (regions_nm or [(-np.inf, np.inf)]):
+        idx = np.flatnonzero((wl >= lo) & (wl <= hi))
+        if idx.size:
+            spans.append((int(idx[0]), int(idx[-1]) + 1))
+
+    out: list[tuple[int, int]] = []
+    for start, stop in sorted(spans):
+        if out and start <= out[-1][1]:
+            prev_start, prev_stop = out.pop()
+            start, stop = prev_start, max(prev_stop, stop)
+        out.append(_whole_bins(start, stop, n, b))
+    return out
+
+
+def _whole_bins(start: int, stop: int, n: int, b: int) -> tuple[int, int]:
+    length = min(-(-(stop - start) // b) * b, n - n % b)
+    start = max(0, min(start, n - length))
+    return start, start + length
+
+
+def crop_bin(values: np.ndarray, regions: Sequence[tuple[int, int]], binning: int = 1, reduce: str = "sum") -> np.ndarray:
+    """Concatenate the regions of 'values', summing (or averaging) 'binning' pixels."""
+    b = max(1, int(binning))
+    parts = []
+    for start, stop in regions:
+        seg = np.asarray(values[start:stop])
+        if b > 1:
+            seg = seg[: seg.size - seg.size % b].reshape(-1, b)
+            seg = seg.sum(axis=1) if reduce == "sum" else seg.mean(axis=1)
+        parts.append(seg)
+    return np.concatenate(parts) if parts else np.asarray(values)[:0]
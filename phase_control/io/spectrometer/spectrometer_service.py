@@ -1,17 +1,33 @@
 from __future__ import annotations
 
+import logging
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
 from base_core.framework.concurrency.interfaces import ITaskRunner
 from base_core.framework.events import EventBus
 from base_core.framework.json.json_endpoint import JsonlSubprocessEndpoint
 from base_core.framework.json.device_service import DeviceService
 
 from phase_control.io.events import TOPIC_NEW_SPECTRUM, NewSpectrumEventArgs
+from phase_control.io.readiness import new_ready_future, set_failed, set_ready
+from phase_control.io.spectrometer.correction import DEFAULT_REFERENCE_FRAMES, FrameCorrection, ReferenceCapture
+from phase_control.io.spectrometer.flow_control import CMD_CREDIT, CreditWindow, FlowControlConfig, FlowControlStats
 from phase_control.io.spectrometer.frame_buffer import FrameBuffer
+from phase_control.io.spectrometer.interfaces import IFrameSink
 from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
+from phase_control.io.spectrometer.quality import FrameQuality
+from phase_control.io.spectrometer.recorder import FrameRecorder
+from phase_control.io.spectrometer.roi import RoiRegistry
 
 from spm_002.config import SpectrometerConfig
 from spm_002.enums import CmdName, MsgType
 
+log = logging.getLogger(__name__)
+
 
 class SpectrometerService(DeviceService):
     def __init__(
@@ -20,11 +36,29 @@ class SpectrometerService(DeviceService):
         endpoint: JsonlSubprocessEndpoint,
         bus: EventBus,
         buffer: FrameBuffer,
+        flow_control: Optional[FlowControlConfig] = None,
+        roi: Optional[RoiRegistry] = None,
+        correction: Optional[FrameCorrection] = None,
+        quality: Optional[FrameQuality] = None,
     ) -> None:
         super().__init__(io, endpoint)
+        self._runner = io
         self._bus = bus
         self._buffer = buffer
         self._config = SpectrometerConfig()
+        self._ready: Future[None] = new_ready_future()
+
+        self._meta: Optional[StreamMeta] = None
+        self._seq = 0
+        self._recorder: Optional[FrameRecorder] = None
+        self._sinks: tuple[IFrameSink, ...] = ()  # swapped, never mutated
+        self._credits = CreditWindow(flow_control)
+        self._stale_frames = 0
+        self._correction = correction
+        self._quality = quality
+        self._roi = roi
+        if roi is not None:
+            roi.subscribe(self._on_roi_changed)
 
         self.register_handler(MsgType.META, self._on_meta)
         self.register_handler(MsgType.FRAME, self._on_frame)
@@ -33,37 +67,271 @@ class SpectrometerService(DeviceService):
     @property
     def config(self) -> SpectrometerConfig:
         return self._config
+
+    @property
+    def flow_control(self) -> FlowControlConfig:
+        return self._credits.config
+
+    @property
+    def flow_stats(self) -> FlowControlStats:
+        return self._credits.stats
+
+    @property
+    def stale_frames(self) -> int:
+        """Frames dropped because they did not match the current meta (ROI change in flight)."""
+        return self._stale_frames
+
+    @property
+    def ready(self) -> Future[None]:
+        """Completes when the first META message arrived; fails if the spawn fails."""
+        return self._ready
+
+    def start_async(self) -> Future[None]:
+        """
+        Spawn the acquisition process and send the config on the IO runner
+        instead of the caller's thread. Returns the readiness future.
+        """
+        if self._ready.done():
+            self._ready = new_ready_future()
+        ready = self._ready
+
+        def work() -> None:
+            try:
+                self._credits.reset()
+                self.start()
+                self.set_config_async()
+                if self._credits.config.enabled:
+                    self.grant_credits_async()
+            except BaseException as e:
+                set_failed(ready, e)
+                raise
+
+        self._runner.run(
+            work,
+            key="spectrometer.start",
+            cancel_previous=True,
+            drop_outdated=True,
+        )
+        return ready
     
     def _on_meta(self, msg: dict) -> None:
         meta = StreamMeta(
             device_index=msg["device_index"],
             num_pixels=msg["num_pixels"],
             wavelengths=msg.get("wavelengths"),
+            regions=[tuple(r) for r in msg["regions"]] if msg.get("regions") else None,
+            binning=int(msg.get("binning", 1)),
         )
+        self._meta = meta
+        self._select_correction()
         self._buffer.set_meta_data(meta)
+        set_ready(self._ready)
 
     def _on_frame(self, msg: dict) -> None:
+        meta = self._meta
+        if meta is not None and len(msg["counts"]) != meta.num_pixels:
+            # sent before the server applied a new ROI
+            self._stale_frames += 1
+            if self._credits.consumed(msg.get("seq"), msg.get("skipped", 0)):
+                self.grant_credits_async()
+            return
+
         frame = StreamFrame(
             timestamp=msg["timestamp"],
             device_index=msg["device_index"],
             counts=msg["counts"],
         )
+        self._seq += 1
         self._buffer.set(frame)
+
+        for sink in self._sinks:
+            sink.append(self._seq, frame)
+
         self._bus.publish(
             TOPIC_NEW_SPECTRUM,
             NewSpectrumEventArgs(timestamp=frame.timestamp, device_index=frame.device_index),
         )
 
+        # consumed = in the latest-value buffer (see flow_control.py): the
+        # credit bounds the pipe, engines drop the frames they cannot keep up with
+        if self._credits.consumed(msg.get("seq"), msg.get("skipped", 0)):
+            self.grant_credits_async()
+
+    # -------------------------------------------------------------- #
+    # Recording
+    # -------------------------------------------------------------- #
+    @property
+    def recorder(self) -> Optional[FrameRecorder]:
+        return self._recorder
+
+    @property
+    def meta(self) -> Optional[StreamMeta]:
+        return self._meta
+
+    def add_frame_sink(self, sink: IFrameSink) -> None:
+        self._sinks = self._sinks + (sink,)
+
+    def remove_frame_sink(self, sink: IFrameSink) -> None:
+        self._sinks = tuple(s for s in self._sinks if s is not sink)
+
+    def start_recording(self, stem: Path, **recorder_kwargs: Any) -> FrameRecorder:
+        """
+        Record every raw frame to '<stem>.frames/.index/.json' (see recorder.py).
+        Needs the stream meta data, i.e. the service must be ready.
+        """
+        if self._meta is None:
+            raise RuntimeError("Meta data has to be initialized.")
+        self.stop_recording()
+        self._recorder = FrameRecorder(stem, self._meta, **recorder_kwargs)
+        self.add_frame_sink(self._recorder)
+        return self._recorder
+
+    def stop_recording(self) -> None:
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            self.remove_frame_sink(recorder)
+            recorder.close()
+
+    def _on_roi_changed(self) -> None:
+        # before the first META the ROI goes out with the initial config
+        if self._meta is not None:
+            self.set_config_async()
+
+    # -------------------------------------------------------------- #
+    # Dark / flat-field references
+    # -------------------------------------------------------------- #
+    @property
+    def correction(self) -> Optional[FrameCorrection]:
+        return self._correction
+
+    @property
+    def quality(self) -> Optional[FrameQuality]:
+        return self._quality
+
+    def capture_dark_async(self, frames: int = DEFAULT_REFERENCE_FRAMES) -> Future:
+        """
+        Average the next frames as dark reference (block the beam first).
+        Outliers of the dark are added to the hot-pixel mask.
+        """
+        return self._capture_reference(frames, self._on_dark_captured)
+
+    def capture_flat_async(self, frames: int = DEFAULT_REFERENCE_FRAMES) -> Future:
+        """Average the next frames as flat-field response (broadband source, no fringes)."""
+        return self._capture_reference(frames, lambda ref: self._correction.set_flat(self._repaired(ref)))
+
+    def _on_dark_captured(self, dark: np.ndarray) -> None:
+        if self._quality is not None and self._meta is not None:
+            self._quality.learn_hot_pixels(dark, self._meta)
+        self._correction.set_dark(self._repaired(dark))
+
+    def _repaired(self, reference: np.ndarray) -> np.ndarray:
+        # frames reach the correction with hot pixels already repaired; the
+        # references must match, or (counts - dark) * gain dips at every one
+        if self._quality is None or self._meta is None:
+            return reference
+        return self._quality.repair(np.array(reference, dtype=float), self._meta)
+
+    def _capture_reference(self, frames: int, store: Callable[[np.ndarray], None]) -> Future:
+        if self._correction is None:
+            raise RuntimeError("No frame correction configured.")
+        if self._meta is None:
+            raise RuntimeError("Meta data has to be initialized.")
+        capture = ReferenceCapture(frames, self._meta.num_pixels)
+
+        def on_done(fut: Future) -> None:
+            self.remove_frame_sink(capture)
+            if not fut.cancelled() and fut.exception() is None:
+                store(fut.result())
+
+        capture.result.add_done_callback(on_done)
+        self.add_frame_sink(capture)
+        return capture.result
+
+    def _select_correction(self) -> None:
+        if self._correction is not None and self._meta is not None:
+            self._correction.select(self._meta, self._config.exposure_ms)
+
     def set_config_async(self):
+        self._select_correction()  # exposure may have changed
+        args = dict(self._config.to_json())
+        roi = self._roi.to_wire() if self._roi is not None else None
+        if roi is None:
+            return self._send_config(args)
+
+        # on failure resend without 'roi'; if that works the server refused
+        # cropping, so stay on full frames (like a refused credit)
+        result: Future = Future()
+
+        def on_retry(fut: Future, error: str) -> None:
+            if _reply_error(fut) is None and self._roi.reject(error):
+                log.warning("Server rejected 'roi', using full frames: %s", error)
+            _copy_outcome(fut, result)
+
+        def on_reply(fut: Future) -> None:
+            error = None if fut.cancelled() else _reply_error(fut)
+            if error is None:
+                _copy_outcome(fut, result)
+                return
+            self._send_config(args).add_done_callback(lambda f: on_retry(f, error))
+
+        self._send_config({**args, "roi": roi}).add_done_callback(on_reply)
+        return result
+
+    def _send_config(self, args: dict) -> Future:
         return self.request_async(
-            {"type": MsgType.CMD, "name": CmdName.SET_CONFIG, "args": self._config.to_json()},
+            {"type": MsgType.CMD, "name": CmdName.SET_CONFIG, "args": args},
             key="spectrometer.set_config",
             cancel_previous=True,
         )
 
+    def grant_credits_async(self):
+        """
+        Acknowledge the consumed frames and (re)open the in-flight window.
+        A newer grant supersedes a pending one since 'ack' is cumulative.
+        """
+        fut = self.request_async(
+            {"type": MsgType.CMD, "name": CMD_CREDIT, "args": self._credits.grant()},
+            key="spectrometer.credit",
+            cancel_previous=True,
+        )
+        fut.add_done_callback(self._on_credit_reply)
+        return fut
+
+    def _on_credit_reply(self, fut: Future) -> None:
+        if fut.cancelled():
+            return
+        error = _reply_error(fut)
+        if error is not None:
+            self._disable_flow_control(error)
+
+    def _disable_flow_control(self, reason: str) -> None:
+        # reported once per grant that was in effect, visible in flow_stats
+        if self._credits.reject(reason):
+            log.warning("credit flow control disabled, server keeps pushing: %s", reason)
+
     def shutdown_async(self):
         return self.request_async(
             {"type": MsgType.CMD, "name": CmdName.SHUTDOWN},
             key="spectrometer.shutdown",
             cancel_previous=True,
         )
+
+
+def _reply_error(fut: Future) -> Optional[str]:
+    """Why a finished request failed (exception or {"ok": false}), None on success."""
+    try:
+        reply = fut.result()
+    except BaseException as e:
+        return str(e) or type(e).__name__
+    if isinstance(reply, dict) and reply.get("ok") is False:
+        return str(reply.get("error"))
+    return None
+
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
@@ -99,6 +99,21 @@ class SpectrometerSettingsView(ViewBase[SpectrometerSettingsViewModel]):
         btn_l.addStretch(1)
         root.addWidget(btn_row)
 
+        # Dark / flat-field references
+        ref_row = QWidget(self)
+        ref_l = QHBoxLayout(ref_row)
+        ref_l.setContentsMargins(0, 0, 0, 0)
+
+        self._btn_dark = QPushButton("Capture dark", ref_row)
+        self._btn_flat = QPushButton("Capture flat", ref_row)
+        self._btn_clear_ref = QPushButton("Clear", ref_row)
+
+        ref_l.addStretch(1)
+        for b in (self._btn_dark, self._btn_flat, self._btn_clear_ref):
+            ref_l.addWidget(b)
+        ref_l.addStretch(1)
+        root.addWidget(ref_row)
+
         # Status
         self._status = QLabel("", self)
         self._status.setAlignment(Qt.AlignCenter)
@@ -130,6 +145,9 @@ class SpectrometerSettingsView(ViewBase[SpectrometerSettingsViewModel]):
             self.connect_binding(e.textChanged, self._update_apply_enabled)
 
         self.connect_binding(self._btn_apply.clicked, self._on_apply_clicked)
+        self.connect_binding(self._btn_dark.clicked, self.vm.capture_dark)
+        self.connect_binding(self._btn_flat.clicked, self.vm.capture_flat)
+        self.connect_binding(self._btn_clear_ref.clicked, self.vm.clear_correction)
 
     def _parse_int(self, edit: QLineEdit) -> int | None:
         t = edit.text().strip()
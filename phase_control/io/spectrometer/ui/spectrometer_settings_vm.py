@@ -82,3 +82,58 @@ class SpectrometerSettingsViewModel(VMBase):
             self.status_changed.emit(f"Apply failed: {e}")
             return
         self.status_changed.emit("Applied.")
+
+    # --- dark / flat-field references ---
+
+    @Slot()
+    def capture_dark(self) -> None:
+        self._capture("dark", self._spectrometer.capture_dark_async)
+
+    @Slot()
+    def capture_flat(self) -> None:
+        self._capture("flat", self._spectrometer.capture_flat_async)
+
+    @Slot()
+    def clear_correction(self) -> None:
+        correction = self._spectrometer.correction
+        if correction is None or correction.key is None:
+            self.status_changed.emit("No correction to clear.")
+            return
+        correction.clear()
+        if correction.save_error is not None:
+            self.status_changed.emit(f"Dark/flat correction cleared, but not on disk: {correction.save_error}")
+            return
+        self.status_changed.emit("Dark/flat correction cleared.")
+
+    def _capture(self, name: str, start) -> None:
+        try:
+            fut: Future = start()
+        except RuntimeError as e:
+            self.status_changed.emit(f"Capture failed: {e}")
+            return
+        self.status_changed.emit(f"Capturing {name} reference...")
+        fut.add_done_callback(lambda f: self._on_capture_done(name, f))
+
+    def _on_capture_done(self, name: str, fut: Future) -> None:
+        if fut.cancelled():
+            self.status_changed.emit(f"{name.capitalize()} capture cancelled.")
+            return
+        if fut.exception() is not None:
+            self.status_changed.emit(f"{name.capitalize()} capture failed: {fut.exception()}")
+            return
+        # the service stores the reference in an earlier callback of the same future
+        errors = self._save_errors(hot_pixels=name == "dark")
+        if errors:
+            self.status_changed.emit(f"{name.capitalize()} reference active, but not saved: {'; '.join(errors)}")
+            return
+        self.status_changed.emit(f"{name.capitalize()} reference stored.")
+
+    def _save_errors(self, hot_pixels: bool) -> list[str]:
+        errors = []
+        correction = self._spectrometer.correction
+        if correction is not None and correction.save_error is not None:
+            errors.append(correction.save_error)
+        quality = self._spectrometer.quality
+        if hot_pixels and quality is not None and quality.mask.save_error is not None:
+            errors.append(f"hot pixel mask: {quality.mask.save_error}")
+        return errors
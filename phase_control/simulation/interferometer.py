@@ -0,0 +1,160 @@
+# phase_control/simulation/interferometer.py
+"""
+Simulated interferometer + spectrometer for closed-loop benchmarks.
+
+The relative phase seen by the spectrometer is
+
+    phase(t) = phi0 + drift(t) - CORRECTION_SIGN * plate_deg / CONVERSION_CONST  [deg]
+
+i.e. the inverse of PhaseCorrector's phase -> wave-plate conversion, so a
+correct correction cancels the phase error. drift(t) is a linear drift plus
+a random walk; spectra come from cfg_projection_nu_equal_amplitudes_safe
+with additive detector noise.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+
+from base_core.framework.events import EventBus
+from base_core.math.functions import cfg_projection_nu_equal_amplitudes_safe
+from phase_control.analysis_modules.stabilization.config import FitParameter1
+from phase_control.analysis_modules.stabilization.domain.phase_corrector import CONVERSION_CONST, CORRECTION_SIGN
+from phase_control.core.clock import SYSTEM_CLOCK, ClockPin, IClock
+from phase_control.io.events import TOPIC_NEW_SPECTRUM, NewSpectrumEventArgs
+from phase_control.io.readiness import new_ready_future, set_ready
+from phase_control.io.spectrometer.interfaces import IFrameBuffer
+from phase_control.io.spectrometer.models import StreamFrame, StreamMeta
+
+
+@dataclass
+class InterferometerModel:
+    params: FitParameter1 = field(default_factory=FitParameter1)
+    wl_min_nm: float = 760.0
+    wl_max_nm: float = 840.0
+    num_pixels: int = 1024
+    amplitude: float = 20_000.0      # counts at model value 1.0
+    noise_counts: float = 100.0      # detector noise (std)
+    phase0_rad: float = 1.0
+    drift_rad_s: float = 0.05        # linear drift
+    random_walk_rad_sqrt_s: float = 0.05
+    seed: Optional[int] = 0
+
+    def __post_init__(self) -> None:
+        self.wavelengths = np.linspace(self.wl_min_nm, self.wl_max_nm, self.num_pixels)
+        self._rng = np.random.default_rng(self.seed)
+        self._walk = 0.0
+        self._t_last = 0.0
+        self._kwargs = self.params.to_fit_kwargs(cfg_projection_nu_equal_amplitudes_safe)
+
+    def meta(self, device_index: int = 0) -> StreamMeta:
+        return StreamMeta(device_index=device_index, num_pixels=self.num_pixels, wavelengths=self.wavelengths.tolist())
+
+    def phase(self, t: float, plate_deg: float) -> float:
+        """Optical phase [rad] at time t (monotonic calls) for the given plate angle."""
+        dt = max(0.0, t - self._t_last)
+        self._t_last = max(self._t_last, t)
+        if dt > 0 and self.random_walk_rad_sqrt_s > 0:
+            self._walk += self.random_walk_rad_sqrt_s * math.sqrt(dt) * float(self._rng.standard_normal())
+        plate_phase = -CORRECTION_SIGN * math.radians(plate_deg) / CONVERSION_CONST
+        return self.phase0_rad + self.drift_rad_s * t + self._walk + plate_phase
+
+    def counts(self, phase_rad: float) -> np.ndarray:
+        kwargs = dict(self._kwargs)
+        kwargs["phase"] = phase_rad
+        y = np.asarray(cfg_projection_nu_equal_amplitudes_safe(self.wavelengths, **kwargs), dtype=float)
+        y = self.amplitude * y
+        if self.noise_counts > 0:
+            y = y + self.noise_counts * self._rng.standard_normal(y.shape)
+        return np.clip(np.rint(y), 0, 65_535).astype(np.int64)
+
+
+@dataclass(slots=True)
+class PhaseSample:
+    t: float
+    phase_rad: float
+    plate_deg: float
+
+
+class SimulatedSpectrometer:
+    """
+    Feeds model spectra into an IFrameBuffer at 'rate_hz' and publishes
+    TOPIC_NEW_SPECTRUM like SpectrometerService. The plate angle is read
+    from 'plate_deg' (e.g. SimulatedRotator.position_deg) for every frame;
+    the true phase of every frame is kept in 'trace'.
+    """
+
+    def __init__(
+        self,
+        model: InterferometerModel,
+        buffer: IFrameBuffer,
+        bus: EventBus,
+        plate_deg: Callable[[], float],
+        *,
+        rate_hz: float = 20.0,
+        clock: IClock = SYSTEM_CLOCK,
+    ) -> None:
+        self._model = model
+        self._clock = clock
+        self._buffer = buffer
+        self._bus = bus
+        self._plate_deg = plate_deg
+        self._period = 1.0 / rate_hz
+
+        self._ready: Future[None] = new_ready_future()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.trace: list[PhaseSample] = []
+
+    @property
+    def ready(self) -> Future[None]:
+        return self._ready
+
+    def start(self) -> None:
+        meta = self._model.meta()
+        self._buffer.set_meta_data(meta)
+        set_ready(self._ready)
+        self._stop.clear()
+        started = self._clock.pin()   # no virtual time passes before the first frame
+        self._thread = threading.Thread(target=self._run, args=(started,), name="sim.spectrometer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, started: ClockPin) -> None:
+        clock = self._clock
+        try:
+            # held throughout: the thread is either producing a frame or
+            # blocked in clock.wait, which does not count as holding
+            with clock.hold():
+                started.release()
+                t0 = clock.now()
+                next_due = t0
+                while not self._stop.is_set():
+                    t = clock.now() - t0
+                    plate = self._plate_deg()
+                    phase = self._model.phase(t, plate)
+                    self.trace.append(PhaseSample(t, phase, plate))
+
+                    frame = StreamFrame(timestamp=repr(clock.time()), device_index=0, counts=self._model.counts(phase))
+                    self._buffer.set(frame)
+                    self._bus.publish(TOPIC_NEW_SPECTRUM, NewSpectrumEventArgs(timestamp=frame.timestamp, device_index=0))
+
+                    next_due += self._period
+                    delay = next_due - clock.now()
+                    if delay > 0:
+                        clock.wait(self._stop, delay)
+                    else:
+                        next_due = clock.now()
+        except Exception:
+            import traceback
+            traceback.print_exc()
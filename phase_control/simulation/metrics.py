@@ -0,0 +1,78 @@
+# phase_control/simulation/metrics.py
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class LockMetrics:
+    duration_s: float
+    time_to_lock_s: Optional[float]   # None: never held lock for hold_s
+    rms_error_rad: float              # after lock (whole run if never locked)
+    max_error_rad: float              # after lock
+    locked_fraction: float            # share of samples within tolerance after lock
+    moves: int
+    moves_per_min: float
+
+    def report(self) -> str:
+        ttl = "never" if self.time_to_lock_s is None else f"{self.time_to_lock_s:.2f} s"
+        return "\n".join([
+            f"Duration:       {self.duration_s:.1f} s",
+            f"Time to lock:   {ttl}",
+            f"RMS phase err:  {self.rms_error_rad:.4f} rad ({math.degrees(self.rms_error_rad):.2f} deg)",
+            f"Max phase err:  {self.max_error_rad:.4f} rad",
+            f"In tolerance:   {self.locked_fraction * 100:.1f} %",
+            f"Moves:          {self.moves} ({self.moves_per_min:.1f} /min)",
+        ])
+
+
+def wrap_pi(x: np.ndarray) -> np.ndarray:
+    return (np.asarray(x, dtype=float) + np.pi) % (2 * np.pi) - np.pi
+
+
+def lock_metrics(
+    t: Sequence[float],
+    error_rad: Sequence[float],
+    *,
+    moves: int,
+    tolerance_rad: float,
+    hold_s: float = 2.0,
+) -> LockMetrics:
+    """
+    Lock = |wrapped error| <= tolerance continuously for at least hold_s;
+    time_to_lock is the start of the first such stretch.
+    """
+    t = np.asarray(t, dtype=float)
+    err = np.abs(wrap_pi(error_rad))
+    duration = float(t[-1] - t[0]) if t.size > 1 else 0.0
+
+    time_to_lock: Optional[float] = None
+    inside = err <= tolerance_rad
+    start = None
+    for i in range(t.size):
+        if inside[i]:
+            if start is None:
+                start = i
+            if t[i] - t[start] >= hold_s:
+                time_to_lock = float(t[start] - t[0])
+                break
+        else:
+            start = None
+
+    if time_to_lock is not None:
+        after = err[t - t[0] >= time_to_lock]
+    else:
+        after = err
+    return LockMetrics(
+        duration_s=duration,
+        time_to_lock_s=time_to_lock,
+        rms_error_rad=float(np.sqrt(np.mean(after ** 2))) if after.size else float("nan"),
+        max_error_rad=float(after.max()) if after.size else float("nan"),
+        locked_fraction=float(np.mean(after <= tolerance_rad)) if after.size else 0.0,
+        moves=moves,
+        moves_per_min=moves / duration * 60.0 if duration > 0 else 0.0,
+    )
@@ -0,0 +1,187 @@
+# phase_control/simulation/rotator.py
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from base_core.framework.concurrency.interfaces import ITaskRunner
+from base_core.math.models import Angle
+from elliptec.config import ELL14Config
+from phase_control.core.clock import SYSTEM_CLOCK, ClockPin, IClock
+from phase_control.io.readiness import new_ready_future, set_ready
+from phase_control.io.rotator.interfaces import IRotatorController
+
+# ELL14 datasheet: up to 430 deg/s; every command costs a serial round trip
+MAX_SPEED_DEG_S = 430.0
+COMMAND_OVERHEAD_S = 0.05
+HOMING_S = 1.0
+
+
+class SimulatedRotator(IRotatorController):
+    """
+    IRotatorController without hardware.
+
+    Commands run on the given IO runner with the same latest-wins semantics
+    as RotatorController. A move takes COMMAND_OVERHEAD_S + |angle| / speed
+    on the given clock, counted from the request; position_deg interpolates
+    linearly while moving so that a simulated interferometer sees the plate turn.
+    """
+
+    def __init__(
+        self,
+        io: ITaskRunner,
+        config: Optional[ELL14Config] = None,
+        *,
+        max_speed_deg_s: float = MAX_SPEED_DEG_S,
+        overhead_s: float = COMMAND_OVERHEAD_S,
+        homing_s: float = HOMING_S,
+        clock: IClock = SYSTEM_CLOCK,
+    ) -> None:
+        self._runner = io
+        self._clock = clock
+        self._config = config if config is not None else ELL14Config()
+        self._max_speed_deg_s = max_speed_deg_s
+        self._overhead_s = overhead_s
+        self._homing_s = homing_s
+        self._speed_percent = 100
+
+        self._lock = threading.Lock()
+        self._busy = threading.Event()
+        self._busy_gen = 0
+        self._busy_since = 0.0
+        self._queued: Optional[ClockPin] = None
+        self._ready: Future[None] = new_ready_future()
+
+        # current move: (t_start, t_end, start_deg, end_deg)
+        self._move = (0.0, 0.0, 0.0, 0.0)
+        self._moves = 0
+        self._travel_deg = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Simulation state
+    # ------------------------------------------------------------------ #
+
+    @property
+    def position_deg(self) -> float:
+        t0, t1, a0, a1 = self._move
+        now = self._clock.now()
+        if now >= t1 or t1 <= t0:
+            return a1
+        return a0 + (a1 - a0) * (now - t0) / (t1 - t0)
+
+    @property
+    def moves(self) -> int:
+        return self._moves
+
+    @property
+    def travel_deg(self) -> float:
+        return self._travel_deg
+
+    def move_time(self, angle_deg: float) -> float:
+        speed = self._max_speed_deg_s * max(1, self._speed_percent) / 100.0
+        return self._overhead_s + abs(angle_deg) / speed
+
+    # ------------------------------------------------------------------ #
+    # IRotatorController
+    # ------------------------------------------------------------------ #
+
+    @property
+    def is_busy(self) -> bool:
+        return self._busy.is_set()
+
+    @property
+    def busy_for_s(self) -> float:
+        if not self._busy.is_set():
+            return 0.0
+        return self._clock.now() - self._busy_since
+
+    @property
+    def config(self) -> ELL14Config:
+        return self._config
+
+    @property
+    def ready(self) -> Future[None]:
+        return self._ready
+
+    def open(self) -> None:
+        if self._ready.done():
+            self._ready = new_ready_future()
+        ready = self._ready
+
+        def work(t_req: float) -> None:
+            self._home(t_req)
+            set_ready(ready)
+
+        self._submit("rotator.open", work)
+
+    def close(self) -> None:
+        pass
+
+    def request_rotation(self, angle: Angle) -> None:
+        if angle is None or float(angle) == 0.0:
+            return
+        delta = float(angle.Deg)
+        self._submit("rotator.rotate", lambda t_req: self._rotate(delta, t_req))
+
+    def request_homing(self) -> None:
+        self._submit("rotator.home", self._home)
+
+    def request_set_speed(self, percent: int) -> None:
+        def work(t_req: float) -> None:
+            self._speed_percent = int(percent)
+            self._sleep_until(t_req + self._overhead_s)
+
+        self._submit("rotator.set_speed", work)
+
+    def request_apply_config(self) -> None:
+        self._submit("rotator.apply_config", lambda t_req: self._sleep_until(t_req + self._overhead_s))
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _submit(self, key: str, fn: Callable[[float], None]) -> None:
+        t_req = self._clock.now()
+        # virtual time stands still until the IO thread has picked the command up
+        queued = self._clock.pin()
+        with self._lock:
+            self._busy_gen += 1
+            gen = self._busy_gen
+            if not self._busy.is_set():
+                self._busy_since = t_req
+            self._busy.set()
+            superseded, self._queued = self._queued, queued
+        if superseded is not None:
+            superseded.release()   # may be dropped by the runner; the new command runs instead
+
+        def work() -> None:
+            with self._clock.hold():
+                queued.release()
+                try:
+                    fn(t_req)
+                finally:
+                    with self._lock:
+                        if gen == self._busy_gen:
+                            self._busy.clear()
+
+        self._runner.run(work, key=key, cancel_previous=True, drop_outdated=True)
+
+    def _rotate(self, delta_deg: float, t_req: float) -> None:
+        # timed from the request, not from when the IO thread picked it up
+        t0 = max(t_req, self._move[1])
+        start = self._move[3]
+        t1 = t0 + self.move_time(delta_deg)
+        self._move = (t0, t1, start, start + delta_deg)
+        self._moves += 1
+        self._travel_deg += abs(delta_deg)
+        self._sleep_until(t1)
+
+    def _home(self, t_req: float) -> None:
+        t0 = max(t_req, self._move[1])
+        t1 = t0 + self._homing_s
+        self._move = (t0, t1, self._move[3], 0.0)
+        self._sleep_until(t1)
+
+    def _sleep_until(self, deadline: float) -> None:
+        self._clock.sleep(deadline - self._clock.now())
@@ -0,0 +1,315 @@
+# phase_control/tools/bench.py
+"""
+Micro benchmarks for the Spectrum and analysis hot paths.
+
+Synthetic spectra (simulation.InterferometerModel) at several pixel counts;
+every case reports ops/s (best of several repeats) and the peak memory
+allocated per call (tracemalloc), plus a case-specific note if it has one
+(evaluations per level for the multi-resolution fit). Results can be saved as a baseline and
+later runs compared against it; the exit code is 1 if any case got slower
+than the threshold.
+
+    python -m phase_control.tools.bench
+    python -m phase_control.tools.bench --save bench_baseline.json
+    python -m phase_control.tools.bench --baseline bench_baseline.json --threshold 0.2
+    python -m phase_control.tools.bench --filter spectrum. --pixels 2048
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from phase_control.analysis_modules.envelope.config import EnvelopeSignalGeneratorConfig
+from phase_control.analysis_modules.envelope.domain.envelope_signal_generator import EnvelopeSignalGenerator
+from phase_control.analysis_modules.stabilization.config import AnalysisConfig, FitParameter1
+from phase_control.analysis_modules.stabilization.domain.fft_tracker import FftPhaseTracker
+from phase_control.analysis_modules.stabilization.domain.phase_tracker import PhaseTracker
+from phase_control.core.models import Spectrum
+from phase_control.core.resampling import NuResamplerCache
+from phase_control.io.spectrometer.frame_buffer import FrameBuffer
+from phase_control.io.spectrometer.models import StreamFrame
+from phase_control.simulation.interferometer import InterferometerModel
+
+DEFAULT_PIXELS = (512, 1024, 2048, 4096)
+DEFAULT_THRESHOLD = 0.25    # fail if ops/s dropped by more than 25 %
+MIN_TIME_S = 0.2            # per repeat
+REPEATS = 3
+
+
+@dataclass(slots=True)
+class BenchResult:
+    case: str
+    pixels: Optional[int]
+    ops_per_s: float
+    us_per_op: float
+    peak_alloc_kib: float
+    note: str = ""
+
+    @property
+    def key(self) -> str:
+        return self.case if self.pixels is None else f"{self.case}[{self.pixels}]"
+
+
+# ---------------------------------------------------------------------- #
+# Cases: setup(pixels) -> zero-argument callable that runs one operation;
+# a 'note' attribute on it (() -> str) is printed after the measurement
+# ---------------------------------------------------------------------- #
+
+def _inputs(pixels: int):
+    model = InterferometerModel(num_pixels=pixels, seed=1)
+    counts = model.counts(0.7)
+    return model, model.wavelengths.tolist(), counts
+
+
+def _prepared_spectrum(pixels: int, config: AnalysisConfig) -> Spectrum:
+    _, wl, counts = _inputs(pixels)
+    spec = Spectrum.from_raw_data(wl, counts)
+    spec.normalize()
+    return spec.cut(config.wavelength_range)
+
+
+def _from_raw_data(pixels: int) -> Callable[[], object]:
+    _, wl, counts = _inputs(pixels)
+    return lambda: Spectrum.from_raw_data(wl, counts)
+
+
+def _cut(pixels: int) -> Callable[[], object]:
+    _, wl, counts = _inputs(pixels)
+    spec = Spectrum.from_raw_data(wl, counts)
+    rng = AnalysisConfig().wavelength_range
+    return lambda: spec.cut(rng)
+
+
+def _resample_nu(pixels: int) -> Callable[[], object]:
+    model, wl, counts = _inputs(pixels)
+    spec = Spectrum.from_raw_data(wl, counts)
+    op = NuResamplerCache().get(model.meta(), AnalysisConfig().wavelength_range)
+    return lambda: op.resample(spec)
+
+
+def _normalize(pixels: int) -> Callable[[], object]:
+    _, wl, counts = _inputs(pixels)
+    spec = Spectrum.from_raw_data(wl, counts)
+    return spec.normalize
+
+
+def _wavelengths_nm(pixels: int) -> Callable[[], object]:
+    _, wl, counts = _inputs(pixels)
+    spec = Spectrum.from_raw_data(wl, counts)
+    return lambda: spec.wavelengths_nm
+
+
+def _get_latest(pixels: int) -> Callable[[], object]:
+    model, _, counts = _inputs(pixels)
+    buffer = FrameBuffer()
+    buffer.set_meta_data(model.meta())
+    buffer.set(StreamFrame(timestamp="0", device_index=0, counts=counts.tolist()))
+    return buffer.get_latest
+
+
+def _fit_phase(pixels: int) -> Callable[[], object]:
+    config = AnalysisConfig()
+    spec = _prepared_spectrum(pixels, config)
+    tracker = PhaseTracker(config)
+    return lambda: tracker.fit_phase(spec)
+
+
+def _initialize_fit(pixels: int) -> Callable[[], object]:
+    config = AnalysisConfig()
+    spec = _prepared_spectrum(pixels, config)
+    tracker = PhaseTracker(config)
+    return lambda: tracker._initialize_fit_parameters(spec)
+
+
+def _initialize_multires(pixels: int) -> Callable[[], object]:
+    config = AnalysisConfig(fit_levels=3)
+    spec = _prepared_spectrum(pixels, config)
+    tracker = PhaseTracker(config)
+
+    def fit() -> object:
+        return tracker._initialize_fit_parameters(spec)
+
+    fit.note = lambda: " | ".join(map(str, tracker.last_fit_levels))  # type: ignore[attr-defined]
+    return fit
+
+
+def _fft_measure(pixels: int) -> Callable[[], object]:
+    model, wl, counts = _inputs(pixels)
+    config = AnalysisConfig()
+    spec = Spectrum.from_raw_data(wl, counts)
+    spec.normalize()
+    spec = NuResamplerCache().get(model.meta(), config.wavelength_range).resample(spec)
+    tracker = FftPhaseTracker(config, calibration=PhaseTracker(config))
+    return lambda: tracker.measure(spec)
+
+
+def _fit_mean(_pixels: int) -> Callable[[], object]:
+    items = [FitParameter1(tau_ps=1.0 + 0.01 * i, residual=0.1 * i) for i in range(AnalysisConfig().avg_spectra)]
+    return lambda: FitParameter1.mean(items)
+
+
+def _envelope_update(pixels: int) -> Callable[[], object]:
+    _, wl, counts = _inputs(pixels)
+    spec = Spectrum.from_raw_data(wl, counts)
+    generator = EnvelopeSignalGenerator(EnvelopeSignalGeneratorConfig())
+    return lambda: generator.update(spec)
+
+
+# name -> (setup, depends on pixel count)
+CASES: dict[str, tuple[Callable[[int], Callable[[], object]], bool]] = {
+    "spectrum.from_raw_data": (_from_raw_data, True),
+    "spectrum.cut": (_cut, True),
+    "nu_resampler.resample": (_resample_nu, True),
+    "spectrum.normalize": (_normalize, True),
+    "spectrum.wavelengths_nm": (_wavelengths_nm, True),
+    "frame_buffer.get_latest": (_get_latest, True),
+    "phase_tracker.fit_phase": (_fit_phase, True),
+    "phase_tracker.initialize_fit_parameters": (_initialize_fit, True),
+    "phase_tracker.initialize_multires": (_initialize_multires, True),
+    "fft_tracker.measure": (_fft_measure, True),
+    "fit_parameter.mean": (_fit_mean, False),
+    "envelope.update": (_envelope_update, True),
+}
+
+
+# ---------------------------------------------------------------------- #
+# Measurement
+# ---------------------------------------------------------------------- #
+
+def measure(fn: Callable[[], object], min_time_s: float = MIN_TIME_S, repeats: int = REPEATS) -> tuple[float, float]:
+    """
+    Returns (ops/s of the best repeat, peak KiB allocated by one call).
+    """
+    fn()  # warm up (caches, lazy imports)
+
+    # calibrate loop count so one repeat takes about min_time_s
+    loops = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - t
+        if elapsed >= min_time_s or loops >= 1 << 20:
+            break
+        loops = max(loops * 2, int(loops * min_time_s / max(elapsed, 1e-9)))
+
+    best = elapsed / loops
+    for _ in range(repeats - 1):
+        t = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - t) / loops)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return 1.0 / best, (peak - base) / 1024.0
+
+
+def run(
+    pixels: tuple[int, ...] = DEFAULT_PIXELS,
+    name_filter: Optional[str] = None,
+    min_time_s: float = MIN_TIME_S,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    results: list[BenchResult] = []
+    for name, (setup, per_pixels) in CASES.items():
+        if name_filter and name_filter not in name:
+            continue
+        for n in (pixels if per_pixels else (None,)):
+            fn = setup(n if n is not None else 0)
+            ops, kib = measure(fn, min_time_s=min_time_s)
+            note = getattr(fn, "note", None)
+            result = BenchResult(name, n, ops, 1e6 / ops, kib, note() if note is not None else "")
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+
+def compare(results: list[BenchResult], baseline: dict, threshold: float) -> list[str]:
+    """
+    Return one message per case that is more than 'threshold' slower than the baseline.
+    """
+    base = {r["key"]: r for r in baseline.get("results", [])}
+    regressions: list[str] = []
+    for r in results:
+        ref = base.get(r.key)
+        if ref is None or ref["ops_per_s"] <= 0:
+            continue
+        change = r.ops_per_s / ref["ops_per_s"] - 1.0
+        if change < -threshold:
+            regressions.append(f"{r.key}: {ref['ops_per_s']:.1f} -> {r.ops_per_s:.1f} ops/s ({change * 100:+.1f} %)")
+    return regressions
+
+
+def _format(r: BenchResult, baseline: Optional[dict] = None) -> str:
+    line = f"{r.key:<48} {r.ops_per_s:>12.1f} ops/s {r.us_per_op:>12.1f} us {r.peak_alloc_kib:>10.1f} KiB"
+    if baseline is not None:
+        ref = baseline.get(r.key)
+        if ref is not None and ref["ops_per_s"] > 0:
+            line += f"  ({(r.ops_per_s / ref['ops_per_s'] - 1.0) * 100:+.1f} %)"
+    if r.note:
+        line += f"\n    {r.note}"
+    return line
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pixels", type=int, nargs="+", default=list(DEFAULT_PIXELS))
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_S, help="seconds per repeat")
+    parser.add_argument("--save", type=Path, help="write results as a baseline JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    base_by_key = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        base_by_key = {r["key"]: r for r in baseline.get("results", [])}
+
+    print(f"{'case':<48} {'throughput':>18} {'latency':>15} {'peak alloc':>14}")
+    results = run(
+        tuple(args.pixels),
+        args.filter,
+        args.min_time,
+        progress=lambda r: print(_format(r, base_by_key), flush=True),
+    )
+
+    if args.save is not None:
+        payload = {
+            "python": sys.version.split()[0],
+            "machine": platform.platform(),
+            "created": time.time(),
+            "results": [{"key": r.key, **asdict(r)} for r in results],
+        }
+        args.save.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold * 100:.0f} %:")
+            for msg in regressions:
+                print("  " + msg)
+            return 1
+        print(f"\nNo regressions beyond {args.threshold * 100:.0f} %.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
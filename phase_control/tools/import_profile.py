@@ -0,0 +1,120 @@
+# phase_control/tools/import_profile.py
+"""
+Import-time profile of the application entry point.
+
+Runs ``python -X importtime -c "import <target>"`` in a fresh interpreter,
+parses the report and prints the slowest imports. Use it to track startup
+regressions:
+
+    python -m phase_control.tools.import_profile
+    python -m phase_control.tools.import_profile --json startup.json
+    python -m phase_control.tools.import_profile --baseline startup.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+# Imports that should only happen once a page is selected (lazy modules)
+HEAVY_MODULES = ("lmfit", "scipy", "pyqtgraph", "base_core.math.functions")
+
+
+@dataclass(slots=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile_imports(target: str = "app") -> list[ImportRecord]:
+    """
+    Import 'target' in a child interpreter and return one record per imported module.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {target!r} failed:\n{proc.stderr}")
+    return parse_importtime(proc.stderr)
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    records: list[ImportRecord] = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            # header line
+            continue
+        records.append(ImportRecord(parts[2].strip(), self_us, cumulative_us))
+    return records
+
+
+def total_us(records: list[ImportRecord]) -> int:
+    return sum(r.self_us for r in records)
+
+
+def report(records: list[ImportRecord], top: int = 20, baseline: Optional[dict] = None) -> str:
+    lines: list[str] = []
+    total = total_us(records)
+    lines.append(f"Total import time: {total / 1e3:.1f} ms ({len(records)} modules)")
+
+    if baseline is not None:
+        base_total = int(baseline.get("total_us", 0))
+        if base_total > 0:
+            delta = (total - base_total) / base_total * 100.0
+            lines.append(f"Baseline:          {base_total / 1e3:.1f} ms ({delta:+.1f} %)")
+
+    names = {r.module for r in records}
+    eager = [m for m in HEAVY_MODULES if m in names]
+    lines.append("Heavy modules imported at startup: " + (", ".join(eager) if eager else "none"))
+
+    lines.append("")
+    lines.append(f"{'cumulative [ms]':>16} {'self [ms]':>10}  module")
+    for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        lines.append(f"{r.cumulative_us / 1e3:16.1f} {r.self_us / 1e3:10.1f}  {r.module}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="app", help="module to import (default: app)")
+    parser.add_argument("--top", type=int, default=20, help="number of slowest imports to show")
+    parser.add_argument("--json", type=Path, help="write the full profile to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a profile written with --json")
+    args = parser.parse_args(argv)
+
+    records = profile_imports(args.target)
+
+    baseline = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    print(report(records, top=args.top, baseline=baseline))
+
+    if args.json is not None:
+        payload = {
+            "target": args.target,
+            "total_us": total_us(records),
+            "imports": [asdict(r) for r in records],
+        }
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,240 @@
+# phase_control/tools/replay_bench.py
+"""
+Analysis throughput on recorded data.
+
+Replays a recording (FrameRecorder stem or archive) through FrameBuffer and
+TOPIC_NEW_SPECTRUM into AnalysisEngine or EnvelopeEngine and reports how many
+frames the engine actually processed (the rest were coalesced), the step
+latency and the resulting sustainable frame rate:
+
+    python -m phase_control.tools.replay_bench run1 --engine stabilization
+    python -m phase_control.tools.replay_bench run1.pca --mode fixed_rate --rate 200
+    python -m phase_control.tools.replay_bench run1 --mode max_speed --json bench.json
+
+The rotator is replaced by an always-idle stand-in so that only analysis
+cost is measured.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from base_core.framework.app import AppContext
+from base_core.framework.app.enums import AppStatus
+from base_core.framework.di import Container
+from base_core.framework.events import EventBus
+from base_core.framework.lifecycle.cleanup_collection import CleanupCollection
+from base_core.math.models import Angle
+from elliptec.config import ELL14Config
+from phase_control.core.bootstrap import register_clock, register_task_runners
+from phase_control.io.readiness import new_ready_future, set_ready
+from phase_control.io.rotator.interfaces import IRotatorController
+from phase_control.io.spectrometer.frame_buffer import FrameBuffer
+from phase_control.io.spectrometer.interfaces import IFrameBuffer, IRoiRegistry
+from phase_control.io.spectrometer.replay import ReplayMode, ReplaySpectrometer, load_replay
+from phase_control.io.spectrometer.roi import RoiRegistry
+
+ENGINES = {
+    "stabilization": (
+        "phase_control.analysis_modules.stabilization.runtime",
+        "phase_control.analysis_modules.stabilization.engine:AnalysisEngine",
+    ),
+    "envelope": (
+        "phase_control.analysis_modules.envelope.runtime",
+        "phase_control.analysis_modules.envelope.engine:EnvelopeEngine",
+    ),
+}
+
+
+class _IdleRotator(IRotatorController):
+    """Accepts every request and is never busy."""
+
+    def __init__(self) -> None:
+        self._config = ELL14Config()
+        self._ready: Future[None] = new_ready_future()
+        set_ready(self._ready)
+        self.requests = 0
+
+    @property
+    def is_busy(self) -> bool:
+        return False
+
+    @property
+    def busy_for_s(self) -> float:
+        return 0.0
+
+    @property
+    def config(self) -> ELL14Config:
+        return self._config
+
+    @property
+    def ready(self) -> Future[None]:
+        return self._ready
+
+    def open(self) -> None: ...
+    def close(self) -> None: ...
+
+    def request_rotation(self, angle: Angle) -> None:
+        self.requests += 1
+
+    def request_homing(self) -> None: ...
+    def request_set_speed(self, percent: int) -> None: ...
+    def request_apply_config(self) -> None: ...
+
+
+@dataclass(slots=True)
+class BenchResult:
+    engine: str
+    mode: str
+    frames: int
+    published: int
+    processed: int
+    results: int
+    elapsed_s: float
+    published_hz: float
+    processed_hz: float
+    step_mean_ms: float
+    step_p95_ms: float
+    step_max_ms: float
+    sustainable_hz: float     # 1 / mean step time
+    replay_max_lag_ms: float
+
+    def report(self) -> str:
+        coalesced = self.published - self.processed
+        return "\n".join([
+            f"Engine:        {self.engine} ({self.mode}, {self.frames} recorded frames)",
+            f"Published:     {self.published} frames in {self.elapsed_s:.2f} s ({self.published_hz:.1f} Hz)",
+            f"Processed:     {self.processed} ({self.processed_hz:.1f} Hz), coalesced {coalesced}, results {self.results}",
+            f"Step latency:  mean {self.step_mean_ms:.2f} ms, p95 {self.step_p95_ms:.2f} ms, max {self.step_max_ms:.2f} ms",
+            f"Sustainable:   {self.sustainable_hz:.1f} Hz",
+            f"Replay lag:    max {self.replay_max_lag_ms:.1f} ms behind schedule",
+        ])
+
+
+def _load_attr(path: str) -> Any:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def run_bench(
+    path: Path,
+    *,
+    engine_name: str = "stabilization",
+    mode: ReplayMode = ReplayMode.MAX_SPEED,
+    rate_hz: float = 50.0,
+    speed: float = 1.0,
+    duration_s: Optional[float] = None,
+) -> BenchResult:
+    data = load_replay(path)
+
+    ctx = AppContext(
+        config={"app_name": "Phase Control (replay bench)"},
+        status=AppStatus.CONNECTED,
+        log=logging.getLogger("phase_control.replay_bench"),
+        event_bus=EventBus(),
+        lifecycle=CleanupCollection(),
+    )
+    c = Container()
+    c.register_instance(AppContext, ctx)
+    register_clock(c)
+    register_task_runners(c, ctx)
+    c.register_singleton(IFrameBuffer, lambda c: FrameBuffer())
+    c.register_singleton(IRoiRegistry, lambda c: RoiRegistry())  # recorded frames are already cropped
+    c.register_singleton(IRotatorController, lambda c: _IdleRotator())
+
+    runtime, engine_path = ENGINES[engine_name]
+    importlib.import_module(runtime).register(c, ctx)
+
+    replay = ReplaySpectrometer(data, c.get(IFrameBuffer), ctx.event_bus, mode=mode, rate_hz=rate_hz, speed=speed)
+    engine = c.get(_load_attr(engine_path))
+
+    # time every step the engine's stream actually runs
+    step_times: list[float] = []
+    results = 0
+    lock = threading.Lock()
+    step = engine.step
+
+    def timed_step(spectrum):
+        t = time.perf_counter()
+        out = step(spectrum)
+        with lock:
+            step_times.append(time.perf_counter() - t)
+        return out
+
+    def on_result(_res) -> None:
+        nonlocal results
+        results += 1
+
+    engine.step = timed_step
+    engine.set_on_result(on_result)
+
+    replay.start()
+    try:
+        engine.start()
+        replay.wait(duration_s)
+        time.sleep(0.2)  # let the last coalesced spectrum finish
+    finally:
+        replay.stop()
+        engine.stop()
+        ctx.lifecycle.clear()
+
+    stats = replay.stats
+    with lock:
+        times = np.asarray(step_times, dtype=float)
+    mean = float(times.mean()) if times.size else 0.0
+    return BenchResult(
+        engine=engine_name,
+        mode=mode.value,
+        frames=len(data),
+        published=stats.published,
+        processed=int(times.size),
+        results=results,
+        elapsed_s=stats.elapsed_s,
+        published_hz=stats.rate_hz,
+        processed_hz=times.size / stats.elapsed_s if stats.elapsed_s > 0 else 0.0,
+        step_mean_ms=mean * 1e3,
+        step_p95_ms=float(np.percentile(times, 95)) * 1e3 if times.size else 0.0,
+        step_max_ms=float(times.max()) * 1e3 if times.size else 0.0,
+        sustainable_hz=1.0 / mean if mean > 0 else 0.0,
+        replay_max_lag_ms=stats.max_lag_s * 1e3,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help="recording stem or archive file")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="stabilization")
+    parser.add_argument("--mode", choices=[m.value for m in ReplayMode], default=ReplayMode.MAX_SPEED.value)
+    parser.add_argument("--rate", type=float, default=50.0, help="frames/s for --mode fixed_rate")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale for --mode original")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--json", type=Path, help="write the result to this file")
+    args = parser.parse_args(argv)
+
+    result = run_bench(
+        args.path,
+        engine_name=args.engine,
+        mode=ReplayMode(args.mode),
+        rate_hz=args.rate,
+        speed=args.speed,
+        duration_s=args.duration,
+    )
+    print(result.report())
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(asdict(result), indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
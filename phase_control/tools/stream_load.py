@@ -0,0 +1,103 @@
+# phase_control/tools/stream_load.py
+"""
+Load test of the spectrometer transport and parse path.
+
+Runs the real JsonlSubprocessEndpoint + SpectrometerService against the
+synthetic server (io/spectrometer/fake_server.py) and reports the frame rate
+that arrives on TOPIC_NEW_SPECTRUM and the delivery latency:
+
+    python -m phase_control.tools.stream_load --rate 500 --pixels 2048
+    python -m phase_control.tools.stream_load --rate 0 --duration 20
+    python -m phase_control.tools.stream_load --rate 500 --window 0   # no flow control
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import wait
+
+import numpy as np
+
+from base_core.framework.app import AppContext
+from base_core.framework.app.enums import AppStatus
+from base_core.framework.di import Container
+from base_core.framework.events import EventBus
+from base_core.framework.lifecycle.cleanup_collection import CleanupCollection
+from phase_control.core.bootstrap import register_clock, register_task_runners
+from phase_control.io.devices import register_devices
+from phase_control.io.events import TOPIC_NEW_SPECTRUM, NewSpectrumEventArgs
+from phase_control.io.readiness import is_ready
+from phase_control.io.spectrometer.fake_server import fake_spectrometer_argv
+from phase_control.io.spectrometer.flow_control import FlowControlConfig
+from phase_control.io.spectrometer.recorder import parse_timestamp
+from phase_control.io.spectrometer.spectrometer_service import SpectrometerService
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pixels", type=int, default=2048)
+    parser.add_argument("--rate", type=float, default=500.0, help="server frames/s, 0 = unlimited")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--window", type=int, default=FlowControlConfig.window, help="credit window, 0 = push mode")
+    args = parser.parse_args(argv)
+
+    ctx = AppContext(
+        config={"app_name": "Phase Control (stream load)"},
+        status=AppStatus.CONNECTED,
+        log=logging.getLogger("phase_control.stream_load"),
+        event_bus=EventBus(),
+        lifecycle=CleanupCollection(),
+    )
+    c = Container()
+    c.register_instance(AppContext, ctx)
+    register_clock(c)
+    register_task_runners(c, ctx)
+    register_devices(
+        c,
+        ctx,
+        spectrometer_argv=fake_spectrometer_argv(num_pixels=args.pixels, rate_hz=args.rate),
+        flow_control=FlowControlConfig(enabled=args.window > 0, window=max(1, args.window)),
+    )
+
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def on_spectrum(e: NewSpectrumEventArgs) -> None:
+        lat = time.time() - parse_timestamp(e.timestamp)
+        with lock:
+            latencies.append(lat)
+
+    unsub = ctx.event_bus.subscribe(TOPIC_NEW_SPECTRUM, on_spectrum)
+    service: SpectrometerService = c.get(SpectrometerService)
+    try:
+        ready = service.start_async()
+        wait([ready], timeout=10.0)
+        if not is_ready(ready):
+            print("Fake spectrometer did not come up.")
+            return 1
+
+        with lock:
+            latencies.clear()
+        t0 = time.perf_counter()
+        time.sleep(args.duration)
+        elapsed = time.perf_counter() - t0
+        flow = service.flow_stats
+    finally:
+        unsub()
+        service.stop()
+        ctx.lifecycle.clear()
+
+    lat = np.asarray(latencies, dtype=float) * 1e3
+    print(f"Server rate:   {'unlimited' if args.rate <= 0 else f'{args.rate:.0f} Hz'}, {args.pixels} pixels")
+    print(f"Received:      {lat.size} frames in {elapsed:.1f} s ({lat.size / elapsed:.1f} Hz)")
+    state = f"window {flow.window}" if flow.active else f"off ({flow.disabled_reason})" if flow.disabled_reason else "off"
+    print(f"Flow control:  {state}, {flow.skipped} frames merged by the server")
+    if lat.size:
+        print(f"Latency [ms]:  p50 {np.percentile(lat, 50):.2f}, p95 {np.percentile(lat, 95):.2f}, max {lat.max():.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())